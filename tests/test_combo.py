@@ -0,0 +1,51 @@
+import time
+import unittest
+import pytest
+import wx
+
+from wxutils.inputs import _ChoiceIndex, FlatCombo
+
+CHOICES = [f'SR:C{i % 30:02d}-BI{{DCCT:{i}}}Mag-I' for i in range(20_000)]
+
+class TestCase(unittest.TestCase):
+    def test_substring_search(self):
+        index = _ChoiceIndex(CHOICES, 'substring')
+        assert len(index.search('')) == len(CHOICES)
+        t0 = time.perf_counter()
+        for query in ('c1', 'c12', 'c12-', 'c12-bi{dcct:1'):
+            result = index.search(query)
+        elapsed = time.perf_counter() - t0
+        print(f"4 substring searches over {len(CHOICES)} choices: {elapsed*1000:.1f} ms")
+        assert result == [i for i, c in enumerate(CHOICES)
+                          if 'c12-bi{dcct:1' in c.lower()]
+        assert result == sorted(result)
+
+    def test_prefix_search(self):
+        index = _ChoiceIndex(CHOICES, 'prefix')
+        result = index.search('SR:C07')
+        assert result == [i for i, c in enumerate(CHOICES) if c.startswith('SR:C07')]
+        assert index.search('xyz') == []
+
+    def test_escape_then_enter(self):
+        app = wx.App()
+        frame = wx.Frame(None)
+        combo = FlatCombo(frame, ['a', 'b', 'c'], search='prefix')
+        combo.SetSelection(1)
+        def key(code):
+            event = wx.KeyEvent(wx.wxEVT_CHAR)
+            event.SetKeyCode(code)
+            combo._on_char(event)
+
+        combo._on_click(None)
+        popup = combo._popup
+        key(wx.WXK_DOWN)
+        key(wx.WXK_ESCAPE)
+        assert popup._dismissed
+        key(wx.WXK_RETURN)
+        wx.SafeYield()
+        assert combo.GetSelection() == 1
+        frame.Destroy()
+        app.Destroy()
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-x', '-s'])
@@ -0,0 +1,84 @@
+import unittest
+import pytest
+import wx
+
+from wxutils.display import FlatTabbedPanel
+from wxutils.notebooks import flatnotebook
+
+class TestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = wx.App()
+        self.frame = wx.Frame(None, size=(400, 300))
+
+    def tearDown(self):
+        self.frame.Destroy()
+        self.app.Destroy()
+
+    def test_page_factories(self):
+        built = []
+        def factory(label):
+            def make(parent):
+                built.append(label)
+                return wx.Panel(parent)
+            return make
+
+        tabs = FlatTabbedPanel(self.frame, max_loaded=2)
+        for label in ('a', 'b', 'c', 'd'):
+            tabs.AddPageFactory(label, factory(label))
+        assert built == ['a']
+        tabs.SetSelection(2)
+        assert built == ['a', 'c']
+        tabs.SetSelection(3)
+        assert built == ['a', 'c', 'd']
+        assert tabs._pages[0][1] is None        # least recently visited
+        assert tabs._pages[2][1] is not None
+        tabs.SetSelection(0)
+        assert built == ['a', 'c', 'd', 'a']
+        assert tabs._pages[2][1] is None
+        assert isinstance(tabs.GetPage(1), wx.Panel)
+
+    def test_prewarm_one_page_per_idle(self):
+        built = []
+        tabs = FlatTabbedPanel(self.frame, prewarm=True)
+        for label in ('a', 'b', 'c', 'd'):
+            tabs.AddPageFactory(label, lambda parent, label=label:
+                                built.append(label) or wx.Panel(parent))
+        assert built == ['a']
+        for nbuilt in (2, 3, 4):
+            tabs.ProcessEvent(wx.IdleEvent())
+            assert len(built) == nbuilt
+        tabs.ProcessEvent(wx.IdleEvent())
+        assert len(built) == 4
+        assert not tabs._loader._idle_bound
+
+    def test_lazy_flatnotebook(self):
+        built = []
+        def creator(label):
+            def make(parent=None):
+                built.append(label)
+                return wx.Panel(parent)
+            return make
+
+        panel = wx.Panel(self.frame)
+        nb = flatnotebook(panel, {'a': creator('a'), 'b': creator('b'),
+                                  'c': creator('c')}, lazy=True, max_loaded=2)
+        assert built == ['a']
+        assert nb.pagelist[1] is None and nb.pagelist[2] is None
+        assert nb.pagelist[0].GetParent() is nb.GetPage(0)
+
+        nb.AdvanceSelection(True)
+        assert built == ['a', 'b']
+        assert nb.pagelist[1].GetParent() is nb.GetPage(1)
+        nb.AdvanceSelection(True)
+        assert built == ['a', 'b', 'c']
+        assert nb.pagelist[0] is None           # least recently visited
+        assert len(nb.GetPage(0).GetChildren()) == 0
+        assert nb.pagelist[1] is not None
+
+        page = nb.get_page(0)
+        assert built == ['a', 'b', 'c', 'a']
+        assert page is nb.pagelist[0]
+        assert page.GetParent() is nb.GetPage(0)
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-x', '-s'])
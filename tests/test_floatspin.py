@@ -0,0 +1,120 @@
+import time
+import unittest
+from decimal import Decimal, InvalidOperation
+import pytest
+import wx
+
+from wxutils.myfloatspin import FloatSpin, FixedPoint, _to_decimal, _DECIMAL_CONTEXT
+
+NSTEPS = 10_000
+
+def spin_fixedpoint(value, increment, vmax, digits=3):
+    """the FloatSpin arithmetic for NSTEPS increments, with FixedPoint"""
+    value = FixedPoint(str(value), 20)
+    increment = FixedPoint(str(increment), 20)
+    vmax = FixedPoint(str(vmax), 20)
+    modifier = FixedPoint(str(1.0), 20)
+    fmt = f"%100.{digits}f"
+    for i in range(NSTEPS):
+        new = value + increment*modifier
+        if new > vmax:
+            new = vmax
+        value = new
+        text = (fmt % value).strip()
+    return text
+
+def spin_decimal(value, increment, vmax, digits=3):
+    """the FloatSpin arithmetic for NSTEPS increments, with Decimal"""
+    value, increment, vmax = _to_decimal(value), _to_decimal(increment), _to_decimal(vmax)
+    modifier = 1
+    fmt = f"%100.{digits}f"
+    for i in range(NSTEPS):
+        new = _DECIMAL_CONTEXT.fma(increment, modifier, value)
+        if new > vmax:
+            new = vmax
+        value = new
+        text = (fmt % value).strip()
+    return text
+
+def benchmark():
+    """compare FloatSpin increments with FixedPoint and Decimal"""
+    args = (-3.2, 0.001, 6.5)
+    t0 = time.perf_counter()
+    spin_fixedpoint(*args)
+    t1 = time.perf_counter()
+    spin_decimal(*args)
+    t2 = time.perf_counter()
+    print(f"{NSTEPS} increments: FixedPoint {(t1-t0)*1000:.1f} ms, "
+          f"Decimal {(t2-t1)*1000:.1f} ms")
+
+class TestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = wx.App()
+        self.frame = wx.Frame(None)
+
+    def tearDown(self):
+        self.frame.Destroy()
+        self.app.Destroy()
+
+    def test_to_decimal(self):
+        assert _to_decimal(0.1).as_tuple().exponent == -20
+        assert str(_to_decimal(1)) == '1.' + '0'*20
+        assert float(_to_decimal('2.5')) == float(FixedPoint('2.5', 20))
+        assert float(_to_decimal(1/3.)) == float(FixedPoint(str(1/3.), 20))
+        for value in ('nan', float('nan'), float('inf'), Decimal('-inf')):
+            with pytest.raises(InvalidOperation):
+                _to_decimal(value)
+
+    def test_increments_match_fixedpoint(self):
+        args = (-3.2, 0.001, 6.5)
+        assert spin_fixedpoint(*args) == spin_decimal(*args) == '6.500'
+
+    def test_stepped(self):
+        spin = FloatSpin(self.frame, value=1.0, increment=0.25, digits=2)
+        assert spin._stepped(2) == Decimal('1.5')
+        assert spin._stepped(-6) == Decimal('-0.5')
+        spin = FloatSpin(self.frame, value=0, increment=0.1, digits=1)
+        for i in range(30):
+            spin.SetValue(spin._stepped(1))
+        assert spin._value == Decimal('3')
+        assert spin.GetValue() == 3.0
+
+    def test_is_finite(self):
+        spin = FloatSpin(self.frame, value=0.5, increment=0.25, digits=2)
+        assert spin.IsFinite(1.5) == (True, Decimal(4))
+        assert spin.IsFinite('inf') == (False, None)
+        assert spin.IsFinite('abc') == (False, None)
+        assert spin.IsFinite(None) == (False, None)
+
+    def test_snap_to_ticks(self):
+        spin = FloatSpin(self.frame, value=0, increment=0.25, digits=2)
+        spin.SetSnapToTicks(True)
+        spin.SetValue(0.37)
+        assert spin.GetValue() == 0.25
+        spin.SetValue(0.4)
+        assert spin.GetValue() == 0.5
+        spin.SetValue(-0.13)
+        assert spin.GetValue() == -0.25
+
+    def test_nan(self):
+        spin = FloatSpin(self.frame, value=1.5, min_val=0, max_val=10,
+                         increment=0.5, digits=1)
+        spin.SetValue(float('nan'))
+        assert spin.GetValue() == 1.5
+        spin.GetTextCtrl().SetValue('nan')
+        spin.SyncSpinToText()
+        assert spin.GetValue() == 1.5
+        assert spin.GetTextCtrl().GetValue() == '1.5'
+
+    def test_range(self):
+        spin = FloatSpin(self.frame, value=6.0, min_val=-3.2, max_val=6.5,
+                         increment=0.001, digits=3)
+        spin.SetValue(7.0)
+        assert spin.GetValue() == 6.0
+        spin.SetRange(-3.2, 5.0)
+        assert spin.GetValue() == 5.0
+        assert spin.ClampValue(spin._stepped(1000)) == Decimal('5')
+
+if __name__ == '__main__':
+    benchmark()
+    pytest.main(['-v', '-x', '-s'])
@@ -0,0 +1,57 @@
+import unittest
+import pytest
+import wx
+
+from wxutils.icons import (get_icon, get_icon_bundle, icon_cache_stats,
+                           draw_cog)
+from wxutils.resources import ResourceCache
+from wxutils.colors import set_dark_mode
+
+class TestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = wx.App()
+
+    def tearDown(self):
+        self.app.Destroy()
+
+    def test_icon_cache(self):
+        before = icon_cache_stats()
+        bmps = [get_icon('pin') for i in range(500)]
+        assert all(bmp is bmps[0] for bmp in bmps)
+        stats = icon_cache_stats()
+        assert stats['hits'] - before['hits'] >= 499
+        assert stats['bytes'] > 0
+        big = get_icon('pin', scale=2.0)
+        assert big.GetWidth() == 2 * bmps[0].GetWidth()
+        assert get_icon('no such icon') is None
+
+    def test_rasterized_icons(self):
+        cache = ResourceCache()
+        bmp = cache.icon(draw_cog, 20)
+        assert bmp.GetWidth() == 20
+        assert cache.icon(draw_cog, 20) is bmp
+        assert cache.icon(draw_cog, 20, enabled=False) is not bmp
+        assert cache.icon(draw_cog, 20, scale=2.0).GetWidth() == 40
+        assert cache.stats()['icons'] == 3
+        set_dark_mode(True)
+        dark = cache.icon(draw_cog, 20)
+        set_dark_mode(False)
+        assert cache.icon(draw_cog, 20) is not dark
+        set_dark_mode(None)
+
+    def test_icon_bundles(self):
+        bundle = get_icon_bundle('pin')
+        assert get_icon_bundle('pin') is bundle
+        base = get_icon('pin')
+        assert bundle.GetDefaultSize() == base.GetSize()
+        bmp2x = bundle.GetBitmap(base.GetSize() * 2)
+        assert bmp2x.GetWidth() == 2 * base.GetWidth()
+        assert get_icon('pin', scale=2.0) is get_icon('pin', scale=2.0)
+
+        cog = get_icon_bundle(draw_cog, 16)
+        assert cog.GetDefaultSize() == wx.Size(16, 16)
+        assert cog.GetBitmap(wx.Size(32, 32)).GetWidth() == 32
+        assert get_icon_bundle('no such icon') is None
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-x', '-s'])
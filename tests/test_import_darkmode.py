@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+import subprocess
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('wx')
+
+FAKE_GSETTINGS = """#!/bin/sh
+echo "$@" >> "{marker}"
+echo "'prefer-light'"
+"""
+
+def run_python(code, tmp_path, **env):
+    """run code in a fresh interpreter with a fake `gsettings` that
+    records each call, return (number of gsettings calls, runtime)"""
+    marker = tmp_path / 'gsettings_calls.txt'
+    if marker.exists():
+        marker.unlink()
+    fake = tmp_path / 'gsettings'
+    fake.write_text(FAKE_GSETTINGS.format(marker=marker))
+    fake.chmod(0o755)
+    penv = dict(os.environ)
+    penv['PATH'] = f"{tmp_path}{os.pathsep}{penv.get('PATH', '')}"
+    penv.pop('WXUTILS_DARK_MODE', None)
+    penv.update(env)
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], env=penv, check=True,
+                   cwd=Path(__file__).parent.parent)
+    runtime = time.perf_counter() - t0
+    ncalls = len(marker.read_text().split('\n')) - 1 if marker.exists() else 0
+    return ncalls, runtime
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='linux only')
+def test_import_does_not_probe(tmp_path):
+    ncalls, t_import = run_python('import wxutils', tmp_path)
+    print(f"import wxutils: {t_import*1000:.1f} ms, {ncalls} gsettings calls")
+    assert ncalls == 0
+
+    ncalls, t_probe = run_python('import wxutils; wxutils.is_dark_theme()', tmp_path)
+    print(f"import wxutils + is_dark_theme(): {t_probe*1000:.1f} ms, {ncalls} gsettings calls")
+    assert ncalls > 0
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='linux only')
+def test_pinned_mode(tmp_path):
+    code = 'import wxutils; assert wxutils.is_dark_theme(); wxutils.COLORS'
+    ncalls, _ = run_python(code, tmp_path, WXUTILS_DARK_MODE='dark')
+    assert ncalls == 0
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-x', '-s'])
@@ -0,0 +1,50 @@
+import sys
+import subprocess
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('wx')
+
+# budget for the time spent in wxutils modules (excluding wx itself)
+# during `import wxutils`, in microseconds
+IMPORT_BUDGET_US = 50000
+
+# modules that should only be imported when one of their names is used
+LAZY_MODULES = ('wxutils.editor', 'wxutils.notebooks', 'wxutils.floats',
+                'wxutils.myfloatspin', 'wxutils.icons', 'wxutils.passwords',
+                'wxutils.periodictable', 'wx.stc', 'wx.lib.agw.flatnotebook')
+
+def importtime(code):
+    """run code with `python -X importtime`, return {module: self_time_us}"""
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                         capture_output=True, text=True, check=True,
+                         cwd=Path(__file__).parent.parent)
+    times = {}
+    for line in out.stderr.split('\n'):
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        selftime, _, modname = line[len('import time:'):].split('|')
+        times[modname.strip()] = int(selftime)
+    return times
+
+def test_import_budget():
+    times = importtime('import wxutils')
+    own = sum(t for m, t in times.items() if m.startswith('wxutils'))
+    print(f"import wxutils: {own} us in wxutils modules")
+    for modname in LAZY_MODULES:
+        assert modname not in times
+    assert own < IMPORT_BUDGET_US
+
+def test_lazy_names():
+    times = importtime('import wxutils; wxutils.FlatScriptEditorDialog')
+    assert 'wxutils.editor' in times
+    assert 'wxutils.icons' not in times
+
+    import wxutils
+    for name in wxutils.__all__:
+        assert getattr(wxutils, name) is not None
+    assert 'Check' in dir(wxutils)
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-x', '-s'])
@@ -0,0 +1,73 @@
+import unittest
+import pytest
+import wx
+
+from wxutils.passwords import (hash_password, hash_password_async,
+                               test_password as check_password,
+                               test_password_async as check_password_async,
+                               calibrate_iterations, password_rules,
+                               PasswordRules, audit_passwords,
+                               PasswordSetDialog)
+
+class TestCase(unittest.TestCase):
+    def test_async_hash(self):
+        futures = [hash_password_async(f'Secret#{i}', iterations=2000)
+                   for i in range(4)]
+        hashes = [fut.result(timeout=30) for fut in futures]
+        assert all(check_password(f'Secret#{i}', h) for i, h in enumerate(hashes))
+        assert check_password_async('Secret#0', hashes[0]).result(timeout=30)
+        assert not check_password_async('Secret#1', hashes[0]).result(timeout=30)
+
+    def test_calibration(self):
+        niter = calibrate_iterations(0.05, use_cache=False, recalibrate=True)
+        assert niter >= 1023
+        assert calibrate_iterations(0.05, use_cache=False) == niter
+
+    def test_scrypt(self):
+        pwhash = hash_password('Secret#1', hash_name='scrypt',
+                               scrypt_params=(2**10, 8, 1))
+        name, params, salt, result = pwhash.split('&')
+        assert (name, params) == ('scrypt', '1024:8:1')
+        assert check_password('Secret#1', pwhash)
+        assert not check_password('Secret#2', pwhash)
+
+    def test_rules(self):
+        assert password_rules('Abc#1234') == (True, 'password conforms to rules')
+        assert not password_rules('Abc#123')[0]
+        assert not password_rules('Abc#1234', invalid='#')[0]
+        assert not password_rules('abc#1234')[0]
+        rules = PasswordRules(minlen=6, special=2)
+        assert rules.check('Ab#$12') == (True, 'password conforms to rules')
+        assert rules.check('Ab#c12')[1] == 'must be at least 2 special characters.'
+        assert not password_rules('Abc#1234', invalid=['#', '%'])[0]
+        assert password_rules('Abc#1234', invalid=['%', 'é'])[0]
+        assert not password_rules('Abc#1234é', invalid=['é'])[0]
+
+    def test_audit(self):
+        audits = audit_passwords(['Abc#1234', 'abc', 'ABCdef!!9', 'Abc#1234x'],
+                                 invalid='x')
+        assert [a.valid for a in audits] == [True, False, True, False]
+        assert set(audits[1].failed) == {'minlen', 'uppercase', 'digits', 'special'}
+        assert audits[2].special == 2
+        assert audits[3].failed == ('invalid',)
+        audit = PasswordRules(lowercase=3, invalid='a').audit('Abc#1234a')
+        assert (audit.lowercase, audit.invalid) == (3, 1)
+        assert audit.failed == ('invalid',)
+
+    def test_set_dialog_hash_failure(self):
+        app = wx.App()
+        dlg = PasswordSetDialog(None)
+        inputs = ('', 'Abc#1234', 'Abc#1234')
+        dlg._on_hashed(dlg._check_id, inputs, None)
+        assert dlg.pwhash == ''
+        assert dlg._hashed_inputs is None
+        assert dlg.msg.GetLabel() == 'Password hashing failed'
+        dlg._on_hashed(dlg._check_id, inputs, 'x'*40)
+        assert dlg.pwhash == 'x'*40
+        assert dlg._hashed_inputs == inputs
+        assert dlg.msg.GetLabel() == 'Passwords match'
+        dlg.Destroy()
+        app.Destroy()
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-x', '-s'])
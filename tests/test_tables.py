@@ -0,0 +1,221 @@
+import time
+import unittest
+from array import array
+import pytest
+import wx
+
+from wxutils.tables import (FlatTableRow, FlatScrolledPanel, FlatDataTable,
+                            TableIndex, TableLayout)
+
+class TestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = wx.App()
+        self.frame = wx.Frame(None, size=(400, 300))
+
+    def tearDown(self):
+        self.frame.Destroy()
+        self.app.Destroy()
+
+    def test_virtual_rows(self):
+        bound = {}
+        def binder(row, index):
+            bound[index] = row
+
+        panel = FlatScrolledPanel(self.frame)
+        panel.SetSize((400, 300))
+        panel.Layout()
+        panel.SetVirtualRows(5000, lambda parent: FlatTableRow(parent, [1]),
+                             binder, row_height=30)
+        assert panel.IsVirtual()
+        assert panel._content_height() == 5000 * 30
+        nlive = len(panel._virtual_rows)
+        assert 0 < nlive < 30
+
+        panel._on_sb_scroll(1.0)
+        assert 4999 in panel._virtual_rows
+        assert len(panel._virtual_rows) <= nlive + 1
+        assert len(panel._virtual_rows) + len(panel._virtual_spare) <= 2 * nlive
+
+    def test_virtual_mode_switch(self):
+        panel = FlatScrolledPanel(self.frame)
+        panel.SetSize((400, 300))
+        panel.Layout()
+        with pytest.raises(ValueError):
+            panel.SetVirtualRowCount(100)
+        assert not panel.IsVirtual()
+
+        panel.SetVirtualRows(100, lambda parent: FlatTableRow(parent, [1]),
+                             lambda row, index: None, row_height=30)
+        with pytest.raises(ValueError):
+            panel.AddRow(FlatTableRow(panel._content, [1]))
+        assert len(panel.rows_sizer.GetChildren()) == 0
+        panel.SetVirtualRowCount(50)
+        assert panel._content_height() == 50 * 30
+
+        rows = list(panel._virtual_rows.values())
+        assert len(rows) > 0
+        panel.ClearVirtualRows()
+        assert not panel.IsVirtual()
+        assert panel._virtual_rows == {} and panel._virtual_spare == []
+        assert panel._content.IsShown()
+        assert all(row not in panel._viewport.GetChildren() for row in rows)
+        panel.AddRows(FlatTableRow(panel._content, [1], height=24) for i in range(3))
+        assert len(panel.rows_sizer.GetChildren()) == 3
+
+    def test_data_table(self):
+        nrows = 100_000
+        names = [f'row {i}' for i in range(nrows)]
+        values = array('d', (i*0.5 for i in range(nrows)))
+        table = FlatDataTable(self.frame, ['name', 'value'], [2, 1],
+                              columns=[names, values], formats=[None, '.3f'],
+                              row_height=20)
+        table.SetSize((300, 200))
+        table.Layout()
+        assert table.GetRowCount() == nrows
+        assert table.HitTest(10, 45) == (2, 0)
+        assert table.HitTest(290, 5)[1] == 1
+        table.ScrollToRow(nrows - 1)
+        row, _ = table.HitTest(10, table._canvas.GetClientSize().height - 1)
+        assert row == nrows - 1
+        table.SetCellValue(5, 1, 3.25)
+        assert table.GetCellValue(5, 1) == 3.25
+        assert table._format_cell(1, 3.25) == '3.250'
+
+    def test_data_table_blit_scroll(self):
+        values = list(range(1000))
+        table = FlatDataTable(self.frame, ['value'], [1], columns=[values],
+                              row_height=20)
+        table.SetSize((300, 200))
+        table.Layout()
+        for i in range(1, 6):
+            table._on_sb_scroll(i * 0.001)
+        assert table.GetScrollStats() == {'blits': 5, 'refreshes': 0}
+        table.ScrollToRow(900)
+        assert table.GetScrollStats() == {'blits': 5, 'refreshes': 1}
+        row, _ = table.HitTest(10, table._canvas.GetClientSize().height - 1)
+        assert row == 900
+
+    def test_add_rows_single_layout(self):
+        panel = FlatScrolledPanel(self.frame)
+        calls = {'layout': 0, 'freeze': 0, 'thaw': 0}
+        def counted(name, method):
+            def wrapper(*args):
+                calls[name] += 1
+                return method(*args)
+            return wrapper
+        panel._content.Layout = counted('layout', panel._content.Layout)
+        panel.Freeze = counted('freeze', panel.Freeze)
+        panel.Thaw = counted('thaw', panel.Thaw)
+        for nrows in (2500, 10000):
+            for key in calls:
+                calls[key] = 0
+            panel.ReplaceRows((FlatTableRow(panel._content, [1], height=24)
+                               for i in range(nrows)), destroy=True)
+            assert len(panel.rows_sizer.GetChildren()) == nrows
+            # one layout pass and one freeze/thaw, whatever the number of rows
+            assert calls == {'layout': 1, 'freeze': 1, 'thaw': 1}
+        with panel.BeginUpdate():
+            panel.ClearRows(destroy=True)
+            assert panel._layout_pending
+        assert not panel._layout_pending
+        assert len(panel._content.GetChildren()) == 0
+
+    def test_table_index(self):
+        names = ['b', 'a', 'c', 'a', 'b']
+        values = array('i', [3, 1, 2, 5, 4])
+        view = TableIndex([names, values])
+        assert view.Rows() == [0, 1, 2, 3, 4]
+        view.SetSort(0)
+        assert view.Rows() == [1, 3, 0, 4, 2]      # stable
+        view.SetSort(0, ascending=False)
+        assert view.Rows() == [2, 0, 4, 1, 3]
+        view.SetFilter(1, lambda v: v > 1)
+        assert view.Rows() == [2, 0, 4, 3]
+        view.SetFilter(1, lambda v: v > 2, narrowing=True)
+        assert view.Rows() == [0, 4, 3]
+        assert view.Position(3) == 2
+        assert view.Position(1) == -1
+        view.SetFilter(1, None)
+        view.SetSort(-1)
+        assert view.Rows() == [0, 1, 2, 3, 4]
+
+    def test_table_index_edits(self):
+        names = ['b', 'a', 'c', 'a', 'b']
+        values = array('i', [3, 1, 2, 5, 4])
+        view = TableIndex([names, values])
+        view.SetFilter(1, lambda v: v > 2)
+        view.SetFilter(0, lambda v: v != 'a')
+        assert view.Rows() == [0, 4]
+        values[4] = 0
+        assert view.InvalidateCell(4, 1)
+        assert view.Rows() == [0]
+        values[2] = 7
+        assert view.InvalidateCell(2, 1)
+        assert view.Rows() == [0, 2]
+        values[0] = 8
+        assert not view.InvalidateCell(0, 1)
+        values[0] = values[2] = 1
+        view.Invalidate(1)
+        assert view.Rows() == []
+        view.SetFilter(1, lambda v: v < 2)
+        assert view.Rows() == [0, 2, 4]
+
+    def test_table_index_mixed_sort(self):
+        mixed = [3, None, 'x', 1.5, None, 'a', 2]
+        view = TableIndex([mixed])
+        view.SetSort(0)
+        assert [mixed[r] for r in view.Rows()] == [1.5, 2, 3, 'a', 'x', None, None]
+        view.SetSort(0, ascending=False)
+        assert [mixed[r] for r in view.Rows()] == [None, None, 'x', 'a', 3, 2, 1.5]
+
+    def test_data_table_edit_filtered(self):
+        values = [1.0, 2.0, 3.0, 4.0]
+        table = FlatDataTable(self.frame, ['value'], [1], columns=[values])
+        table.SetFilter(0, lambda v: v > 1.5)
+        assert table.GetRowCount() == 3
+        table.SetCellValue(3, 0, 0.5)
+        assert table.GetRowCount() == 2
+        assert table.GetView().Position(3) == -1
+
+    def test_data_table_sort_filter(self):
+        nrows = 50_000
+        names = [f'item {(i*7919) % nrows}' for i in range(nrows)]
+        values = array('d', ((i*7919) % nrows for i in range(nrows)))
+        table = FlatDataTable(self.frame, ['name', 'value'], [2, 1],
+                              columns=[names, values])
+        nchildren = len(table.GetChildren())
+        t0 = time.perf_counter()
+        table.SortBy(1)
+        assert table.GetView()[0] == 0
+        table.SetFilterText(0, 'item 1')
+        table.SetFilterText(0, 'item 12')
+        assert all('item 12' in names[r] for r in table.GetView().Rows())
+        print(f"sort and filter {nrows} rows: {time.perf_counter()-t0:.3f} s")
+        assert len(table.GetChildren()) == nchildren
+
+    def test_shared_layout(self):
+        layout = TableLayout([2, 1, 1])
+        widths = layout.col_widths(400)
+        assert widths == [200, 100, 100]
+        assert layout.col_widths(400) is widths
+        assert layout.column_at(250, 400) == 1
+        assert layout.column_at(400, 400) == -1
+        rows = [FlatTableRow(self.frame, [2, 1, 1], layout=layout)
+                for i in range(100)]
+        assert all(row._col_widths(400) is widths for row in rows)
+
+    def test_scroll_moves(self):
+        panel = FlatScrolledPanel(self.frame, smooth='animated')
+        panel.SetSize((400, 300))
+        panel.Layout()
+        panel.AddRows(FlatTableRow(panel._content, [1], height=24)
+                      for i in range(500))
+        panel.ResetScrollStats()
+        for i in range(1, 20):
+            panel._on_sb_scroll(i * 0.001)
+        stats = panel.GetScrollStats()
+        assert 0 < stats['moves'] <= 19
+        assert panel._content.GetPosition().y == -panel._offset
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-x', '-s'])
@@ -0,0 +1,175 @@
+import gc
+import unittest
+import pytest
+import wx
+
+from wxutils.themes import (get_theme, set_theme, light_theme,
+                            theme_generation)
+from wxutils.resources import ResourceCache
+from wxutils.colors import (register_darkdetect, unregister_darkdetect,
+                            set_dark_mode, darkdetect_stats, queue_refresh,
+                            LinuxThemeDetector)
+
+class TestCase(unittest.TestCase):
+    def test_cached_theme(self):
+        set_theme(None)
+        assert get_theme() is get_theme()
+
+    def test_generation(self):
+        gen = theme_generation()
+        theme = light_theme()
+        set_theme(theme)
+        assert theme_generation() > gen
+        assert get_theme() is theme
+        set_theme(None)
+        assert get_theme() is not theme
+
+    def test_resource_cache(self):
+        cache = ResourceCache()
+        b1 = cache.brush(wx.Colour(10, 20, 30))
+        b2 = cache.brush((10, 20, 30))
+        assert b1 is b2
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+        set_theme(None)
+        assert cache.brush(wx.Colour(10, 20, 30)) is not b1
+        assert cache.stats()['misses'] == 2
+
+    def test_dark_mode_broadcast(self):
+        app = wx.App()
+        calls = []
+        def callback(is_dark=None):
+            calls.append(is_dark)
+        set_dark_mode(False)
+        register_darkdetect(callback)
+        set_dark_mode(True)
+        set_dark_mode(True)
+        set_dark_mode(False)
+        unregister_darkdetect(callback)
+        set_dark_mode(None)
+        assert calls == [True, False]
+        flip = darkdetect_stats()['last_flip']
+        assert flip['callbacks'] >= 1
+        assert flip['seconds'] >= 0
+        app.Destroy()
+
+    def test_dark_mode_hidden_windows(self):
+        app = wx.App()
+        set_dark_mode(False)
+        frame = wx.Frame(None)
+        shown1, shown2, hidden = wx.Panel(frame), wx.Panel(frame), wx.Panel(frame)
+        hidden.Hide()
+        frame.Show()
+        calls = []
+        def make_callback(name, window):
+            def callback(is_dark=None):
+                calls.append((name, is_dark))
+                queue_refresh(window)
+            return callback
+        callbacks = [make_callback(name, win) for name, win in
+                     (('shown1', shown1), ('shown2', shown2), ('hidden', hidden))]
+        for callback, win in zip(callbacks, (shown1, shown2, hidden)):
+            register_darkdetect(callback, window=win)
+
+        refreshes = []
+        call_after = wx.CallAfter
+        wx.CallAfter = lambda func, *args: refreshes.append(args)
+        try:
+            set_dark_mode(True)
+        finally:
+            wx.CallAfter = call_after
+        assert sorted(calls) == [('shown1', True), ('shown2', True)]
+        assert len(refreshes) == 1           # one CallAfter for the frame
+        assert set(map(id, refreshes[0][0])) >= {id(shown1), id(shown2)}
+        flip = darkdetect_stats()['last_flip']
+        assert flip['toplevels'] == 1
+        assert flip['deferred'] == 1
+        assert darkdetect_stats()['deferred'] == 1
+        assert not frame.IsFrozen()
+
+        hidden.Show()
+        assert calls[-1] == ('hidden', True)
+        assert darkdetect_stats()['deferred'] == 0
+        for callback in callbacks:
+            unregister_darkdetect(callback)
+        frame.Destroy()
+        set_dark_mode(None)
+        app.Destroy()
+
+    def test_darkdetect_registry(self):
+        app = wx.App()
+        set_dark_mode(False)
+        frame = wx.Frame(None)
+        panel = wx.Panel(frame)
+        frame.Show()
+        base = darkdetect_stats()
+        calls = []
+        def callback(is_dark=None):
+            calls.append(is_dark)
+        register_darkdetect(callback, window=panel)
+        register_darkdetect(callback, window=panel)
+        stats = darkdetect_stats()
+        assert stats['callbacks'] == base['callbacks'] + 1
+        assert stats['strong'] == base['strong'] + 1
+        assert stats['windows'] == base['windows'] + 1
+        set_dark_mode(True)
+        assert calls == [True]
+
+        unregister_darkdetect(callback)
+        stats = darkdetect_stats()
+        assert stats['callbacks'] == base['callbacks']
+        assert stats['windows'] == base['windows']
+
+        class Listener:
+            def on_dark(self, is_dark=None):
+                calls.append(is_dark)
+        listener = Listener()
+        register_darkdetect(listener.on_dark)
+        assert darkdetect_stats()['weak'] == base['weak'] + 1
+        del listener
+        gc.collect()
+        assert darkdetect_stats()['weak'] == base['weak']
+
+        register_darkdetect(callback, window=panel)
+        assert darkdetect_stats()['windows'] == base['windows'] + 1
+        panel.Destroy()
+        stats = darkdetect_stats()
+        assert stats['callbacks'] == base['callbacks']
+        assert stats['windows'] == base['windows']
+        set_dark_mode(False)
+        assert calls == [True]
+        frame.Destroy()
+        set_dark_mode(None)
+        app.Destroy()
+
+    def test_detector_restart(self):
+        detector = LinuxThemeDetector()
+        events = []
+        detector._listen = events.append
+        detector.start()
+        detector.start()
+        detector.stop()
+        detector.start()
+        detector._thread.join()
+        assert len(events) == 2
+        assert events[0].is_set()       # the first listener sees its own stop
+        assert not events[1].is_set()
+        detector.stop()
+        assert events[1].is_set()
+
+    def test_gc_font_dpi(self):
+        app = wx.App()
+        cache = ResourceCache()
+        dc = wx.MemoryDC(wx.Bitmap(10, 10))
+        gc = wx.GraphicsContext.Create(dc)
+        font = wx.SystemSettings.GetFont(wx.SYS_DEFAULT_GUI_FONT)
+        f1 = cache.font(font, (0, 0, 0), gc)
+        assert cache.font(font, (0, 0, 0), gc) is f1
+        assert cache.font(font, (0, 0, 0)) is not f1
+        assert any(key[2] == tuple(gc.GetDPI()) for key in cache._fonts)
+        del gc
+        dc.SelectObject(wx.NullBitmap)
+        app.Destroy()
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-x', '-s'])
@@ -6,50 +6,95 @@ from .version import version as __version__
 __author__  = 'Matthew Newville'
 
 import sys
+import importlib
 import wx
 
 if sys.platform.lower() == 'darwin':
     wx.PyApp.IsDisplayAvailable = lambda _: True
 
-from . import utils
-
-from .utils import (gcd, ExceptionPopup, set_sizer, pack, panel_pack,
-                    set_widget_value, get_widget_value,
-                    show_wxsizes, SetTip, Font, HLine, Check, MenuItem, Popup,
-                    RIGHT, LEFT, CEN , LCEN, RCEN, CCEN, LTEXT, FRAMESTYLE)
-
-from .colors import COLORS, GUI_COLORS, GUIColors, get_color, set_color, DARK_THEME, is_dark_theme, register_darkdetect, use_darkdetect
-
-from .themes import ColorTheme, set_theme, get_theme, light_theme, dark_theme
-
-from .base import EnableBase, EnableControl, EnablePanel
-
-from .buttons import Button, ToggleButton, BitmapButton, FlatButton, FlatRadioButton, FlatToggleButton, FlatIconButton
-from .inputs import FlatCheckBox, FlatTextCtrl, FlatCombo
-from .scrollbars import FlatScrollBar, FlatHScrollBar
-from .splitter import FlatSplitter
-from .display import StatusField, SectionDivider, FlatPanel, FlatLabel, FlatProgressBar, FlatTabbedPanel
-from .tables import FlatTableHeader, FlatTableRow, FlatScrolledPanel
-from .menubar import FlatMenuBar
-from .editor import FlatScriptEditorDialog, apply_python_highlighting
-from .choice import Choice, YesNo, FlatMessageDialog, FlatConfirmDialog, FlatWaitDialog
-from .dates import hms, DateTimeCtrl
-from .text import SimpleText, TextCtrl, LabeledTextCtrl, HyperText
-from .dialogs import OkCancel, FileOpen, FileSave, SelectWorkdir, SavedParameterDialog
-from .filechecklist import FileCheckList, FileDropTarget
-from .listbox import EditableListBox
-from .gridpanel import GridPanel, RowPanel
-from .icons import (get_icon,
-                    draw_plus, draw_cross, draw_check,
-                    draw_chevron_left, draw_chevron_right, draw_chevron_up, draw_chevron_down,
-                    draw_refresh, draw_arrow_up, draw_arrow_down,
-                    draw_cog, draw_folder, draw_folder_open, draw_search, draw_trash)
-from .floats import (make_steps, set_float, FloatCtrl, NumericCombo,
-                     FloatSpin, FloatSpinWithPin)
-
-from .notebooks import flatnotebook
-from .periodictable import  PeriodicTablePanel
-from .passwords import (random_salt, hash_password, password_rules,
-                        PasswordSetDialog, PasswordCheckDialog)
-from .paths import (platform, nativepath, get_homedir, get_configfile,
-                    save_configfile, get_cwd)
+# Public names are exported lazily (PEP 562): a submodule is imported
+# only when one of its names is first accessed, so that `import wxutils`
+# does not pull in wx.stc, agw, the icon tables, etc.
+_LAZY_EXPORTS = {
+    'utils': ('gcd', 'ExceptionPopup', 'set_sizer', 'pack', 'panel_pack',
+              'set_widget_value', 'get_widget_value',
+              'show_wxsizes', 'SetTip', 'Font', 'HLine', 'Check', 'MenuItem', 'Popup',
+              'RIGHT', 'LEFT', 'CEN', 'LCEN', 'RCEN', 'CCEN', 'LTEXT', 'FRAMESTYLE'),
+    'colors': ('COLORS', 'GUI_COLORS', 'GUIColors', 'get_color', 'set_color',
+               'DARK_THEME', 'is_dark_theme', 'set_dark_mode',
+               'register_darkdetect', 'unregister_darkdetect', 'darkdetect_stats',
+               'queue_refresh', 'set_darkdetect_batching',
+               'use_darkdetect'),
+    'themes': ('ColorTheme', 'set_theme', 'get_theme', 'light_theme', 'dark_theme',
+               'theme_generation'),
+    'resources': ('get_pen', 'get_brush', 'get_gc_font', 'get_icon_bitmap',
+                  'resource_cache_stats'),
+    'base': ('EnableBase', 'EnableControl', 'EnablePanel'),
+    'buttons': ('Button', 'ToggleButton', 'BitmapButton', 'FlatButton',
+                'FlatRadioButton', 'FlatToggleButton', 'FlatIconButton'),
+    'inputs': ('FlatCheckBox', 'FlatTextCtrl', 'FlatCombo', 'combo_popup_stats'),
+    'scrollbars': ('FlatScrollBar', 'FlatHScrollBar'),
+    'splitter': ('FlatSplitter',),
+    'display': ('StatusField', 'SectionDivider', 'FlatPanel', 'FlatLabel',
+                'FlatProgressBar', 'FlatTabbedPanel'),
+    'tables': ('FlatTableHeader', 'FlatTableRow', 'FlatScrolledPanel',
+               'FlatDataTable', 'TableIndex', 'TableLayout'),
+    'menubar': ('FlatMenuBar',),
+    'editor': ('FlatScriptEditorDialog', 'apply_python_highlighting'),
+    'choice': ('Choice', 'YesNo', 'FlatMessageDialog', 'FlatConfirmDialog',
+               'FlatWaitDialog'),
+    'dates': ('hms', 'DateTimeCtrl'),
+    'text': ('SimpleText', 'TextCtrl', 'LabeledTextCtrl', 'HyperText'),
+    'dialogs': ('OkCancel', 'FileOpen', 'FileSave', 'SelectWorkdir',
+                'SavedParameterDialog'),
+    'filechecklist': ('FileCheckList', 'FileDropTarget'),
+    'listbox': ('EditableListBox',),
+    'gridpanel': ('GridPanel', 'RowPanel'),
+    'icons': ('get_icon', 'get_icon_bundle', 'icon_cache_stats',
+              'draw_plus', 'draw_cross', 'draw_check',
+              'draw_chevron_left', 'draw_chevron_right', 'draw_chevron_up',
+              'draw_chevron_down', 'draw_refresh', 'draw_arrow_up', 'draw_arrow_down',
+              'draw_cog', 'draw_folder', 'draw_folder_open', 'draw_search', 'draw_trash'),
+    'floats': ('make_steps', 'set_float', 'FloatCtrl', 'NumericCombo',
+               'FloatSpin', 'FloatSpinWithPin'),
+    'notebooks': ('flatnotebook',),
+    'periodictable': ('PeriodicTablePanel',),
+    'passwords': ('random_salt', 'hash_password', 'calibrate_iterations',
+                  'password_rules', 'PasswordRules', 'audit_passwords',
+                  'PasswordSetDialog', 'PasswordCheckDialog'),
+    'paths': ('platform', 'nativepath', 'get_homedir', 'get_configfile',
+              'save_configfile', 'get_cwd'),
+}
+
+_SUBMODULES = ('utils', 'colors', 'themes', 'resources', 'base', 'buttons',
+               'inputs', 'scrollbars', 'splitter', 'display', 'tables',
+               'menubar', 'editor', 'choice', 'dates', 'text', 'dialogs',
+               'filechecklist', 'listbox', 'gridpanel', 'icons', 'floats',
+               'myfloatspin', 'notebooks', 'periodictable', 'passwords',
+               'paths', 'imageframe', 'readlinetextctrl')
+
+_NAME_TO_MODULE = {name: modname for modname, names in _LAZY_EXPORTS.items()
+                   for name in names}
+
+# dark-mode dependent names are looked up on every access, so they
+# always reflect the current mode
+_LIVE_NAMES = ('COLORS', 'GUI_COLORS', 'DARK_THEME')
+
+__all__ = list(_NAME_TO_MODULE)
+
+
+def __getattr__(name):
+    """import the submodule providing `name` on first access"""
+    modname = _NAME_TO_MODULE.get(name, None)
+    if modname is not None:
+        value = getattr(importlib.import_module(f'.{modname}', __name__), name)
+        if name not in _LIVE_NAMES:
+            globals()[name] = value
+        return value
+    if name in _SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_SUBMODULES))
@@ -3,8 +3,9 @@ import wx
 from typing import Callable, Optional
 
 from .base import EnableControl
-from .colors import register_darkdetect
+from .colors import register_darkdetect, queue_refresh
 from .themes import get_theme
+from .resources import get_brush, get_pen, get_gc_font, get_icon_bitmap
 
 
 class Button(wx.Button):
@@ -151,7 +152,7 @@ class FlatButton(EnableControl):
     def _on_dark_theme(self, is_dark: bool = True) -> None:
         """Registered with darkdetect; rebuilds default colors on theme change."""
         self._resolve_colors()
-        wx.CallAfter(lambda: self and self.Refresh())
+        queue_refresh(self)
 
     def _on_size(self, event: wx.SizeEvent) -> None:
         self.Refresh()
@@ -179,18 +180,18 @@ class FlatButton(EnableControl):
             bg = self._idle_bg
 
         # Paint the parent's background first
-        gc.SetBrush(wx.Brush(self.GetParent().GetBackgroundColour()))
+        gc.SetBrush(get_brush(self.GetParent().GetBackgroundColour()))
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRectangle(0, 0, w, h)
 
-        gc.SetBrush(wx.Brush(bg))
+        gc.SetBrush(get_brush(bg))
         gc.DrawRoundedRectangle(0, 0, w, h, self._corner_radius)
 
         font = self._font if self._font is not None else self.GetFont()
         fg = self._disabled_fg if not enabled else (
             self._hover_fg if (self._hovered or self._pressed) else self._idle_fg
         )
-        gc.SetFont(font, fg)
+        gc.SetFont(get_gc_font(font, fg, gc))
         tw, th = gc.GetTextExtent(self._label)
         gc.DrawText(self._label, (w - tw) / 2, (h - th) / 2)
 
@@ -286,7 +287,7 @@ class FlatRadioButton(EnableControl):
 
     def _on_dark_theme(self, is_dark: bool = True) -> None:
         self._resolve_colors()
-        wx.CallAfter(lambda: self and self.Refresh())
+        queue_refresh(self)
 
     def _on_enter(self, event: wx.MouseEvent) -> None:
         self._hovered = True
@@ -303,21 +304,21 @@ class FlatRadioButton(EnableControl):
         gc = wx.GraphicsContext.Create(dc)
         w, h = self.GetClientSize()
 
-        gc.SetBrush(wx.Brush(self._bg))
+        gc.SetBrush(get_brush(self._bg))
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRectangle(0, 0, w, h)
 
         cx, cy = w / 2, h / 2
         r = self._size / 2
         ring_colour = self._accent if (self._value or self._hovered) else self._inactive
-        gc.SetPen(wx.Pen(ring_colour, 2))
-        gc.SetBrush(wx.Brush(self._ring_fill))
+        gc.SetPen(get_pen(ring_colour, 2))
+        gc.SetBrush(get_brush(self._ring_fill))
         gc.DrawEllipse(cx - r, cy - r, self._size, self._size)
 
         if self._value:
             inner = self._size * 0.45
             gc.SetPen(wx.TRANSPARENT_PEN)
-            gc.SetBrush(wx.Brush(self._accent))
+            gc.SetBrush(get_brush(self._accent))
             gc.DrawEllipse(cx - inner / 2, cy - inner / 2, inner, inner)
 
     def _on_click(self, event: wx.MouseEvent) -> None:
@@ -417,7 +418,7 @@ class FlatToggleButton(EnableControl):
 
     def _on_dark_theme(self, is_dark: bool = True) -> None:
         self._resolve_colors()
-        wx.CallAfter(lambda: self and self.Refresh())
+        queue_refresh(self)
 
     def _on_size(self, event: wx.SizeEvent) -> None:
         self.Refresh()
@@ -442,16 +443,16 @@ class FlatToggleButton(EnableControl):
         else:
             colour = self._off_hover if self._hovered else self._off
 
-        gc.SetBrush(wx.Brush(self.GetParent().GetBackgroundColour()))
+        gc.SetBrush(get_brush(self.GetParent().GetBackgroundColour()))
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRectangle(0, 0, w, h)
 
-        gc.SetPen(wx.Pen(colour, 1))
+        gc.SetPen(get_pen(colour, 1))
         gc.SetBrush(wx.TRANSPARENT_BRUSH)
         gc.DrawRoundedRectangle(1, 1, w - 2, h - 2, self._corner_radius)
 
         font = self._font if self._font is not None else self.GetFont()
-        gc.SetFont(font, colour)
+        gc.SetFont(get_gc_font(font, colour, gc))
         tw, th = gc.GetTextExtent(self._label)
         gc.DrawText(self._label, (w - tw) / 2, (h - th) / 2)
 
@@ -486,6 +487,8 @@ class FlatIconButton(EnableControl):
     action: optional callback accepting a wx.CommandEvent
     icon_scheme: optional three-color tuple (idle_bg, hover_bg, press_bg)
     corner_radius: background rounded-rectangle corner radius (default 4)
+    cache_icon: draw the icon once into a cached bitmap (default True);
+                use False for a draw_fn whose output depends on other state
     """
 
     def __init__(
@@ -497,11 +500,13 @@ class FlatIconButton(EnableControl):
         action: Optional[Callable[[wx.CommandEvent], None]] = None,
         icon_scheme = None,
         corner_radius: int = 4,
+        cache_icon: bool = True,
         **kws,
     ) -> None:
         sz = icon_size + 8
         super().__init__(parent, size=wx.Size(sz, sz), style=wx.BORDER_NONE, **kws)
         self._draw_fn = draw_fn
+        self._cache_icon = cache_icon
         self._icon_size = icon_size
         self._corner_radius = corner_radius
         self._hovered = False
@@ -560,7 +565,7 @@ class FlatIconButton(EnableControl):
 
     def _on_dark_theme(self, is_dark: bool = True) -> None:
         self._resolve_colors()
-        wx.CallAfter(lambda: self and self.Refresh())
+        queue_refresh(self)
 
     def _on_size(self, event: wx.SizeEvent) -> None:
         self.Refresh()
@@ -586,16 +591,21 @@ class FlatIconButton(EnableControl):
             bg = self._idle_bg
 
         parent_bg = self._idle_bg
-        gc.SetBrush(wx.Brush(parent_bg))
+        gc.SetBrush(get_brush(parent_bg))
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRectangle(0, 0, w, h)
 
-        gc.SetBrush(wx.Brush(bg))
+        gc.SetBrush(get_brush(bg))
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRoundedRectangle(0, 0, w, h, self._corner_radius)
 
-        gc.SetAntialiasMode(wx.ANTIALIAS_DEFAULT)
         offset = (w - self._icon_size) / 2
+        if self._cache_icon:
+            bmp = get_icon_bitmap(self._draw_fn, self._icon_size, enabled=enabled,
+                                  scale=self.GetContentScaleFactor())
+            gc.DrawBitmap(bmp, offset, offset, self._icon_size, self._icon_size)
+            return
+        gc.SetAntialiasMode(wx.ANTIALIAS_DEFAULT)
         gc.Translate(offset, offset)
         if not enabled:
             gc.BeginLayer(0.35)
@@ -1,5 +1,9 @@
 import atexit
+import os
 import subprocess
+import threading
+import time
+import weakref
 import wx
 
 from packaging import version as pkg_version
@@ -7,14 +11,155 @@ from functools import partial
 from pyshortcuts import uname
 import darkdetect
 
+from .themes import bump_theme_generation
+
 WINDOWS_STARTMODE = None
 
 # use jeepney for dark detection on linux
 jeepney = None
 
 
+PORTAL_PATH = '/org/freedesktop/portal/desktop'
+PORTAL_NAME = 'org.freedesktop.portal.Desktop'
+PORTAL_IFACE = 'org.freedesktop.portal.Settings'
+APPEARANCE_KEY = ('org.freedesktop.appearance', 'color-scheme')
+GSETTINGS_KEYS = ('color-scheme', 'gtk-theme')
+
+
+def _unwrap_variant(value):
+    "unwrap (nested) D-Bus variants returned as (signature, value) tuples"
+    while (isinstance(value, tuple) and len(value) == 2
+           and isinstance(value[0], str)):
+        value = value[1]
+    return value
+
+
+class LinuxThemeDetector:
+    """Non-blocking dark-mode detection for Linux
+
+    A background thread holds a single D-Bus connection to the
+    freedesktop portal and listens for the `SettingChanged` signal, so
+    that changes are pushed to `onDarkTheme()` with `wx.CallAfter`.
+
+    If the portal is not available, `get_theme()` falls back to polling
+    `gsettings` with a subprocess that is started on one call and
+    collected on a later call, so the GUI thread never waits on it.
+    """
+    def __init__(self, theme='Light'):
+        self.theme = theme
+        self.listening = False
+        self._thread = None
+        self._stop = None
+        self._proc = None
+        self._gkey = 0
+        self._has_gsettings = True
+
+    def start(self):
+        """start the portal listener thread"""
+        if self._thread is not None:
+            return
+        self._stop = threading.Event()
+        self.listening = True
+        self._thread = threading.Thread(target=self._listen,
+                                        args=(self._stop,),
+                                        name='wxutils-darkdetect',
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """stop the portal listener thread"""
+        if self._stop is not None:
+            self._stop.set()
+        self._thread = None
+        self.listening = False
+
+    def _set_theme(self, theme):
+        if theme != self.theme:
+            self.theme = theme
+            wx.CallAfter(onDarkTheme)
+
+    def _listen(self, stop):
+        """thread target: listen for portal SettingChanged signals until
+        `stop`, the Event of the start() that made this thread, is set"""
+        try:
+            from jeepney import (DBusAddress, MatchRule, new_method_call,
+                                 message_bus)
+            from jeepney.io.blocking import open_dbus_connection, Proxy
+            conn = open_dbus_connection(bus='SESSION')
+        except Exception:
+            if self._stop is stop:
+                self.listening = False
+            return
+        rule = MatchRule(type='signal', interface=PORTAL_IFACE,
+                         member='SettingChanged', path=PORTAL_PATH)
+        portal = DBusAddress(object_path=PORTAL_PATH, bus_name=PORTAL_NAME,
+                             interface=PORTAL_IFACE)
+        try:
+            Proxy(message_bus, conn).AddMatch(rule)
+            with conn.filter(rule) as queue:
+                method = new_method_call(portal, 'Read', 'ss', APPEARANCE_KEY)
+                reply = conn.send_and_get_reply(method, timeout=5)
+                if reply.header.message_type.name == 'error':
+                    return
+                darkmode = _unwrap_variant(reply.body[0])
+                self._set_theme('Dark' if darkmode == 1 else 'Light')
+                while not stop.is_set():
+                    try:
+                        msg = conn.recv_until_filtered(queue, timeout=1.0)
+                    except TimeoutError:
+                        continue
+                    if stop.is_set():
+                        break
+                    namespace, key, value = msg.body
+                    if (namespace, key) == APPEARANCE_KEY:
+                        darkmode = _unwrap_variant(value)
+                        self._set_theme('Dark' if darkmode == 1 else 'Light')
+        except Exception:
+            pass
+        finally:
+            if self._stop is stop:
+                self.listening = False
+            conn.close()
+
+    def poll(self):
+        """check gsettings without blocking: start a subprocess if none
+        is running, or collect the result of a finished one"""
+        if not self._has_gsettings:
+            return self.theme
+        proc = self._proc
+        if proc is None:
+            try:
+                self._proc = subprocess.Popen(
+                    ['gsettings', 'get', 'org.gnome.desktop.interface',
+                     GSETTINGS_KEYS[self._gkey]],
+                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            except Exception:
+                self._has_gsettings = False
+            return self.theme
+        if proc.poll() is None:
+            return self.theme
+        self._proc = None
+        stdout = proc.stdout.read().decode()
+        proc.stdout.close()
+        if len(stdout) > 1:
+            self.theme = 'Dark' if '-dark' in stdout.lower().strip() else 'Light'
+            self._gkey = 0
+        else:
+            self._gkey = (self._gkey + 1) % len(GSETTINGS_KEYS)
+        return self.theme
+
+    def get_theme(self):
+        """return 'Dark' or 'Light', without blocking"""
+        if self.listening:
+            return self.theme
+        return self.poll()
+
+_LINUX_DETECTOR = None
+
 def dark_theme_linux():
     global jeepney
+    if _LINUX_DETECTOR is not None:
+        return _LINUX_DETECTOR.get_theme()
     if jeepney is not None:
         # Using the freedesktop portals for checking dark mode
         try:
@@ -84,25 +229,203 @@ elif uname == 'win':
     dark_theme = dark_theme_windows
 
 _DD_TIMER = None
-_DD_OBJECTS = []
-IS_DARK = DARK_THEME = (dark_theme() == 'Dark')
+
+# dark-mode callbacks, keyed by _dd_key(callback), with values of
+# (ref, is_weak, winref).  Bound methods are held with weakref.WeakMethod,
+# and removed when their object is garbage collected or when their
+# wx.Window is destroyed.  Other callables are held strongly until
+# unregistered or until the window they were registered with is destroyed.
+# winref is a weak reference to that window, or None.
+_DD_OBJECTS = {}
+_DD_WINDOWS = {}   # id(window) -> (set of keys registered for that window,
+                   #                 its EVT_WINDOW_DESTROY handler)
+
+# Theme changes are broadcast in batches: the top-level windows of all
+# visible callback windows are frozen while the callbacks run, and
+# refreshes requested with queue_refresh() are coalesced into a single
+# CallAfter per top-level window.  Callbacks for windows that are not
+# shown are deferred until their hidden ancestor is shown.
+_DD_BATCHED = True
+_DD_PENDING = None   # id(window) -> window, while a broadcast runs
+_DD_DEFERRED = {}    # id(hidden ancestor) -> (ancestor, set of keys)
+_DD_LAST_FLIP = {'seconds': 0.0, 'callbacks': 0, 'deferred': 0,
+                 'toplevels': 0}
+
+# Dark mode is resolved on first use (is_dark_theme(), get_color(),
+# COLORS, ...), not at import, as probing may fork `gsettings`.
+# Set WXUTILS_DARK_MODE to 'dark' or 'light' (or use set_dark_mode())
+# to pin the mode without probing.
+DARK_MODE_ENV = 'WXUTILS_DARK_MODE'
+_IS_DARK = None
+_DARK_PINNED = False
+
+def _resolve_dark_mode():
+    global _IS_DARK, _DARK_PINNED
+    if _IS_DARK is None:
+        envmode = os.environ.get(DARK_MODE_ENV, 'auto').strip().lower()
+        if envmode in ('dark', '1', 'true', 'yes'):
+            _IS_DARK, _DARK_PINNED = True, True
+        elif envmode in ('light', '0', 'false', 'no'):
+            _IS_DARK, _DARK_PINNED = False, True
+        else:
+            _IS_DARK = (dark_theme() == 'Dark')
+    return _IS_DARK
+
+def _set_dark_mode(now_dark):
+    "set dark mode, and run callbacks if it changed"
+    global _IS_DARK
+    if now_dark != _IS_DARK:
+        _IS_DARK = now_dark
+        bump_theme_generation()
+        _broadcast_theme(now_dark)
+
+def _run_darkdetect(key, is_dark):
+    "run one registered callback, dropping it if it is dead"
+    entry = _DD_OBJECTS.get(key, None)
+    if entry is None:
+        return
+    ref, is_weak, _ = entry
+    cb = ref() if is_weak else ref
+    try:
+        if not callable(cb):
+            _dd_remove(key)
+        else:
+            cb(is_dark=is_dark)
+    except RuntimeError:
+        _dd_remove(key)
+    except Exception:
+        pass
+
+def _hidden_ancestor(window):
+    "the outermost window hiding `window` (possibly itself), or None if shown"
+    hidden = None
+    while window:
+        if not window.IsShown():
+            hidden = window
+        if window.IsTopLevel():
+            break
+        window = window.GetParent()
+    return hidden
+
+def _refresh_windows(windows):
+    for win in windows:
+        if win:
+            win.Refresh()
+
+def _run_batch(keys, is_dark, toplevels=()):
+    """run callbacks for keys with toplevels frozen, coalescing their
+    queue_refresh() calls into one CallAfter per top-level window"""
+    global _DD_PENDING
+    outer = _DD_PENDING is None
+    if outer:
+        _DD_PENDING = {}
+    for top in toplevels:
+        top.Freeze()
+    try:
+        for key in keys:
+            _run_darkdetect(key, is_dark)
+    finally:
+        for top in toplevels:
+            if top:
+                top.Thaw()
+        if outer:
+            pending, _DD_PENDING = _DD_PENDING, None
+            bytop = {}
+            for win in pending.values():
+                if win:
+                    top = wx.GetTopLevelParent(win) or win
+                    bytop.setdefault(id(top), [top]).append(win)
+            for windows in bytop.values():
+                wx.CallAfter(_refresh_windows, windows)
+
+def _broadcast_theme(is_dark):
+    "run all dark-mode callbacks after a change of mode"
+    t0 = time.perf_counter()
+    if not _DD_BATCHED:
+        keys = list(_DD_OBJECTS)
+        for key in keys:
+            _run_darkdetect(key, is_dark)
+        _DD_LAST_FLIP.update(seconds=time.perf_counter()-t0,
+                             callbacks=len(keys), deferred=0, toplevels=0)
+        return
+
+    for hid, (hidden, _, _) in list(_DD_DEFERRED.items()):
+        if not hidden:
+            _DD_DEFERRED.pop(hid, None)
+
+    keys, toplevels, ndeferred = [], {}, 0
+    for key, (_, _, winref) in list(_DD_OBJECTS.items()):
+        win = winref() if winref is not None else None
+        if win:
+            hidden = _hidden_ancestor(win)
+            if hidden is not None:
+                _defer_darkdetect(hidden, key)
+                ndeferred += 1
+                continue
+            top = wx.GetTopLevelParent(win)
+            if top:
+                toplevels[id(top)] = top
+        keys.append(key)
+    _run_batch(keys, is_dark, toplevels.values())
+    _DD_LAST_FLIP.update(seconds=time.perf_counter()-t0, callbacks=len(keys),
+                         deferred=ndeferred, toplevels=len(toplevels))
+
+def _defer_darkdetect(hidden, key):
+    "run callback `key` when the hidden window `hidden` is next shown"
+    hid = id(hidden)
+    if hid not in _DD_DEFERRED:
+        handler = partial(_on_deferred_show, hid)
+        _DD_DEFERRED[hid] = (hidden, set(), handler)
+        hidden.Bind(wx.EVT_SHOW, handler)
+    _DD_DEFERRED[hid][1].add(key)
+
+def _on_deferred_show(hid, event):
+    "run deferred callbacks for a window being shown"
+    event.Skip()
+    if not event.IsShown() or hid not in _DD_DEFERRED:
+        return
+    hidden, keys, handler = _DD_DEFERRED.pop(hid)
+    hidden.Unbind(wx.EVT_SHOW, handler=handler)
+    top = wx.GetTopLevelParent(hidden)
+    _run_batch(list(keys), is_dark_theme(), [top] if top else [])
+
+def queue_refresh(window):
+    """refresh a window after the current event.  During a dark-mode
+    broadcast, refreshes are coalesced per top-level window"""
+    if _DD_PENDING is not None:
+        _DD_PENDING[id(window)] = window
+    else:
+        wx.CallAfter(_refresh_windows, [window])
+
+def set_darkdetect_batching(batched=True):
+    """set whether dark-mode changes are broadcast in batches (default),
+    or by running every callback immediately"""
+    global _DD_BATCHED
+    _DD_BATCHED = bool(batched)
+
+def set_dark_mode(dark=None):
+    """pin dark mode on (True) or off (False) without probing the OS setting,
+    or use None to go back to following the OS setting.
+    """
+    global _IS_DARK, _DARK_PINNED
+    if dark is None:
+        _DARK_PINNED = False
+        if _IS_DARK is not None:
+            onDarkTheme()
+    else:
+        _DARK_PINNED = True
+        if _IS_DARK is None:
+            _IS_DARK = bool(dark)
+        else:
+            _set_dark_mode(bool(dark))
 
 def onDarkTheme(event=None, **kws):
-    global _DD_OBJECTS, IS_DARK, DARK_THEME, COLORS, COLORS_LIGHT, COLORS_DARK
-    now_dark = (dark_theme() == 'Dark')
-    if now_dark != IS_DARK:
-        IS_DARK = DARK_THEME = now_dark
-        COLORS = COLORS_DARK if IS_DARK else COLORS_LIGHT
-        for cb in _DD_OBJECTS[:]:
-            try:
-                if not callable(cb):
-                    _DD_OBJECTS.remove(cb)
-                else:
-                    cb(is_dark=IS_DARK)
-            except RuntimeError:
-                _DD_OBJECTS.remove(cb)
-            except Exception:
-                pass
+    if _DARK_PINNED:
+        return
+    if _IS_DARK is None:
+        _resolve_dark_mode()
+    else:
+        _set_dark_mode(dark_theme() == 'Dark')
 
 def stop_darkdetect_timer():
     """
@@ -112,11 +435,23 @@ def stop_darkdetect_timer():
         _DD_TIMER.Stop()
     except Exception:
         pass
+    try:
+        _LINUX_DETECTOR.stop()
+    except Exception:
+        pass
 
 
 def use_darkdetect(parent=None, poll_time=1000):
-    global _DD_TIMER
+    """start watching for changes in dark mode
+
+    On Linux, this starts a LinuxThemeDetector, so that changes are pushed
+    from the desktop portal and timer ticks never block the GUI thread.
+    """
+    global _DD_TIMER, _LINUX_DETECTOR
     if _DD_TIMER is None:
+        if uname == 'linux' and _LINUX_DETECTOR is None and not _DARK_PINNED:
+            _LINUX_DETECTOR = LinuxThemeDetector('Dark' if is_dark_theme() else 'Light')
+            _LINUX_DETECTOR.start()
         if parent is None:
             parent = wx.GetApp()
         _DD_TIMER = wx.Timer(parent)
@@ -124,14 +459,88 @@ def use_darkdetect(parent=None, poll_time=1000):
         wx.CallAfter(_DD_TIMER.Start, poll_time)
         atexit.register(stop_darkdetect_timer)
 
-def register_darkdetect(callable):
+def _dd_key(callback):
+    "registry key for a callback: bound methods are keyed by (object, function)"
+    obj = getattr(callback, '__self__', None)
+    func = getattr(callback, '__func__', None)
+    if obj is not None and func is not None:
+        return (id(obj), func)
+    return id(callback)
+
+def _on_window_destroy(wid, event):
+    "remove all callbacks registered for a window being destroyed"
+    if event.GetEventObject() is not None and id(event.GetEventObject()) == wid:
+        keys, _ = _DD_WINDOWS.pop(wid, ((), None))
+        for key in keys:
+            _DD_OBJECTS.pop(key, None)
+        _DD_DEFERRED.pop(wid, None)
+    event.Skip()
+
+def register_darkdetect(callable, window=None):
     """defined a callback to be run when darkdetect
        sees a change in Dark Mode
+
+    Arguments
+    ---------
+    callable   callback, called as callable(is_dark=bool)
+    window     wx.Window or None, window that the callback belongs to.
+
+    Bound methods are held by weak reference.  The callback is removed
+    when `window` (or the wx.Window of a bound method) is destroyed,
+    or with `unregister_darkdetect()`.
     """
-    global _DD_OBJECTS
     use_darkdetect()
-    if callable not in _DD_OBJECTS:
-        _DD_OBJECTS.append(callable)
+    key = _dd_key(callable)
+    if key in _DD_OBJECTS:
+        return
+    if isinstance(key, tuple):
+        ref = weakref.WeakMethod(callable, lambda _ref, key=key: _dd_remove(key))
+        is_weak = True
+        if window is None:
+            window = callable.__self__
+    else:
+        ref, is_weak = callable, False
+
+    winref = None
+    if isinstance(window, wx.Window):
+        winref = weakref.ref(window)
+    _DD_OBJECTS[key] = (ref, is_weak, winref)
+
+    if winref is not None:
+        wid = id(window)
+        if wid not in _DD_WINDOWS:
+            handler = partial(_on_window_destroy, wid)
+            _DD_WINDOWS[wid] = (set(), handler)
+            window.Bind(wx.EVT_WINDOW_DESTROY, handler)
+        _DD_WINDOWS[wid][0].add(key)
+
+def _dd_remove(key):
+    "remove a callback from the registry, and from its window and deferred sets"
+    entry = _DD_OBJECTS.pop(key, None)
+    if entry is None:
+        return
+    window = entry[2]() if entry[2] is not None else None
+    if window and id(window) in _DD_WINDOWS:
+        keys, handler = _DD_WINDOWS[id(window)]
+        keys.discard(key)
+        if not keys:
+            del _DD_WINDOWS[id(window)]
+            window.Unbind(wx.EVT_WINDOW_DESTROY, handler=handler)
+    for _, keys, _ in _DD_DEFERRED.values():
+        keys.discard(key)
+
+def unregister_darkdetect(callable):
+    """remove a callback registered with `register_darkdetect()`"""
+    _dd_remove(_dd_key(callable))
+
+def darkdetect_stats():
+    """return diagnostics of registered dark-mode callbacks"""
+    nweak = len([1 for _, is_weak, _ in _DD_OBJECTS.values() if is_weak])
+    ndeferred = sum(len(keys) for _, keys, _ in _DD_DEFERRED.values())
+    return {'callbacks': len(_DD_OBJECTS), 'weak': nweak,
+            'strong': len(_DD_OBJECTS) - nweak,
+            'windows': len(_DD_WINDOWS), 'deferred': ndeferred,
+            'last_flip': dict(_DD_LAST_FLIP)}
 
 
 COLORS_LIGHT = {}
@@ -195,8 +604,6 @@ def add_named_color(name, lightcolor, darkcolor):
 for cname, clight, cdark in _COLOR_DATA:
     add_named_color(cname, clight, cdark)
 
-COLORS = COLORS_DARK if IS_DARK else COLORS_LIGHT
-
 X11_COLORS = {'aliceblue': (240,248,255), 'antiquewhite': (250,235,215),
               'antiquewhite1': (255,239,219), 'antiquewhite2': (238,223,204),
               'antiquewhite3': (205,192,176), 'antiquewhite4': (139,131,120),
@@ -478,7 +885,7 @@ X11_COLORS = {'aliceblue': (240,248,255), 'antiquewhite': (250,235,215),
 # attribitue interface
 class GUIColors(object):
     def __init__(self):
-        for key, val in COLORS.items():
+        for key, val in get_colors().items():
             self.add_color(key, val)
 
     def add_color(self, name,  value):
@@ -507,7 +914,7 @@ class GUIColors(object):
         else:
             raise ValueError(f"unknown color value {value}")
 
-GUI_COLORS = GUIColors()
+_GUI_COLORS = None
 
 def set_color(widget, colorname, bg=None):
     """set foreground color and optionally background color by logical name
@@ -528,7 +935,7 @@ def set_color(widget, colorname, bg=None):
                     break
         colorname = newcolorname
 
-    if colorname not in COLORS:
+    if colorname not in COLORS_DARK:
         colorname = 'text'
     color = get_color(colorname)
 
@@ -557,13 +964,20 @@ def set_color(widget, colorname, bg=None):
                 bgsetter = getattr(wid, 'SetBackgroundColour', None)
                 if bgsetter is not None:
                     setter(get_color(colbg, dark=is_dark))
-            wx.CallAfter(wid.Refresh)
+            queue_refresh(wid)
         widget.onDarkTheme = partial(on_dark, widget)
-        register_darkdetect(widget.onDarkTheme)
+        register_darkdetect(widget.onDarkTheme, window=widget)
 
 def is_dark_theme() -> bool:
     """Return True if the current palette is dark. Always reflects live state."""
-    return IS_DARK
+    if _IS_DARK is None:
+        return _resolve_dark_mode()
+    return _IS_DARK
+
+
+def get_colors():
+    """return the COLORS_DARK or COLORS_LIGHT dictionary for the current mode"""
+    return COLORS_DARK if is_dark_theme() else COLORS_LIGHT
 
 
 def get_color(name='text', dark=None):
@@ -574,11 +988,25 @@ def get_color(name='text', dark=None):
     dark   bool or None, force dark or light mode, use None as 'auto' [None]
 
     """
-    global  IS_DARK
     if isinstance(name, wx.Colour):
         return name
     if dark is None:
-        dark = IS_DARK
+        dark = is_dark_theme()
     if name not in COLORS_DARK:
         name = 'text'
     return COLORS_DARK[name] if dark else COLORS_LIGHT[name]
+
+
+def __getattr__(name):
+    """resolve dark-mode dependent module attributes on first use:
+    IS_DARK, DARK_THEME, COLORS, and GUI_COLORS"""
+    global _GUI_COLORS
+    if name in ('IS_DARK', 'DARK_THEME'):
+        return is_dark_theme()
+    if name == 'COLORS':
+        return get_colors()
+    if name == 'GUI_COLORS':
+        if _GUI_COLORS is None:
+            _GUI_COLORS = GUIColors()
+        return _GUI_COLORS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,10 @@
 import wx
-from typing import Optional
+from bisect import bisect_left, bisect_right
+from typing import Callable, Optional
 
-from .colors import register_darkdetect, get_color, is_dark_theme
-from .themes import get_theme
+from .colors import register_darkdetect, queue_refresh, get_color, is_dark_theme
+from .themes import get_theme, theme_generation
+from .resources import get_brush, get_pen, get_gc_font
 
 
 
@@ -47,7 +49,7 @@ class SectionDivider(wx.Control):
 
     def _on_dark_theme(self, is_dark: bool = True) -> None:
         self._resolve_colors(is_dark)
-        wx.CallAfter(self.Refresh)
+        queue_refresh(self)
 
     def _on_paint(self, _: wx.PaintEvent) -> None:
         dc = wx.AutoBufferedPaintDC(self)
@@ -55,18 +57,18 @@ class SectionDivider(wx.Control):
         w, h = self.GetClientSize()
 
         bg = self.GetParent().GetBackgroundColour()
-        gc.SetBrush(wx.Brush(bg))
+        gc.SetBrush(get_brush(bg))
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRectangle(0, 0, w, h)
 
         font = self._font if self._font is not None else self.GetFont().Bold()
-        gc.SetFont(font, self._fg)
+        gc.SetFont(get_gc_font(font, self._fg, gc))
         tw, th = gc.GetTextExtent(self._label)
         cy = h / 2
         tx = (w - tw) / 2
         ty = (h - th) / 2
 
-        gc.SetPen(wx.Pen(self._line, self._line_width))
+        gc.SetPen(get_pen(self._line, self._line_width))
         gc.StrokeLine(self._padding, cy, tx - self._padding, cy)
         gc.StrokeLine(tx + tw + self._padding, cy, w - self._padding, cy)
         gc.DrawText(self._label, tx, ty)
@@ -114,22 +116,22 @@ class StatusField(wx.Control):
 
     def _on_dark_theme(self, is_dark: bool = True) -> None:
         self._resolve_colors()
-        wx.CallAfter(self.Refresh)
+        queue_refresh(self)
 
     def _on_paint(self, _: wx.PaintEvent) -> None:
         dc = wx.AutoBufferedPaintDC(self)
         gc = wx.GraphicsContext.Create(dc)
         w, h = self.GetClientSize()
         # paint the full rect with the parent bg so rounded corners are clean
-        gc.SetBrush(wx.Brush(self.GetParent().GetBackgroundColour()))
+        gc.SetBrush(get_brush(self.GetParent().GetBackgroundColour()))
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRectangle(0, 0, w, h)
-        gc.SetBrush(wx.Brush(self._bg))
+        gc.SetBrush(get_brush(self._bg))
         gc.DrawRoundedRectangle(0, 0, w, h, self._corner_radius)
         if not self._value:
             return
         font = self._font if self._font is not None else self.GetFont().Bold()
-        gc.SetFont(font, self._fg)
+        gc.SetFont(get_gc_font(font, self._fg, gc))
         tw, th = gc.GetTextExtent(self._value)
         gc.DrawText(self._value, (w - tw) / 2, (h - th) / 2)
 
@@ -145,11 +147,11 @@ class FlatPanel(wx.Panel):
 
     def _on_paint(self, _: wx.PaintEvent) -> None:
         dc = wx.AutoBufferedPaintDC(self)
-        dc.SetBackground(wx.Brush(get_theme().background))
+        dc.SetBackground(get_brush(get_theme().background))
         dc.Clear()
 
     def _on_dark_theme(self, is_dark: bool = True) -> None:
-        wx.CallAfter(lambda: self and self.Refresh())
+        queue_refresh(self)
 
 
 class FlatLabel(wx.Control):
@@ -200,19 +202,19 @@ class FlatLabel(wx.Control):
         return wx.Size(tw + 8, th + 4)
 
     def _on_dark_theme(self, is_dark: bool = True) -> None:
-        wx.CallAfter(lambda: self and self.Refresh())
+        queue_refresh(self)
 
     def _on_paint(self, _: wx.PaintEvent) -> None:
         dc = wx.AutoBufferedPaintDC(self)
         gc = wx.GraphicsContext.Create(dc)
         t = get_theme()
         w, h = self.GetClientSize()
-        gc.SetBrush(wx.Brush(t.background))
+        gc.SetBrush(get_brush(t.background))
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRectangle(0, 0, w, h)
         fg = self._custom_fg or t.foreground
         font = self._font or self.GetFont()
-        gc.SetFont(gc.CreateFont(font, fg))
+        gc.SetFont(get_gc_font(font, fg, gc))
         _, th = gc.GetTextExtent(self._label)
         gc.DrawText(self._label, 4, (h - th) / 2)
 
@@ -290,18 +292,18 @@ class FlatProgressBar(wx.Panel):
 
         # clear to parent background first to avoid corner bleed
         parent_bg = self.GetParent().GetBackgroundColour()
-        gc.SetBrush(wx.Brush(parent_bg))
+        gc.SetBrush(get_brush(parent_bg))
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRectangle(0, 0, w, h)
 
         # track
-        gc.SetBrush(wx.Brush(track_bg))
+        gc.SetBrush(get_brush(track_bg))
         gc.DrawRoundedRectangle(0, 0, w, h, r)
 
         # fill
         fill_w = int(w * self._fraction)
         if fill_w > 0:
-            gc.SetBrush(wx.Brush(fill_bg))
+            gc.SetBrush(get_brush(fill_bg))
             gc.DrawRoundedRectangle(0, 0, fill_w, h, r)
 
         # primary + secondary label, centred
@@ -311,14 +313,14 @@ class FlatProgressBar(wx.Panel):
             bold = self.GetFont().Bold()
             norm = self.GetFont()
             full = self._label + self._sublabel
-            gc.SetFont(gc.CreateFont(bold, fg))
+            gc.SetFont(get_gc_font(bold, fg, gc))
             tw, th = gc.GetTextExtent(full)
             tx = (w - tw) / 2
             ty = (h - th) / 2
             if self._sublabel:
                 lw, _ = gc.GetTextExtent(self._label)
                 gc.DrawText(self._label, tx, ty)
-                gc.SetFont(gc.CreateFont(norm, fg_sub))
+                gc.SetFont(get_gc_font(norm, fg_sub, gc))
                 gc.DrawText(self._sublabel, tx + lw, ty)
             else:
                 gc.DrawText(self._label, tx, ty)
@@ -327,13 +329,29 @@ class FlatProgressBar(wx.Panel):
         if self._elapsed:
             fg_sub = wx.Colour(*get_color('graytext'))
             norm = self.GetFont()
-            gc.SetFont(gc.CreateFont(norm, fg_sub))
+            gc.SetFont(get_gc_font(norm, fg_sub, gc))
             ew, eh = gc.GetTextExtent(self._elapsed)
             gc.DrawText(self._elapsed, w - ew - 6, (h - eh) / 2)
 
 
+def _default_tab_scheme():
+    """Tab colors from the active theme:
+    (bar_bg, active_bg, hover_bg, active_fg, inactive_fg, underline, sep)"""
+    theme = get_theme()
+    return (theme.background, theme.bright_black, theme.black, theme.foreground,
+            theme.white, theme.blue, theme.bright_black)
+
+
+_CHEVRON_LEFT = -2
+_CHEVRON_RIGHT = -3
+
 class _FlatTabBar(wx.Control):
-    """Tab strip for FlatTabbedPanel."""
+    """Tab strip for FlatTabbedPanel.
+
+    Tab widths are measured once per label and font, and kept as a
+    prefix-sum array of tab edges used for hit-testing with bisect.
+    When the tabs do not fit, chevrons at both ends scroll the strip.
+    """
 
     def __init__(self, parent: wx.Window, height: int, scheme = None) -> None:
         super().__init__(parent, style=wx.BORDER_NONE)
@@ -343,21 +361,34 @@ class _FlatTabBar(wx.Control):
         self._selection: int = 0
         self._hover: int = -1
         self._on_select: Optional[callable] = None
+        self._theme_gen: int = -1
+        self._theme_scheme = None
+        # cached geometry
+        self._layout_font: Optional[str] = None
+        self._bold_font: Optional[wx.Font] = None
+        self._label_widths: dict[str, int] = {}
+        self._edges: Optional[list[int]] = None
+        self._pad_x: int = 8
+        self._text_h: int = 0
+        self._scroll_x: int = 0
         self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
         self.SetMinSize((-1, height))
         self.Bind(wx.EVT_PAINT, self._on_paint)
-        self.Bind(wx.EVT_SIZE, lambda e: (self.Refresh(), e.Skip()))
+        self.Bind(wx.EVT_SIZE, self._on_size)
         self.Bind(wx.EVT_MOTION, self._on_motion)
         self.Bind(wx.EVT_LEAVE_WINDOW, self._on_leave)
         self.Bind(wx.EVT_LEFT_UP, self._on_click)
+        self.Bind(wx.EVT_MOUSEWHEEL, self._on_wheel)
 
     def SetLabels(self, labels: list[str]) -> None:
         self._labels = list(labels)
+        self._edges = None
         self.Refresh()
 
     def SetSelection(self, idx: int) -> None:
         if 0 <= idx < len(self._labels):
             self._selection = idx
+            self._ensure_visible(idx)
             self.Refresh()
 
     def SetOnSelect(self, callback) -> None:
@@ -366,30 +397,101 @@ class _FlatTabBar(wx.Control):
     def _scheme(self):
         if self._custom_scheme is not None:
             return self._custom_scheme
-        theme = get_theme()
-        return (theme.background, theme.bright_black, theme.black, theme.foreground, theme.white, theme.blue, theme.bright_black)
+        gen = theme_generation()
+        if gen != self._theme_gen:
+            self._theme_scheme = _default_tab_scheme()
+            self._theme_gen = gen
+        return self._theme_scheme
+
+    def _ensure_layout(self) -> list[int]:
+        """Return the tab edges, measuring only labels not measured in this font."""
+        font = self.GetFont()
+        desc = font.GetNativeFontInfoDesc()
+        if desc != self._layout_font:
+            self._layout_font = desc
+            self._bold_font = font.Bold()
+            self._label_widths.clear()
+            self._edges = None
+        if self._edges is None:
+            widths = self._label_widths
+            dc = None
+            for label in self._labels:
+                if label not in widths:
+                    if dc is None:
+                        dc = wx.ClientDC(self)
+                        dc.SetFont(self._bold_font)
+                        _, self._text_h = dc.GetTextExtent("Ag")
+                        self._pad_x = max(8, self._text_h // 2)
+                    widths[label] = dc.GetTextExtent(label)[0]
+            edges = [0]
+            for label in self._labels:
+                edges.append(edges[-1] + widths[label] + self._pad_x * 2)
+            self._edges = edges
+            self._clamp_scroll()
+        return self._edges
+
+    def _chevron_w(self) -> int:
+        """Width of each chevron, or 0 if all tabs fit."""
+        w, h = self.GetClientSize()
+        edges = self._ensure_layout()
+        return max(12, h * 2 // 3) if edges[-1] > w else 0
+
+    def _tab_area(self) -> tuple[int, int]:
+        """x and width of the area in which tabs are drawn."""
+        w, _ = self.GetClientSize()
+        cw = self._chevron_w()
+        return cw, max(0, w - 2 * cw)
+
+    def _clamp_scroll(self) -> None:
+        _, area_w = self._tab_area()
+        self._scroll_x = max(0, min(self._scroll_x, self._edges[-1] - area_w))
+
+    def _ensure_visible(self, idx: int) -> None:
+        edges = self._ensure_layout()
+        _, area_w = self._tab_area()
+        if edges[idx] < self._scroll_x:
+            self._scroll_x = edges[idx]
+        elif edges[idx + 1] > self._scroll_x + area_w:
+            self._scroll_x = edges[idx + 1] - area_w
+        self._clamp_scroll()
+
+    def _scroll_tabs(self, step: int) -> None:
+        """Scroll the strip by one tab to the left (step < 0) or right."""
+        edges = self._ensure_layout()
+        _, area_w = self._tab_area()
+        if step < 0:
+            i = bisect_left(edges, self._scroll_x) - 1
+            self._scroll_x = edges[max(0, i)]
+        else:
+            i = bisect_right(edges, self._scroll_x + area_w)
+            self._scroll_x = edges[min(i, len(edges) - 1)] - area_w
+        self._clamp_scroll()
+        self.Refresh()
 
-    def _tab_rects(self) -> list[tuple[int, int, int, int]]:
-        dc = wx.ClientDC(self)
-        font = self.GetFont().Bold()
-        dc.SetFont(font)
-        _, fh = dc.GetTextExtent("Ag")
-        pad_x = max(8, fh // 2)
+    def _tab_rect(self, idx: int) -> Optional[wx.Rect]:
+        if not 0 <= idx < len(self._labels):
+            if idx in (_CHEVRON_LEFT, _CHEVRON_RIGHT):
+                w, h = self.GetClientSize()
+                cw = self._chevron_w()
+                return wx.Rect(0 if idx == _CHEVRON_LEFT else w - cw, 0, cw, h)
+            return None
+        edges = self._ensure_layout()
+        x0, _ = self._tab_area()
         _, h = self.GetClientSize()
-        rects = []
-        x = 0
-        for label in self._labels:
-            tw, _ = dc.GetTextExtent(label)
-            w = tw + pad_x * 2
-            rects.append((x, 0, w, h))
-            x += w
-        return rects
+        return wx.Rect(x0 + edges[idx] - self._scroll_x, 0, edges[idx + 1] - edges[idx], h)
 
     def _index_at(self, px: int, py: int) -> int:
-        for i, (x, y, w, h) in enumerate(self._tab_rects()):
-            if x <= px < x + w and y <= py < y + h:
-                return i
-        return -1
+        w, h = self.GetClientSize()
+        if not (0 <= py < h and 0 <= px < w):
+            return -1
+        cw = self._chevron_w()
+        if cw > 0 and px < cw:
+            return _CHEVRON_LEFT
+        if cw > 0 and px >= w - cw:
+            return _CHEVRON_RIGHT
+        edges = self._ensure_layout()
+        i = bisect_right(edges, px - cw + self._scroll_x) - 1
+        return i if 0 <= i < len(self._labels) else -1
 
     def _on_paint(self, _: wx.PaintEvent) -> None:
         s = self._scheme()
@@ -397,11 +499,19 @@ class _FlatTabBar(wx.Control):
         dc = wx.AutoBufferedPaintDC(self)
         gc = wx.GraphicsContext.Create(dc)
         w, h = self.GetClientSize()
-        gc.SetBrush(wx.Brush(bar_bg))
+        gc.SetBrush(get_brush(bar_bg))
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRectangle(0, 0, w, h)
-        font = self.GetFont().Bold()
-        for i, (tx, ty, tw, th) in enumerate(self._tab_rects()):
+        edges = self._ensure_layout()
+        x0, area_w = self._tab_area()
+        first = max(0, bisect_right(edges, self._scroll_x) - 1)
+        last = min(len(self._labels), bisect_left(edges, self._scroll_x + area_w))
+        font = self._bold_font
+        pad_x = self._pad_x
+        gc.Clip(x0, 0, area_w, h)
+        for i in range(first, last):
+            tx = x0 + edges[i] - self._scroll_x
+            tw = edges[i + 1] - edges[i]
             active = i == self._selection
             hovered = i == self._hover
             if active:
@@ -410,53 +520,197 @@ class _FlatTabBar(wx.Control):
                 bg = hover_bg
             else:
                 bg = bar_bg
-            gc.SetBrush(wx.Brush(bg))
+            gc.SetBrush(get_brush(bg))
             gc.SetPen(wx.TRANSPARENT_PEN)
-            gc.DrawRectangle(tx, ty, tw, th)
+            gc.DrawRectangle(tx, 0, tw, h)
             fg = active_fg if (active or hovered) else inactive_fg
-            gc.SetFont(gc.CreateFont(font, fg))
-            label = self._labels[i]
-            ltw, lth = gc.GetTextExtent(label)
-            gc.DrawText(label, tx + (tw - ltw) / 2, (th - lth) / 2)
+            gc.SetFont(get_gc_font(font, fg, gc))
+            gc.DrawText(self._labels[i], tx + pad_x, (h - self._text_h) / 2)
             if active:
-                gc.SetBrush(wx.Brush(underline))
+                gc.SetBrush(get_brush(underline))
                 gc.SetPen(wx.TRANSPARENT_PEN)
-                gc.DrawRectangle(tx, th - 2, tw, 2)
-        gc.SetPen(wx.Pen(sep, 1))
+                gc.DrawRectangle(tx, h - 2, tw, 2)
+        gc.ResetClip()
+        if x0 > 0:
+            self._draw_chevron(gc, _CHEVRON_LEFT, self._scroll_x > 0, s)
+            self._draw_chevron(gc, _CHEVRON_RIGHT,
+                               self._scroll_x + area_w < edges[-1], s)
+        gc.SetPen(get_pen(sep, 1))
         gc.StrokeLine(0, h - 1, w, h - 1)
 
-    def _on_motion(self, event: wx.MouseEvent) -> None:
-        idx = self._index_at(event.GetX(), event.GetY())
+    def _draw_chevron(self, gc, which: int, enabled: bool, s) -> None:
+        bar_bg, _, hover_bg, active_fg, inactive_fg, _, _ = s
+        r = self._tab_rect(which)
+        bg = hover_bg if (enabled and self._hover == which) else bar_bg
+        gc.SetBrush(get_brush(bg))
+        gc.SetPen(wx.TRANSPARENT_PEN)
+        gc.DrawRectangle(r.x, r.y, r.width, r.height)
+        cx, cy = r.x + r.width / 2, r.height / 2
+        d = max(3, r.width // 6)
+        sign = -1 if which == _CHEVRON_LEFT else 1
+        gc.SetPen(get_pen(active_fg if enabled else inactive_fg, 2))
+        path = gc.CreatePath()
+        path.MoveToPoint(cx - sign * d / 2, cy - d)
+        path.AddLineToPoint(cx + sign * d / 2, cy)
+        path.AddLineToPoint(cx - sign * d / 2, cy + d)
+        gc.StrokePath(path)
+
+    def _refresh_tab(self, idx: int) -> None:
+        rect = self._tab_rect(idx)
+        if rect is not None:
+            self.RefreshRect(rect)
+
+    def _set_hover(self, idx: int) -> None:
         if idx != self._hover:
-            self._hover = idx
-            self.Refresh()
+            old, self._hover = self._hover, idx
+            self._refresh_tab(old)
+            self._refresh_tab(idx)
+
+    def _on_size(self, event: wx.SizeEvent) -> None:
+        if self._edges is not None:
+            self._clamp_scroll()
+        self.Refresh()
+        event.Skip()
+
+    def _on_motion(self, event: wx.MouseEvent) -> None:
+        self._set_hover(self._index_at(event.GetX(), event.GetY()))
         event.Skip()
 
     def _on_leave(self, event: wx.MouseEvent) -> None:
-        if self._hover != -1:
-            self._hover = -1
-            self.Refresh()
+        self._set_hover(-1)
         event.Skip()
 
+    def _on_wheel(self, event: wx.MouseEvent) -> None:
+        if self._chevron_w() > 0:
+            self._scroll_tabs(-1 if event.GetWheelRotation() > 0 else 1)
+        else:
+            event.Skip()
+
     def _on_click(self, event: wx.MouseEvent) -> None:
         idx = self._index_at(event.GetX(), event.GetY())
-        if idx >= 0 and idx != self._selection:
-            self._selection = idx
-            self.Refresh()
+        if idx in (_CHEVRON_LEFT, _CHEVRON_RIGHT):
+            self._scroll_tabs(-1 if idx == _CHEVRON_LEFT else 1)
+        elif idx >= 0 and idx != self._selection:
+            old, self._selection = self._selection, idx
+            scroll_x = self._scroll_x
+            self._ensure_visible(idx)
+            if scroll_x != self._scroll_x:
+                self.Refresh()
+            else:
+                self._refresh_tab(old)
+                self._refresh_tab(idx)
             if self._on_select is not None:
                 self._on_select(idx)
         event.Skip()
 
 
+class PageLoader:
+    """Builds the pages of a tabbed container from factories on first use.
+
+    window: window whose idle events are used for pre-warming
+    build: called as build(idx, factory) to build page idx
+    unload: called as unload(idx) to destroy page idx
+    prewarm: build pages, one per idle event, before they are selected
+    max_loaded: maximum number of built factory pages; the least recently
+                visited pages beyond this are unloaded.  None for no limit.
+    """
+
+    def __init__(
+        self,
+        window: wx.Window,
+        build: Callable[[int, Callable], None],
+        unload: Callable[[int], None],
+        prewarm: bool = False,
+        max_loaded: Optional[int] = None,
+    ) -> None:
+        self._window = window
+        self._build = build
+        self._unload = unload
+        self._max_loaded = max_loaded
+        self._factories: dict[int, Callable] = {}
+        self._loaded: set[int] = set()
+        self._visits: list[int] = []
+        self._prewarm = False
+        self._idle_bound = False
+        if prewarm:
+            self.SetPrewarm(True)
+
+    def Add(self, idx: int, factory: Callable) -> None:
+        """Register a factory for page idx."""
+        self._factories[idx] = factory
+        if self._prewarm:
+            self._bind_idle(True)
+
+    def IsLoaded(self, idx: int) -> bool:
+        return idx not in self._factories or idx in self._loaded
+
+    def Ensure(self, idx: int) -> None:
+        """Build page idx if it comes from a factory and is not built."""
+        if not self.IsLoaded(idx):
+            self._build(idx, self._factories[idx])
+            self._loaded.add(idx)
+
+    def Visit(self, idx: int) -> None:
+        """Build page idx if needed, and unload pages not visited recently."""
+        self.Ensure(idx)
+        if idx in self._visits:
+            self._visits.remove(idx)
+        self._visits.append(idx)
+        self._trim(keep=idx)
+
+    def SetPrewarm(self, prewarm: bool = True) -> None:
+        self._prewarm = prewarm
+        self._bind_idle(prewarm)
+
+    def _bind_idle(self, bind: bool) -> None:
+        """Bind or unbind the idle handler, keeping at most one binding."""
+        if bind and not self._idle_bound:
+            self._window.Bind(wx.EVT_IDLE, self._on_idle)
+        elif not bind and self._idle_bound:
+            self._window.Unbind(wx.EVT_IDLE, handler=self._on_idle)
+        self._idle_bound = bind
+
+    def SetMaxLoaded(self, max_loaded: Optional[int] = None) -> None:
+        self._max_loaded = max_loaded
+        self._trim()
+
+    def _trim(self, keep: int = -1) -> None:
+        if self._max_loaded is None:
+            return
+        for idx in list(self._visits) + sorted(self._loaded - set(self._visits)):
+            if len(self._loaded) <= self._max_loaded:
+                break
+            if idx in self._loaded and idx != keep:
+                self._unload(idx)
+                self._loaded.discard(idx)
+                if idx in self._visits:
+                    self._visits.remove(idx)
+
+    def _on_idle(self, event: wx.IdleEvent) -> None:
+        event.Skip()
+        pending = [i for i in sorted(self._factories) if i not in self._loaded]
+        room = self._max_loaded is None or len(self._loaded) < self._max_loaded
+        if pending and room:
+            self.Ensure(pending[0])
+            if len(pending) > 1:
+                event.RequestMore()
+        else:
+            self._bind_idle(False)
+
+
 class FlatTabbedPanel(wx.Panel):
-    """Tabbed container. Pages can be added via AddPage().
+    """Tabbed container. Pages can be added via AddPage() or AddPageFactory().
 
     parent: parent wx window
     tab_height: height of the tab bar in pixels (default 30)
     scheme: optional TabScheme; defaults to palette colors at paint time
+    prewarm: build factory pages during idle time, before they are selected
+    max_loaded: maximum number of built factory pages, unloading the least
+                recently visited ones; None (default) for no limit
     """
 
-    def __init__(self, parent: wx.Window, tab_height: int = 30, scheme = None) -> None:
+    def __init__(self, parent: wx.Window, tab_height: int = 30, scheme = None,
+                 prewarm: bool = False, max_loaded: Optional[int] = None) -> None:
         super().__init__(parent, style=wx.BORDER_NONE)
         self._custom_scheme = scheme
         self._tab_bar = _FlatTabBar(self, tab_height, scheme)
@@ -467,8 +721,10 @@ class FlatTabbedPanel(wx.Panel):
         self._content.Bind(wx.EVT_ERASE_BACKGROUND, lambda e: None)
         self._content_sizer = wx.BoxSizer(wx.VERTICAL)
         self._content.SetSizer(self._content_sizer)
-        self._pages: list[tuple[str, wx.Window]] = []
+        self._pages: list[tuple[str, Optional[wx.Window]]] = []
         self._selection: int = -1
+        self._loader = PageLoader(self, self._build_page, self._unload_page,
+                                  prewarm=prewarm, max_loaded=max_loaded)
         sizer = wx.BoxSizer(wx.VERTICAL)
         sizer.Add(self._tab_bar, 0, wx.EXPAND)
         sizer.Add(self._content, 1, wx.EXPAND)
@@ -501,32 +757,53 @@ class FlatTabbedPanel(wx.Panel):
             page.Show(False)
             self._content.Layout()
 
+    def AddPageFactory(self, label: str, factory: Callable[[wx.Window], wx.Window]) -> None:
+        """Add a tab whose page is built by factory(parent) when first selected."""
+        self._pages.append((label, None))
+        self._loader.Add(len(self._pages) - 1, factory)
+        self._tab_bar.SetLabels([lbl for lbl, _ in self._pages])
+        if self._selection == -1:
+            self.SetSelection(0)
+
     def SetSelection(self, idx: int) -> None:
         """Show the page at idx, hide all others."""
         if not (0 <= idx < len(self._pages)) or idx == self._selection:
             return
         self._selection = idx
-        for i, (_, page) in enumerate(self._pages):
-            page.Show(i == idx)
-        self._tab_bar.SetSelection(idx)
-        self._content.Layout()
+        self._content.Freeze()
+        try:
+            self._loader.Visit(idx)
+            for i, (_, page) in enumerate(self._pages):
+                if page is not None:
+                    page.Show(i == idx)
+            self._tab_bar.SetSelection(idx)
+            self._content.Layout()
+        finally:
+            self._content.Thaw()
 
     def GetPage(self, idx: int) -> wx.Window:
+        """Return the page at idx, building it if needed."""
+        self._loader.Ensure(idx)
         return self._pages[idx][1]
 
+    def _build_page(self, idx: int, factory: Callable[[wx.Window], wx.Window]) -> None:
+        label, _ = self._pages[idx]
+        page = factory(self._content)
+        page.Show(idx == self._selection)
+        self._content_sizer.Add(page, 1, wx.EXPAND)
+        self._pages[idx] = (label, page)
+
+    def _unload_page(self, idx: int) -> None:
+        label, page = self._pages[idx]
+        if page is not None:
+            self._content_sizer.Detach(page)
+            page.Destroy()
+        self._pages[idx] = (label, None)
+
     def _on_content_paint(self, _: wx.PaintEvent) -> None:
-        theme = get_theme()
-        s = self._custom_scheme if self._custom_scheme is not None else (
-            theme.background,
-            theme.bright_black,
-            theme.black,
-            theme.foreground,
-            theme.white,
-            theme.blue,
-            theme.bright_black
-        )
+        s = self._tab_bar._scheme()
         dc = wx.AutoBufferedPaintDC(self._content)
-        dc.SetBackground(wx.Brush(s[0]))
+        dc.SetBackground(get_brush(s[0]))
         dc.Clear()
 
     def _on_tab_selected(self, idx: int) -> None:
@@ -6,8 +6,8 @@ from functools import partial
 import wx
 from wx.lib.agw import floatspin as fspin
 from . import myfloatspin as mspin
-from .icons import get_icon
-from .colors import get_color, register_darkdetect
+from .icons import get_icon_bundle
+from .colors import get_color, register_darkdetect, queue_refresh
 
 HAS_NUMPY = False
 try:
@@ -301,7 +301,7 @@ class FloatCtrl(wx.TextCtrl):
                 fgcol, bgcol = self.fgcol_invalid, self.bgcol_invalid
             self.SetForegroundColour(fgcol)
             self.SetBackgroundColour(bgcol)
-            wx.CallAfter(self.Refresh)
+            queue_refresh(self)
         except RuntimeError:
             pass
         except Exception:
@@ -332,7 +332,7 @@ def FloatSpinWithPin(parent, value=0, pin_action=None,
     btnsize = (35, 35) if 'gtk3' in wx.PlatformInfo else (25, 25)
 
     fspin = FloatSpin(parent, value=value, **kws)
-    bmbtn = wx.BitmapButton(parent, id=-1, bitmap=get_icon('pin'),
+    bmbtn = wx.BitmapButton(parent, id=-1, bitmap=get_icon_bundle('pin'),
                             size=btnsize)
     if pin_action is not None:
         parent.Bind(wx.EVT_BUTTON, pin_action, bmbtn)
@@ -4,6 +4,7 @@ import wx
 from wx.lib.embeddedimage import PyEmbeddedImage
 
 from .colors import get_color, is_dark_theme
+from .resources import get_icon_bitmap
 
 
 RAW_ICONS = {
@@ -39,14 +40,176 @@ RAW_ICONS = {
 #   import base64
 #   f = open('my.png', 'rb')
 #   print(base64.b64encode(f.read()))
+#
+# higher resolution versions of an icon can be added with names like
+# 'pin@2x' (or '@1.5x', '@3x', ...), and are used for HiDPI displays.
 
 aliases = dict(ww='leftarrow', ee='rightarrow', nn='uparrow', ss='downarrow')
 for old, new in aliases.items():
     RAW_ICONS[new] = RAW_ICONS[old]
 
-def get_icon(name):
+def _icon_sources(name: str) -> list[tuple[float, str]]:
+    """return sorted (scale, key) of the RAW_ICONS entries for an icon"""
+    sources = [(1.0, name)]
+    prefix = f'{name}@'
+    for key in RAW_ICONS:
+        if key.startswith(prefix) and key.endswith('x'):
+            try:
+                sources.append((float(key[len(prefix):-1]), key))
+            except ValueError:
+                pass
+    return sorted(sources)
+
+
+class _IconBundleImpl(wx.BitmapBundleImpl):
+    """BitmapBundle implementation that makes the bitmap for each
+    scale factor on demand, with make_bitmap(scale)"""
+    def __init__(self, make_bitmap, size: wx.Size) -> None:
+        super().__init__()
+        self._make_bitmap = make_bitmap
+        self._size = size
+
+    def GetDefaultSize(self) -> wx.Size:
+        return self._size
+
+    def GetPreferredBitmapSizeAtScale(self, scale: float) -> wx.Size:
+        return wx.Size(round(self._size.width*scale), round(self._size.height*scale))
+
+    def GetBitmap(self, size: wx.Size) -> wx.Bitmap:
+        return self._make_bitmap(size.width / self._size.width)
+
+
+class IconCache:
+    """Cache of decoded RAW_ICONS bitmaps, keyed by (name, scale, dark mode),
+    and of wx.BitmapBundles for named or vector icons.
+
+    Each PNG is decoded once, and each scaled bitmap is made once.
+    """
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._images: dict[str, wx.Image] = {}
+        self._bitmaps: dict[tuple, wx.Bitmap] = {}
+        self._bundles: dict[tuple, wx.BitmapBundle] = {}
+
+    def image(self, name: str) -> wx.Image:
+        """Return the decoded wx.Image for an icon name"""
+        img = self._images.get(name, None)
+        if img is None:
+            img = self._images[name] = PyEmbeddedImage(RAW_ICONS[name]).GetImage()
+        return img
+
+    def bitmap(self, name: str, scale: float = 1.0) -> wx.Bitmap:
+        """Return a shared wx.Bitmap for an icon name and scale factor"""
+        key = (name, scale, is_dark_theme())
+        bmp = self._bitmaps.get(key, None)
+        if bmp is not None:
+            self.hits += 1
+            return bmp
+        self.misses += 1
+        # use the smallest source at least as large as needed
+        sources = _icon_sources(name)
+        factor, source = sources[-1]
+        for factor, source in sources:
+            if factor >= scale:
+                break
+        img = self.image(source)
+        base = self.image(name)
+        width = max(1, round(base.GetWidth()*scale))
+        height = max(1, round(base.GetHeight()*scale))
+        if (width, height) != (img.GetWidth(), img.GetHeight()):
+            img = img.Scale(width, height, wx.IMAGE_QUALITY_HIGH)
+        bmp = self._bitmaps[key] = wx.Bitmap(img)
+        return bmp
+
+    def bundle(self, icon, size: int | None = None) -> wx.BitmapBundle:
+        """Return a shared wx.BitmapBundle for an icon name or a draw_*
+        function, with bitmaps made for each scale factor when needed"""
+        key = (icon, size)
+        bundle = self._bundles.get(key, None)
+        if bundle is None:
+            bundle = self._bundles[key] = _make_bundle(icon, size, self)
+        return bundle
+
+    def clear(self) -> None:
+        """Drop all cached images and bitmaps"""
+        self._images.clear()
+        self._bitmaps.clear()
+        self._bundles.clear()
+
+    def nbytes(self) -> int:
+        """Return the approximate memory use of the cached pixels"""
+        total = 0
+        for img in self._images.values():
+            total += img.GetWidth() * img.GetHeight() * (4 if img.HasAlpha() else 3)
+        for bmp in self._bitmaps.values():
+            total += bmp.GetWidth() * bmp.GetHeight() * 4
+        return total
+
+    def stats(self) -> dict:
+        """Return cache statistics"""
+        return {'hits': self.hits, 'misses': self.misses,
+                'images': len(self._images), 'bitmaps': len(self._bitmaps),
+                'bundles': len(self._bundles), 'bytes': self.nbytes()}
+
+
+# created on first use, once a wx.App exists
+_ICON_CACHE: IconCache | None = None
+
+def _icon_cache() -> IconCache | None:
+    global _ICON_CACHE
+    if _ICON_CACHE is None and wx.GetApp() is not None:
+        _ICON_CACHE = IconCache()
+    return _ICON_CACHE
+
+def get_icon(name, scale=1.0):
+    """get a wx.Bitmap for a named icon in RAW_ICONS, optionally scaled.
+    Bitmaps are shared: do not draw on the returned bitmap."""
     if name in RAW_ICONS:
-        return wx.Bitmap(PyEmbeddedImage(RAW_ICONS[name]).GetImage())
+        cache = _icon_cache()
+        if cache is None:
+            return wx.Bitmap(PyEmbeddedImage(RAW_ICONS[name]).GetImage())
+        return cache.bitmap(name, scale)
+
+def _make_bundle(icon, size, cache) -> wx.BitmapBundle:
+    if callable(icon):
+        size = 20 if size is None else size
+        def make_bitmap(scale):
+            return get_icon_bitmap(icon, size, True, scale)
+        return wx.BitmapBundle.FromImpl(_IconBundleImpl(make_bitmap, wx.Size(size, size)))
+    base = cache.image(icon)
+    width, height = base.GetWidth(), base.GetHeight()
+    factor = 1.0
+    if size is not None:
+        factor = size / width
+        width, height = size, max(1, round(height*factor))
+    def make_bitmap(scale):
+        return cache.bitmap(icon, scale*factor)
+    return wx.BitmapBundle.FromImpl(_IconBundleImpl(make_bitmap, wx.Size(width, height)))
+
+def get_icon_bundle(icon, size=None):
+    """get a wx.BitmapBundle for an icon, given either as a name in
+    RAW_ICONS or as a vector draw function like draw_cog.
+
+    The bitmap for each display scale factor is made only when needed,
+    from a vector icon or from the closest '@2x'-style RAW_ICONS entry,
+    and cached.  size is the icon width in pixels at scale 1: the default
+    is the PNG size for named icons and 20 for draw functions.
+    """
+    if not callable(icon) and icon not in RAW_ICONS:
+        return None
+    cache = _icon_cache()
+    if cache is None:
+        return _make_bundle(icon, size, IconCache())
+    return cache.bundle(icon, size)
+
+def icon_cache_stats() -> dict:
+    """return hit/miss counts and memory use of the decoded icon cache"""
+    cache = _icon_cache()
+    if cache is None:
+        return {'hits': 0, 'misses': 0, 'images': 0, 'bitmaps': 0,
+                'bundles': 0, 'bytes': 0}
+    return cache.stats()
 
 
 def _icon_fg() -> wx.Colour:
@@ -1,10 +1,12 @@
 import wx
 
-from typing import Callable, Optional
+from bisect import bisect_left, bisect_right
+from typing import Callable, Optional, Sequence
 
 from .base import EnableControl, EnablePanel
-from .colors import register_darkdetect
+from .colors import register_darkdetect, queue_refresh
 from .themes import get_theme
+from .resources import get_brush, get_pen, get_gc_font
 
 
 class FlatCheckBox(EnableControl):
@@ -117,7 +119,7 @@ class FlatCheckBox(EnableControl):
 
     def _on_dark_theme(self, is_dark: bool = True) -> None:
         self._resolve_colors()
-        wx.CallAfter(lambda: self and self.Refresh())
+        queue_refresh(self)
 
     def DoGetBestSize(self) -> wx.Size:
         """Report the natural size to the sizer: left maring + box + gap + label text + right maring."""
@@ -157,7 +159,7 @@ class FlatCheckBox(EnableControl):
         enabled = self.IsEnabled()
 
         # Background — inherit from parent
-        gc.SetBrush(wx.Brush(self.GetParent().GetBackgroundColour()))
+        gc.SetBrush(get_brush(self.GetParent().GetBackgroundColour()))
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRectangle(0, 0, w, h)
 
@@ -175,12 +177,12 @@ class FlatCheckBox(EnableControl):
             box_fill   = self._hover_bg if self._hovered else self._box_bg
             tick_color = None
 
-        gc.SetBrush(wx.Brush(box_fill))
+        gc.SetBrush(get_brush(box_fill))
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRoundedRectangle(bx, by, self._box_size, self._box_size, self._corner_radius)
 
         if self._value and tick_color is not None:
-            gc.SetPen(wx.Pen(tick_color, 2))
+            gc.SetPen(get_pen(tick_color, 2))
             gc.SetBrush(wx.TRANSPARENT_BRUSH)
             # Tick mark expressed as fractions of box dimensions:
             #   start  — left side, vertically centred
@@ -196,7 +198,7 @@ class FlatCheckBox(EnableControl):
 
         font = self._font if self._font is not None else self.GetFont()
         fg = self._disabled_fg if not enabled else self._label_fg
-        gc.SetFont(font, fg)
+        gc.SetFont(get_gc_font(font, fg, gc))
         _, text_h = gc.GetTextExtent(self._label)
         gc.DrawText(self._label, bx + self._box_size + 8, cy - text_h / 2)
 
@@ -266,12 +268,9 @@ class FlatTextCtrl(EnablePanel):
             register_darkdetect(self._on_dark_theme)
 
     def _on_dark_theme(self, is_dark: bool = True) -> None:
-        def _update():
-            if self:
-                self._apply_scheme()
-                self._ctrl.Refresh()
-                self.Refresh()
-        wx.CallAfter(_update)
+        self._apply_scheme()
+        queue_refresh(self._ctrl)
+        queue_refresh(self)
 
     def _resolve_scheme(self):
         if self._text_scheme is not None:
@@ -441,7 +440,7 @@ class FlatTextCtrl(EnablePanel):
         bg, fg, placeholder_fg, dis_bg, dis_fg, error_bg = self._resolve_scheme()
 
         # Parent background
-        gc.SetBrush(wx.Brush(self.GetParent().GetBackgroundColour()))
+        gc.SetBrush(get_brush(self.GetParent().GetBackgroundColour()))
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRectangle(0, 0, w, h)
 
@@ -452,7 +451,7 @@ class FlatTextCtrl(EnablePanel):
             field_bg = error_bg
         else:
             field_bg = bg
-        gc.SetBrush(wx.Brush(field_bg))
+        gc.SetBrush(get_brush(field_bg))
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRoundedRectangle(0, 0, w, h, self._corner_radius)
 
@@ -466,19 +465,78 @@ class FlatTextCtrl(EnablePanel):
 
         if self._value:
             text_fg = dis_fg if not self.IsEnabled() else (fg if not self._limit_error else error_bg)
-            gc.SetFont(font, text_fg)
+            gc.SetFont(get_gc_font(font, text_fg, gc))
             text_w, text_h = gc.GetTextExtent(self._value)
             tx = (w - text_w) / 2 if self._centered else x_pad
             gc.DrawText(self._value, tx, (h - text_h) / 2)
         elif self._placeholder and self.IsEnabled():
-            gc.SetFont(ph_font, placeholder_fg)
+            gc.SetFont(get_gc_font(ph_font, placeholder_fg, gc))
             text_w, text_h = gc.GetTextExtent(self._placeholder)
             tx = (w - text_w) / 2 if self._centered else x_pad
             gc.DrawText(self._placeholder, tx, (h - text_h) / 2)
 
 
+# diagnostic counters for FlatCombo popups, see combo_popup_stats()
+_POPUP_STATS = {'popups': 0, 'motion_events': 0, 'hover_changes': 0,
+                'row_refreshes': 0, 'paints': 0, 'captures': 0}
+
+def combo_popup_stats() -> dict:
+    """return counts of FlatCombo popup events, motion events, hover changes
+    and repaints.  None of these change while an open popup is idle."""
+    return dict(_POPUP_STATS)
+
+
+class _ChoiceIndex:
+    """Type-ahead search index over a list of choices.
+
+    mode: 'prefix' matches choices starting with the query, using a sorted
+          index; 'substring' matches choices containing the query, and
+          re-tests only the previous matches when the query is extended.
+    Matching ignores case, and matches are returned in choice order.
+    """
+
+    def __init__(self, choices: Sequence[str], mode: str = 'substring') -> None:
+        self._lower = [c.lower() for c in choices]
+        self._mode = mode
+        self._keys: Optional[list[str]] = None
+        self._order: Optional[list[int]] = None
+        self._last: tuple[str, Sequence[int]] = ('', range(len(self._lower)))
+
+    def search(self, query: str) -> Sequence[int]:
+        """Return the indices of choices matching query."""
+        query = query.lower()
+        if not query:
+            return range(len(self._lower))
+        last_query, last_result = self._last
+        if last_query == query:
+            return last_result
+        if self._mode == 'prefix':
+            if self._keys is None:
+                self._order = sorted(range(len(self._lower)), key=self._lower.__getitem__)
+                self._keys = [self._lower[i] for i in self._order]
+            lo = bisect_left(self._keys, query)
+            hi = bisect_right(self._keys, query + '\U0010ffff', lo)
+            result = sorted(self._order[lo:hi])
+        else:
+            lower = self._lower
+            if last_query and last_query in query:
+                source = last_result
+            else:
+                source = range(len(lower))
+            result = [i for i in source if query in lower[i]]
+        self._last = (query, result)
+        return result
+
+
 class _FlatComboPopup(wx.PopupTransientWindow):
-    """Dropdown list used by FlatCombo."""
+    """Dropdown list used by FlatCombo.
+
+    Hover follows mouse-motion events.  If no window holds the mouse
+    when the popup opens, the popup captures it, so that motion events
+    reach it on platforms where the popup would not otherwise get them.
+    Only the visible rows are drawn.  With a search index, typed text is
+    shown in a row above the list, and the list shows only the matches.
+    """
 
     def __init__(
         self,
@@ -495,15 +553,22 @@ class _FlatComboPopup(wx.PopupTransientWindow):
         max_visible: int,
         sb_width: int,
         sb_radius: int,
+        text_width: int = 0,
+        search: Optional[_ChoiceIndex] = None,
     ) -> None:
         super().__init__(parent, wx.BORDER_SIMPLE)
-        self._choices = list(choices)
+        self._choices = choices
+        self._indices: Sequence[int] = range(len(choices))
+        self._search = search
+        self._query = ''
         self._selection = selection
         self._hover_index = -1
         self._scroll_offset = 0
         self._visible_rows = min(max_visible, len(self._choices))
         self._needs_sb = len(self._choices) > self._visible_rows
         self._row_height = row_height
+        self._list_top = 2 + (row_height if search is not None else 0)
+        self._text_width = text_width
         self._sb_width = sb_width
         self._sb_radius = sb_radius
         self._on_select = on_select
@@ -525,21 +590,104 @@ class _FlatComboPopup(wx.PopupTransientWindow):
         self.Bind(wx.EVT_LEFT_DOWN, self._on_left_down)
         self.Bind(wx.EVT_LEFT_UP, self._on_left_up)
         self.Bind(wx.EVT_MOUSEWHEEL, self._on_wheel)
-        self._hover_timer = wx.Timer(self)
-        self.Bind(wx.EVT_TIMER, self._on_hover_tick, self._hover_timer)
-        self._hover_timer.Start(16)
+        self.Bind(wx.EVT_MOUSE_CAPTURE_LOST, self._on_capture_lost)
+        self.Bind(wx.EVT_CHAR, self.HandleKey)
+        self._captured = False
+        _POPUP_STATS['popups'] += 1
 
     def popup_below(self, screen_pt: wx.Point, min_width: int) -> None:
-        dc = wx.ClientDC(self)
-        dc.SetFont(self._font if self._font is not None else self.GetFont())
-        text_w = max((dc.GetTextExtent(c)[0] for c in self._choices), default=0)
         extra = self._sb_width + 4 if self._needs_sb else 0
-        width = max(min_width, text_w + 24 + extra)
-        height = self._row_height * self._visible_rows + 4
+        width = max(min_width, self._text_width + 24 + extra)
+        height = self._row_height * self._visible_rows + self._list_top + 2
         self.SetSize(width, height)
         self._scroll_to(self._selection)
         self.SetPosition(screen_pt)
         self.Popup()
+        wx.CallAfter(self._capture_if_free)
+
+    def _capture_if_free(self) -> None:
+        if self and not self._dismissed and wx.Window.GetCapture() is None:
+            self.CaptureMouse()
+            self._captured = True
+            _POPUP_STATS['captures'] += 1
+
+    def _release_capture(self) -> None:
+        if self._captured and self.HasCapture():
+            self.ReleaseMouse()
+        self._captured = False
+
+    def _on_capture_lost(self, event: wx.MouseCaptureLostEvent) -> None:
+        self._captured = False
+        self._sb_dragging = False
+
+    def OnDismiss(self) -> None:
+        self._dismissed = True
+        self._release_capture()
+
+    def _dismiss(self) -> None:
+        """Close the popup: OnDismiss() is not called for explicit Dismiss()."""
+        self._dismissed = True
+        self._release_capture()
+        self.Dismiss()
+
+    def HandleKey(self, event: wx.KeyEvent) -> None:
+        """Type-ahead search and keyboard navigation."""
+        key = event.GetKeyCode()
+        n = len(self._indices)
+        if key == wx.WXK_ESCAPE:
+            self._dismiss()
+        elif key in (wx.WXK_UP, wx.WXK_DOWN) and n > 0:
+            step = -1 if key == wx.WXK_UP else 1
+            idx = max(0, min(self._hover_index + step, n - 1))
+            offset = self._scroll_offset
+            self._scroll_to(idx)
+            if offset != self._scroll_offset:
+                self._hover_index = idx
+                self.Refresh()
+            else:
+                self._set_hover(idx)
+        elif key in (wx.WXK_RETURN, wx.WXK_NUMPAD_ENTER) and n > 0:
+            self._choose(self._hover_index if self._hover_index >= 0 else 0)
+        elif self._search is None:
+            event.Skip()
+        elif key == wx.WXK_BACK:
+            self._set_query(self._query[:-1])
+        elif event.GetUnicodeKey() != wx.WXK_NONE and event.GetUnicodeKey() >= 32:
+            self._set_query(self._query + chr(event.GetUnicodeKey()))
+        else:
+            event.Skip()
+
+    def _set_query(self, query: str) -> None:
+        """Show only the choices matching query."""
+        self._query = query
+        self._indices = self._search.search(query)
+        self._needs_sb = len(self._indices) > self._visible_rows
+        self._scroll_offset = 0
+        self._hover_index = 0 if (query and len(self._indices) > 0) else -1
+        self.Refresh()
+
+    def _choose(self, pos: int) -> None:
+        if 0 <= pos < len(self._indices) and not self._dismissed:
+            self._dismiss()
+            wx.CallAfter(self._on_select, self._indices[pos])
+
+    def _set_hover(self, idx: int) -> None:
+        """Move the hover highlight, repainting only the old and new rows."""
+        if idx == self._hover_index:
+            return
+        old, self._hover_index = self._hover_index, idx
+        _POPUP_STATS['hover_changes'] += 1
+        self._refresh_row(old)
+        self._refresh_row(idx)
+
+    def _refresh_row(self, idx: int) -> None:
+        slot = idx - self._scroll_offset
+        if idx < 0 or not 0 <= slot < self._visible_rows:
+            return
+        w, _ = self.GetClientSize()
+        _POPUP_STATS['row_refreshes'] += 1
+        self.RefreshRect(wx.Rect(0, self._list_top + slot * self._row_height,
+                                 self._list_w(w), self._row_height))
 
     def _list_w(self, total_w: int) -> int:
         """Width of the row list area."""
@@ -547,11 +695,12 @@ class _FlatComboPopup(wx.PopupTransientWindow):
 
     def _sb_thumb_rect(self, total_h: int) -> tuple[int, int, int, int]:
         """x, y, w, h of the scrollbar thumb."""
-        n = len(self._choices)
-        track_h = total_h - 4
+        n = max(1, len(self._indices))
+        top = self._list_top
+        track_h = total_h - top - 2
         thumb_h = max(20, int(self._visible_rows / n * track_h))
         max_offset = n - self._visible_rows
-        thumb_y = 2 + int(self._scroll_offset / max_offset * (track_h - thumb_h)) if max_offset > 0 else 2
+        thumb_y = top + int(self._scroll_offset / max_offset * (track_h - thumb_h)) if max_offset > 0 else top
         return 0, thumb_y, self._sb_width - 2, thumb_h
 
     def _scroll_to(self, idx: int) -> None:
@@ -561,23 +710,23 @@ class _FlatComboPopup(wx.PopupTransientWindow):
             self._scroll_offset = idx
         elif idx >= self._scroll_offset + self._visible_rows:
             self._scroll_offset = idx - self._visible_rows + 1
-        self._scroll_offset = max(0, min(self._scroll_offset, max(0, len(self._choices) - self._visible_rows)))
+        self._scroll_offset = max(0, min(self._scroll_offset, max(0, len(self._indices) - self._visible_rows)))
 
     def _row_at(self, x: int, y: int) -> int:
-        """Return choice index under (x, y), or -1 if on scrollbar or out of range."""
+        """Return list position under (x, y), or -1 if on scrollbar or out of range."""
         w, _ = self.GetClientSize()
-        if self._needs_sb and x >= self._list_w(w):
+        if (self._needs_sb and x >= self._list_w(w)) or y < self._list_top:
             return -1
-        idx = self._scroll_offset + (y - 2) // self._row_height
-        return int(idx) if 0 <= idx < len(self._choices) else -1
+        idx = self._scroll_offset + (y - self._list_top) // self._row_height
+        return int(idx) if 0 <= idx < len(self._indices) else -1
 
     def _on_sb_scroll_to_y(self, y: int) -> None:
         _, h = self.GetClientSize()
-        track_h = h - 4
-        n = len(self._choices)
+        track_h = h - self._list_top - 2
+        n = len(self._indices)
         max_offset = n - self._visible_rows
         _, _, _, thumb_h = self._sb_thumb_rect(h)
-        frac = max(0.0, min((y - 2) / (track_h - thumb_h), 1.0)) if track_h > thumb_h else 0.0
+        frac = max(0.0, min((y - self._list_top) / (track_h - thumb_h), 1.0)) if track_h > thumb_h else 0.0
         self._scroll_offset = round(frac * max_offset)
         self.Refresh()
 
@@ -585,30 +734,43 @@ class _FlatComboPopup(wx.PopupTransientWindow):
         return False
 
     def _on_paint(self, _: wx.PaintEvent) -> None:
+        _POPUP_STATS['paints'] += 1
         dc = wx.AutoBufferedPaintDC(self)
         gc = wx.GraphicsContext.Create(dc)
         w, h = self.GetClientSize()
         list_w = self._list_w(w)
 
         # background
-        gc.SetBrush(wx.Brush(self._popup_bg))
+        gc.SetBrush(get_brush(self._popup_bg))
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRectangle(0, 0, w, h)
 
-        # rows
         font = self._font if self._font is not None else self.GetFont()
+
+        # search row
+        if self._search is not None:
+            text = self._query if self._query else 'type to search'
+            colour = self._fg if self._query else self._popup_hover
+            gc.SetFont(get_gc_font(font, colour, gc))
+            _, text_h = gc.GetTextExtent(text)
+            gc.DrawText(text, 10, 2 + (self._row_height - text_h) / 2)
+            gc.SetPen(get_pen(self._popup_hover, 1))
+            gc.StrokeLine(0, self._list_top - 1, w, self._list_top - 1)
+            gc.SetPen(wx.TRANSPARENT_PEN)
+
+        # rows
         for slot in range(self._visible_rows):
             i = self._scroll_offset + slot
-            if i >= len(self._choices):
+            if i >= len(self._indices):
                 break
-            label = self._choices[i]
-            y = 2 + slot * self._row_height
+            label = self._choices[self._indices[i]]
+            y = self._list_top + slot * self._row_height
             if i == self._hover_index:
-                gc.SetBrush(wx.Brush(self._popup_hover))
+                gc.SetBrush(get_brush(self._popup_hover))
                 gc.SetPen(wx.TRANSPARENT_PEN)
                 gc.DrawRectangle(0, y, list_w, self._row_height)
             colour = self._choice_colours.get(label, self._fg)
-            gc.SetFont(font, colour)
+            gc.SetFont(get_gc_font(font, colour, gc))
             _, text_h = gc.GetTextExtent(label)
             gc.DrawText(label, 10, y + (self._row_height - text_h) / 2)
 
@@ -620,7 +782,7 @@ class _FlatComboPopup(wx.PopupTransientWindow):
                 max(0, self._popup_bg.Green() - 15),
                 max(0, self._popup_bg.Blue() - 15),
             )
-            gc.SetBrush(wx.Brush(track_colour))
+            gc.SetBrush(get_brush(track_colour))
             gc.SetPen(wx.TRANSPARENT_PEN)
             gc.DrawRectangle(sb_x, 0, self._sb_width, h)
             tx, ty, tw, th = self._sb_thumb_rect(h)
@@ -629,61 +791,50 @@ class _FlatComboPopup(wx.PopupTransientWindow):
                 min(255, self._popup_bg.Green() + 60),
                 min(255, self._popup_bg.Blue() + 60),
             )
-            gc.SetBrush(wx.Brush(thumb_colour))
+            gc.SetBrush(get_brush(thumb_colour))
             gc.DrawRoundedRectangle(sb_x + tx, ty, tw, th, self._sb_radius)
 
     def _on_left_down(self, event: wx.MouseEvent) -> None:
+        w, h = self.GetClientSize()
+        x, y = event.GetX(), event.GetY()
+        if self._captured and not (0 <= x < w and 0 <= y < h):
+            # with the mouse captured, clicks outside arrive here
+            self._dismiss()
+            return
         if not self._needs_sb:
             event.Skip()
             return
-        w, h = self.GetClientSize()
-        x, y = event.GetX(), event.GetY()
         if x >= self._list_w(w):
             tx, ty, tw, th = self._sb_thumb_rect(h)
             if ty <= y <= ty + th:
                 self._sb_dragging = True
                 self._sb_drag_start_y = y
                 self._sb_drag_start_offset = self._scroll_offset
-                self.CaptureMouse()
+                if not self.HasCapture():
+                    self.CaptureMouse()
             else:
                 self._on_sb_scroll_to_y(y)
         else:
             event.Skip()
 
-    def _on_hover_tick(self, _: wx.TimerEvent) -> None:
-        """Poll actual mouse position to update hover. Bypasses event routing issues."""
-        screen_pt = wx.GetMousePosition()
-        client_pt = self.ScreenToClient(screen_pt)
-        x, y = client_pt.x, client_pt.y
-        w, h = self.GetClientSize()
-        if 0 <= x <= w and 0 <= y <= h:
-            idx = self._row_at(x, y)
-        else:
-            idx = -1
-        if idx != self._hover_index:
-            self._hover_index = idx
-            self.Refresh()
-
     def _on_left_up(self, event: wx.MouseEvent) -> None:
         if self._sb_dragging:
-            if self.HasCapture():
+            if self.HasCapture() and not self._captured:
                 self.ReleaseMouse()
             self._sb_dragging = False
             return
         x, y = event.GetX(), event.GetY()
-        idx = self._row_at(x, y)
-        if idx >= 0 and not self._dismissed:
-            self._dismissed = True
-            self._hover_timer.Stop()
-            self.Dismiss()
-            wx.CallAfter(self._on_select, idx)
+        w, h = self.GetClientSize()
+        idx = self._row_at(x, y) if (0 <= x < w and 0 <= y < h) else -1
+        if idx >= 0:
+            self._choose(idx)
 
     def _on_motion(self, event: wx.MouseEvent) -> None:
         if self._sb_dragging:
             _, h = self.GetClientSize()
             dy = event.GetY() - self._sb_drag_start_y
-            track_h = h - 4
-            n = len(self._choices)
+            track_h = h - self._list_top - 2
+            n = len(self._indices)
             max_offset = n - self._visible_rows
             _, _, _, thumb_h = self._sb_thumb_rect(h)
             frac = dy / (track_h - thumb_h) if track_h > thumb_h else 0.0
@@ -691,20 +842,18 @@ class _FlatComboPopup(wx.PopupTransientWindow):
             self._scroll_offset = max(0, min(new_offset, max_offset))
             self.Refresh()
             return
-        idx = self._row_at(event.GetX(), event.GetY())
-        if idx != self._hover_index:
-            self._hover_index = idx
-            self.Refresh()
+        _POPUP_STATS['motion_events'] += 1
+        x, y = event.GetX(), event.GetY()
+        w, h = self.GetClientSize()
+        self._set_hover(self._row_at(x, y) if (0 <= x < w and 0 <= y < h) else -1)
         event.Skip()
 
     def _on_leave(self, event: wx.MouseEvent) -> None:
-        if self._hover_index != -1:
-            self._hover_index = -1
-            self.Refresh()
+        self._set_hover(-1)
 
     def _on_wheel(self, event: wx.MouseEvent) -> None:
         delta = -1 if event.GetWheelRotation() > 0 else 1
-        new_offset = max(0, min(self._scroll_offset + delta, max(0, len(self._choices) - self._visible_rows)))
+        new_offset = max(0, min(self._scroll_offset + delta, max(0, len(self._indices) - self._visible_rows)))
         if new_offset != self._scroll_offset:
             self._scroll_offset = new_offset
             self._hover_index = -1
@@ -722,6 +871,8 @@ class FlatCombo(EnablePanel):
     combo_scheme: optional ComboScheme tuple; falls back to default_combo_scheme()
     size: explicit size; defaults to wx.DefaultSize (expands to fill sizer slot)
     corner_radius: corner radius of the field in pixels (default 4)
+    search: None, or 'prefix' or 'substring' for type-ahead filtering of
+            the popup list, for long lists of choices
     """
 
     def __init__(
@@ -738,9 +889,17 @@ class FlatCombo(EnablePanel):
         max_visible: int = 16,
         popup_sb_width: int = 8,
         popup_sb_radius: int = 3,
+        search: Optional[str] = None,
     ) -> None:
         super().__init__(parent, style=wx.BORDER_NONE, size=size)
+        if search not in (None, 'prefix', 'substring'):
+            raise ValueError(f"unknown search mode {search!r}")
         self._choices = list(choices)
+        self._choices_version = 0
+        self._search_mode = search
+        self._search_index: Optional[tuple[int, _ChoiceIndex]] = None
+        self._text_widths: dict[tuple[str, int], int] = {}
+        self._popup: Optional[_FlatComboPopup] = None
         self._selection = selection
         self._choice_colours = choice_colours or {}
         self._font = font
@@ -761,6 +920,7 @@ class FlatCombo(EnablePanel):
         self.Bind(wx.EVT_LEFT_UP, self._on_click)
         self.Bind(wx.EVT_ENTER_WINDOW, self._on_enter)
         self.Bind(wx.EVT_LEAVE_WINDOW, self._on_leave)
+        self.Bind(wx.EVT_CHAR, self._on_char)
 
         if combo_scheme is None:
             register_darkdetect(self._on_dark_theme)
@@ -785,6 +945,9 @@ class FlatCombo(EnablePanel):
     def SetChoices(self, choices: list[str], selection: int = 0) -> None:
         """Replace the choice list and repaint."""
         self._choices = list(choices)
+        self._choices_version += 1
+        self._text_widths.clear()
+        self._search_index = None
         self._selection = max(0, min(selection, len(self._choices) - 1)) if self._choices else 0
         self.InvalidateBestSize()
         self.Refresh()
@@ -803,11 +966,29 @@ class FlatCombo(EnablePanel):
             super().Bind(event, handler, source, id, id2)
 
     def DoGetBestSize(self) -> wx.Size:
-        dc = wx.ClientDC(self)
-        dc.SetFont(self._font if self._font is not None else self.GetFont())
-        max_w = max((dc.GetTextExtent(c)[0] for c in self._choices), default=60)
+        max_w = self._choices_width() if self._choices else 60
         return wx.Size(max_w + 40, 28)
 
+    def _choices_width(self) -> int:
+        """Widest choice text, measured once per font and choice list."""
+        font = self._font if self._font is not None else self.GetFont()
+        key = (font.GetNativeFontInfoDesc(), self._choices_version)
+        width = self._text_widths.get(key, None)
+        if width is None:
+            dc = wx.ClientDC(self)
+            dc.SetFont(font)
+            width = max((dc.GetTextExtent(c)[0] for c in self._choices), default=0)
+            self._text_widths[key] = width
+        return width
+
+    def _get_search_index(self) -> Optional[_ChoiceIndex]:
+        if self._search_mode is None:
+            return None
+        if self._search_index is None or self._search_index[0] != self._choices_version:
+            self._search_index = (self._choices_version,
+                                  _ChoiceIndex(self._choices, self._search_mode))
+        return self._search_index[1]
+
     def _resolve_colors(self) -> None:
         if self._custom_scheme is not None:
             (self._bg, self._hover_bg, self._fg, self._border, self._arrow,
@@ -826,7 +1007,7 @@ class FlatCombo(EnablePanel):
 
     def _on_dark_theme(self, is_dark: bool = True) -> None:
         self._resolve_colors()
-        wx.CallAfter(lambda: self and self.Refresh())
+        queue_refresh(self)
 
     def _on_enter(self, event: wx.MouseEvent) -> None:
         self._hovered = True
@@ -855,10 +1036,23 @@ class FlatCombo(EnablePanel):
             max_visible=self._max_visible,
             sb_width=self._popup_sb_width,
             sb_radius=self._popup_sb_radius,
+            text_width=self._choices_width(),
+            search=self._get_search_index(),
         )
+        self._popup = popup
+        if self._search_mode is not None:
+            self.SetFocus()
         w, h = self.GetSize()
         popup.popup_below(self.ClientToScreen(wx.Point(0, h)), w)
 
+    def _on_char(self, event: wx.KeyEvent) -> None:
+        """Forward keys to an open popup, for type-ahead search."""
+        popup = self._popup
+        if popup and not popup._dismissed:
+            popup.HandleKey(event)
+        else:
+            event.Skip()
+
     def _select(self, idx: int) -> None:
         self._selection = idx
         self.Refresh()
@@ -872,7 +1066,7 @@ class FlatCombo(EnablePanel):
         enabled = self.IsEnabled()
 
         # Parent background
-        gc.SetBrush(wx.Brush(self.GetParent().GetBackgroundColour()))
+        gc.SetBrush(get_brush(self.GetParent().GetBackgroundColour()))
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRectangle(0, 0, w, h)
 
@@ -884,15 +1078,15 @@ class FlatCombo(EnablePanel):
         else:
             field_bg = self._bg
         border_colour = self._disabled_fg if not enabled else self._border
-        gc.SetBrush(wx.Brush(field_bg))
-        gc.SetPen(wx.Pen(border_colour, 1))
+        gc.SetBrush(get_brush(field_bg))
+        gc.SetPen(get_pen(border_colour, 1))
         gc.DrawRoundedRectangle(0, 0, w, h, self._corner_radius)
 
         # Label
         font = self._font if self._font is not None else self.GetFont()
         label = self.GetStringSelection()
         label_colour = self._disabled_fg if not enabled else self._choice_colours.get(label, self._fg)
-        gc.SetFont(font, label_colour)
+        gc.SetFont(get_gc_font(font, label_colour, gc))
         _, text_h = gc.GetTextExtent(label)
         gc.DrawText(label, 8, (h - text_h) / 2)
 
@@ -900,7 +1094,7 @@ class FlatCombo(EnablePanel):
         arrow_colour = self._disabled_fg if not enabled else self._arrow
         arrow_x = w - 16
         arrow_y = h / 2
-        gc.SetPen(wx.Pen(arrow_colour, 1))
+        gc.SetPen(get_pen(arrow_colour, 1))
         gc.SetBrush(wx.TRANSPARENT_BRUSH)
         path = gc.CreatePath()
         path.MoveToPoint(arrow_x - 4, arrow_y - 2)
@@ -1,5 +1,5 @@
 import wx
-from .colors import register_darkdetect, get_color
+from .colors import register_darkdetect, queue_refresh, get_color
 
 class EditableListBox(wx.ListBox):
     """
@@ -69,4 +69,4 @@ class EditableListBox(wx.ListBox):
         self.SetOwnBackgroundColour(bgcolor)
         self.SetForegroundColour(color)
         self.SetOwnForegroundColour(color)
-        wx.CallAfter(self.Refresh)
+        queue_refresh(self)
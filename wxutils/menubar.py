@@ -1,11 +1,27 @@
 import wx
+from bisect import bisect_right
 from typing import Callable, Optional
 
-from .themes import get_theme
+from .themes import get_theme, theme_generation
+from .resources import get_brush, get_pen, get_gc_font
+
+
+def _default_menubar_scheme():
+    """MenuBar colors from the active theme:
+    (bar_bg, btn_hover_bg, btn_active_bg, btn_fg, btn_disabled_fg, sep_colour,
+     popup_bg, popup_hover_bg, popup_fg, popup_secondary_fg, popup_sep)"""
+    theme = get_theme()
+    return (theme.background, theme.bright_black, theme.bright_black, theme.white, theme.white,
+            theme.bright_black, theme.black, theme.bright_black, theme.foreground, theme.white, theme.bright_black)
 
 
 class _FlatMenuDropdown(wx.PopupTransientWindow):
-    """Dropdown for FlatMenuBar. Supports None separator entries."""
+    """Dropdown for FlatMenuBar. Supports None separator entries.
+
+    Row offsets, font metrics and fonts are computed once, when the
+    dropdown is shown or its font changes, so that hit-testing on mouse
+    motion is a bisect over the row offsets.
+    """
 
     def __init__(self, parent: wx.Window, items: list[Optional[str]], shortcuts: list[Optional[str]], on_select: Callable[[int], None], scheme) -> None:
         super().__init__(parent, flags=wx.BORDER_SIMPLE | wx.PU_CONTAINS_CONTROLS)
@@ -14,96 +30,122 @@ class _FlatMenuDropdown(wx.PopupTransientWindow):
         self._on_select = on_select
         self._scheme = scheme
         self._hover_index: int = -1
+        self._layout_font: Optional[str] = None
+        self._row_tops: list[int] = []
+        self._text_h: int = 0
+        self._font: Optional[wx.Font] = None
+        self._small_font: Optional[wx.Font] = None
         self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
         self.Bind(wx.EVT_PAINT, self._on_paint)
         self.Bind(wx.EVT_MOTION, self._on_motion)
         self.Bind(wx.EVT_LEAVE_WINDOW, self._on_leave)
         self.Bind(wx.EVT_LEFT_UP, self._on_left_up)
 
-    def _font_metrics(self) -> tuple[int, int]:
-        """Return (item_h, sep_h) from the current font height."""
-        dc = wx.ClientDC(self)
-        dc.SetFont(self.GetFont())
+    def _font_metrics(self, dc: wx.DC) -> tuple[int, int]:
+        """Return (item_h, sep_h) from the font height."""
         _, fh = dc.GetTextExtent("Ag")
         item_h = fh + max(8, fh // 2)
         sep_h = max(6, fh // 2)
         return item_h, sep_h
 
-    def _row_height(self, i: int, item_h: int, sep_h: int) -> int:
-        return sep_h if self._items[i] is None else item_h
+    def _ensure_layout(self) -> None:
+        """Compute fonts and row offsets, if the font changed."""
+        font = self.GetFont()
+        desc = font.GetNativeFontInfoDesc()
+        if desc == self._layout_font:
+            return
+        dc = wx.ClientDC(self)
+        dc.SetFont(font)
+        item_h, sep_h = self._font_metrics(dc)
+        self._font = font
+        self._small_font = wx.Font(font)
+        self._small_font.SetPointSize(max(7, font.GetPointSize() - 1))
+        self._text_h = dc.GetTextExtent("Ag")[1]
+        self._item_h = item_h
+        tops = [4]
+        for item in self._items:
+            tops.append(tops[-1] + (sep_h if item is None else item_h))
+        self._row_tops = tops
+        self._layout_font = desc
 
     def _index_at(self, py: int) -> int:
-        item_h, sep_h = self._font_metrics()
-        y = 4
-        for i, item in enumerate(self._items):
-            h = self._row_height(i, item_h, sep_h)
-            if item is not None and y <= py < y + h:
-                return i
-            y += h
+        tops = self._row_tops
+        i = bisect_right(tops, py) - 1
+        if 0 <= i < len(self._items) and self._items[i] is not None:
+            return i
         return -1
 
+    def _refresh_item(self, i: int) -> None:
+        if 0 <= i < len(self._items):
+            w, _ = self.GetClientSize()
+            top = self._row_tops[i]
+            self.RefreshRect(wx.Rect(0, top, w, self._row_tops[i + 1] - top))
+
     def PopupBelow(self, screen_pt: wx.Point) -> None:
-        item_h, sep_h = self._font_metrics()
+        self._ensure_layout()
+        item_h = self._item_h
         dc = wx.ClientDC(self)
-        dc.SetFont(self.GetFont())
+        dc.SetFont(self._font)
         items = [i for i in self._items if i is not None]
         shortcuts = [sc for sc in self._shortcuts if sc is not None]
         label_w = max((dc.GetTextExtent(i)[0] for i in items), default=0)
         short_w = max((dc.GetTextExtent(sc)[0] for sc in shortcuts), default=0) if shortcuts else 0
         gap = item_h * 2 if short_w else item_h
         width = max(160, label_w + short_w + gap)
-        height = 8 + sum(
-            self._row_height(i, item_h, sep_h) for i in range(len(self._items))
-        )
+        height = self._row_tops[-1] + 4
         self.SetSize(width, height)
         self.Position(screen_pt, (0, 0))
         self.Popup()
 
     def _on_paint(self, _: wx.PaintEvent) -> None:
+        self._ensure_layout()
         s = self._scheme
-        item_h, sep_h = self._font_metrics()
         dc = wx.AutoBufferedPaintDC(self)
         gc = wx.GraphicsContext.Create(dc)
         w, h = self.GetClientSize()
-        gc.SetBrush(wx.Brush(s[6]))   # popup_bg
+        gc.SetBrush(get_brush(s[6]))   # popup_bg
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRectangle(0, 0, w, h)
-        font = self.GetFont()
-        small_font = wx.Font(font)
-        small_font.SetPointSize(max(7, font.GetPointSize() - 1))
-        y = 4
-        for i, item in enumerate(self._items):
-            rh = self._row_height(i, item_h, sep_h)
+
+        # only the rows inside the update region
+        box = self.GetUpdateRegion().GetBox()
+        tops = self._row_tops
+        first = max(0, bisect_right(tops, box.y) - 1)
+        last = min(len(self._items), bisect_right(tops, box.y + box.height))
+        th = self._text_h
+        for i in range(first, last):
+            item = self._items[i]
+            y = tops[i]
+            rh = tops[i + 1] - y
             if item is None:
                 cy = y + rh / 2
-                gc.SetPen(wx.Pen(s[10], 1))   # popup_sep
+                gc.SetPen(get_pen(s[10], 1))   # popup_sep
                 gc.StrokeLine(8, cy, w - 8, cy)
             else:
                 if i == self._hover_index:
-                    gc.SetBrush(wx.Brush(s[7]))   # popup_hover_bg
+                    gc.SetBrush(get_brush(s[7]))   # popup_hover_bg
                     gc.SetPen(wx.TRANSPARENT_PEN)
                     gc.DrawRectangle(0, y, w, rh)
-                gc.SetFont(gc.CreateFont(font, s[8]))   # popup_fg
-                _, th = gc.GetTextExtent(item)
+                gc.SetFont(get_gc_font(self._font, s[8], gc))   # popup_fg
                 gc.DrawText(item, 12, y + (rh - th) / 2)
                 sc = self._shortcuts[i]
                 if sc:
-                    gc.SetFont(gc.CreateFont(small_font, s[9]))   # popup_secondary_fg
+                    gc.SetFont(get_gc_font(self._small_font, s[9], gc))   # popup_secondary_fg
                     sw, _ = gc.GetTextExtent(sc)
                     gc.DrawText(sc, w - sw - 12, y + (rh - th) / 2)
-            y += rh
 
-    def _on_motion(self, event: wx.MouseEvent) -> None:
-        idx = self._index_at(event.GetY())
+    def _set_hover(self, idx: int) -> None:
         if idx != self._hover_index:
-            self._hover_index = idx
-            self.Refresh()
+            old, self._hover_index = self._hover_index, idx
+            self._refresh_item(old)
+            self._refresh_item(idx)
+
+    def _on_motion(self, event: wx.MouseEvent) -> None:
+        self._set_hover(self._index_at(event.GetY()))
         event.Skip()
 
     def _on_leave(self, event: wx.MouseEvent) -> None:
-        if self._hover_index != -1:
-            self._hover_index = -1
-            self.Refresh()
+        self._set_hover(-1)
         event.Skip()
 
     def _on_left_up(self, event: wx.MouseEvent) -> None:
@@ -125,6 +167,8 @@ class _FlatMenuButton(wx.Control):
         self._hovered = False
         self._active = False
         self._scheme = None
+        self._theme_gen: int = -1
+        self._theme_scheme = None
         self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
         self.Bind(wx.EVT_PAINT, self._on_paint)
         self.Bind(wx.EVT_SIZE, lambda e: (self.Refresh(), e.Skip()))
@@ -156,9 +200,11 @@ class _FlatMenuButton(wx.Control):
         if self._scheme is not None:
             s = self._scheme
         else:
-            theme = get_theme()
-            s = (theme.background, theme.bright_black, theme.bright_black, theme.white, theme.white,
-                 theme.bright_black, theme.black, theme.bright_black, theme.foreground, theme.white, theme.bright_black)
+            gen = theme_generation()
+            if gen != self._theme_gen:
+                self._theme_scheme = _default_menubar_scheme()
+                self._theme_gen = gen
+            s = self._theme_scheme
         dc = wx.AutoBufferedPaintDC(self)
         gc = wx.GraphicsContext.Create(dc)
         w, h = self.GetClientSize()
@@ -168,11 +214,11 @@ class _FlatMenuButton(wx.Control):
             bg = s[1]   # btn_hover_bg
         else:
             bg = s[0]   # bar_bg
-        gc.SetBrush(wx.Brush(bg))
+        gc.SetBrush(get_brush(bg))
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRectangle(0, 0, w, h)
         fg = s[4] if not self.IsEnabled() else s[3]   # btn_disabled_fg : btn_fg
-        gc.SetFont(gc.CreateFont(self.GetFont(), fg))
+        gc.SetFont(get_gc_font(self.GetFont(), fg, gc))
         tw, th = gc.GetTextExtent(self._label)
         gc.DrawText(self._label, (w - tw) / 2, (h - th) / 2)
 
@@ -222,6 +268,8 @@ class FlatMenuBar(wx.Panel):
         super().__init__(parent, size=(-1, height), style=wx.BORDER_NONE)
         self._height = height
         self._custom_scheme = scheme
+        self._theme_gen: int = -1
+        self._theme_scheme = None
         self._menus: list[tuple[_FlatMenuButton, list, list, list]] = []
         self._btn_count: int = 0
         self._sizer = wx.BoxSizer(wx.HORIZONTAL)
@@ -233,9 +281,11 @@ class FlatMenuBar(wx.Panel):
     def _scheme(self):
         if self._custom_scheme is not None:
             return self._custom_scheme
-        theme = get_theme()
-        return (theme.background, theme.bright_black, theme.bright_black, theme.white, theme.white,
-                theme.bright_black, theme.black, theme.bright_black, theme.foreground, theme.white, theme.bright_black)
+        gen = theme_generation()
+        if gen != self._theme_gen:
+            self._theme_scheme = _default_menubar_scheme()
+            self._theme_gen = gen
+        return self._theme_scheme
 
     def _apply_scheme(self) -> None:
         s = self._scheme()
@@ -253,10 +303,10 @@ class FlatMenuBar(wx.Panel):
         dc = wx.AutoBufferedPaintDC(self)
         gc = wx.GraphicsContext.Create(dc)
         w, h = self.GetClientSize()
-        gc.SetBrush(wx.Brush(s[0]))   # bar_bg
+        gc.SetBrush(get_brush(s[0]))   # bar_bg
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRectangle(0, 0, w, h)
-        gc.SetPen(wx.Pen(s[5], 1))   # sep_colour
+        gc.SetPen(get_pen(s[5], 1))   # sep_colour
         gc.StrokeLine(0, h - 1, w, h - 1)
 
     def Enable(self, enable: bool = True) -> bool:
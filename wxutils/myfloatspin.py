@@ -37,8 +37,9 @@ Description
 :class:`FloatSpin` implements a floating point :class:`SpinCtrl`. It is built using a custom
 :class:`wx.Control`, composed by a :class:`TextCtrl` and a :class:`SpinButton`. In order to
 correctly handle floating points numbers without rounding errors or non-exact
-floating point representations, :class:`FloatSpin` uses the great :class:`FixedPoint` class
-from Tim Peters.
+floating point representations, :class:`FloatSpin` uses :class:`decimal.Decimal`
+values rounded to 20 decimal places, as the :class:`FixedPoint` class from
+Tim Peters (still included here) was used before.
 
 What you can do:
 
@@ -178,10 +179,11 @@ or no range::
 
 import wx
 import locale
+from decimal import Decimal, Context, InvalidOperation
 from math import ceil, floor
 
 from wx.lib.embeddedimage import PyEmbeddedImage
-from .colors import get_color, register_darkdetect
+from .colors import get_color, register_darkdetect, queue_refresh
 
 CHEVRON_UP = PyEmbeddedImage(
     b'iVBORw0KGgoAAAANSUhEUgAAAAwAAAAMEAQAAACs7EgvAAAAAmJLR0QA/4ePzL8AAAAJcEhZ'
@@ -570,13 +572,30 @@ class FloatTextCtrl(wx.TextCtrl):
 # This Is The Main Class Implementation
 # ---------------------------------------------------------------------------- #
 
+# values are Decimals rounded to 20 decimal places, and arithmetic on them
+# uses this context, which is precise enough that sums and products of
+# values and increments are exact
+_DECIMAL_CONTEXT = Context(prec=80)
+_QUANTUM = Decimal(1).scaleb(-20)
+
+def _to_decimal(value):
+    """convert a value to a Decimal with 20 decimal places, as was done with
+    FixedPoint(str(value), 20).  Finite Decimals are returned unchanged, and
+    NaN and infinite values raise InvalidOperation, as FixedPoint raised."""
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value)).quantize(_QUANTUM, context=_DECIMAL_CONTEXT)
+    if not value.is_finite():
+        raise InvalidOperation(f"not a finite value: {value}")
+    return value
+
+
 class FloatSpin(wx.Control):
     """
     :class:`FloatSpin` implements a floating point :class:`SpinCtrl`. It is built using a custom
     :class:`wx.Control`, composed by a :class:`TextCtrl` and a :class:`SpinButton`. In order to
     correctly handle floating points numbers without rounding errors or non-exact
-    floating point representations, :class:`FloatSpin` uses the great :class:`FixedPoint` class
-    from Tim Peters.
+    floating point representations, :class:`FloatSpin` uses :class:`decimal.Decimal`
+    values with 20 decimal places.
     """
 
     def __init__(self, parent, id=wx.ID_ANY, pos=wx.DefaultPosition,
@@ -620,10 +639,10 @@ class FloatSpin(wx.Control):
         # Don't call SetRange here, because it will try to modify
         # self._value whose value doesn't exist yet.
         self.SetRangeDontClampValue(min_val, max_val)
-        self._value = self.ClampValue(FixedPoint(str(value), 20))
+        self._value = self.ClampValue(_to_decimal(value))
         self._defaultvalue = self._value
-        self._increment = FixedPoint(str(increment), 20)
-        self._spinmodifier = FixedPoint(str(1.0), 20)
+        self._increment = _to_decimal(increment)
+        self._spinmodifier = 1
         self._digits = digits
         self._snapticks = False
         self._spinbutton = None
@@ -761,7 +780,7 @@ class FloatSpin(wx.Control):
     def onDarkTheme(self, is_dark=None):
         self._spin_up.SetBackgroundColour(get_color('button_bg', dark=is_dark))
         self._spin_dn.SetBackgroundColour(get_color('button_bg', dark=is_dark))
-        wx.CallAfter(self.Refresh)
+        queue_refresh(self)
 
     def OnDestroy(self, event):
         """
@@ -811,7 +830,7 @@ class FloatSpin(wx.Control):
         """ Send the event to the parent. """
         event = wx.CommandEvent(wx.wxEVT_COMMAND_SPINCTRL_UPDATED, self.GetId())
         event.SetEventObject(self)
-        event.SetInt(int(self._value + 0.5))
+        event.SetInt(int(float(self._value) + 0.5))
 
         if self._textctrl:
             event.SetString(self._textctrl.GetValue())
@@ -822,11 +841,30 @@ class FloatSpin(wx.Control):
         if self._textctrl:
             eventOut.SetString(self._textctrl.GetValue())
 
-        eventOut.SetPosition(int(self._value + 0.5))
+        eventOut.SetPosition(int(float(self._value) + 0.5))
         eventOut.SetEventObject(self)
         self.GetEventHandler().ProcessEvent(eventOut)
 
 
+    def _get_modifier(self, event):
+        """ Returns the step multiplier for the modifier keys of an event. """
+
+        modifier = 1
+        if event.ShiftDown():
+            modifier = modifier*2
+        if event.ControlDown():
+            modifier = modifier*10
+        if event.AltDown():
+            modifier = modifier*100
+        return modifier
+
+
+    def _stepped(self, steps):
+        """ Returns the current value plus `steps` increments. """
+
+        return _DECIMAL_CONTEXT.fma(self._increment, steps, self._value)
+
+
     def OnSpinMouseDown(self, event):
         """
         Handles the ``wx.EVT_LEFT_DOWN`` event for :class:`FloatSpin`.
@@ -836,13 +874,7 @@ class FloatSpin(wx.Control):
         :note: This method works on the underlying :class:`SpinButton`.
         """
 
-        modifier = FixedPoint(str(1.0), 20)
-        if event.ShiftDown():
-            modifier = modifier*2.0
-        if event.ControlDown():
-            modifier = modifier*10.0
-        if event.AltDown():
-            modifier = modifier*100.0
+        modifier = self._get_modifier(event)
 
         self._spinmodifier = modifier
 
@@ -858,8 +890,9 @@ class FloatSpin(wx.Control):
         if self._textctrl and self._textctrl.IsModified():
             self.SyncSpinToText(False)
 
-        if self.InRange(self._value + self._increment*self._spinmodifier):
-            self._value = self._value + self._increment*self._spinmodifier
+        value = self._stepped(self._spinmodifier)
+        if self.InRange(value):
+            self._value = value
             self.SetValue(self._value)
             self.DoSendEvent()
 
@@ -873,8 +906,9 @@ class FloatSpin(wx.Control):
         if self._textctrl and self._textctrl.IsModified():
             self.SyncSpinToText(False)
 
-        if self.InRange(self._value - self._increment*self._spinmodifier):
-            self._value = self._value - self._increment*self._spinmodifier
+        value = self._stepped(-self._spinmodifier)
+        if self.InRange(value):
+            self._value = value
             self.SetValue(self._value)
             self.DoSendEvent()
 
@@ -901,13 +935,7 @@ class FloatSpin(wx.Control):
         :note: This method works on the underlying :class:`TextCtrl`.
         """
 
-        modifier = FixedPoint(str(1.0), 20)
-        if event.ShiftDown():
-            modifier = modifier*2.0
-        if event.ControlDown():
-            modifier = modifier*10.0
-        if event.AltDown():
-            modifier = modifier*100.0
+        modifier = self._get_modifier(event)
 
         keycode = event.GetKeyCode()
 
@@ -916,7 +944,7 @@ class FloatSpin(wx.Control):
             if self._textctrl and self._textctrl.IsModified():
                 self.SyncSpinToText(False)
 
-            self.SetValue(self._value + self._increment*modifier)
+            self.SetValue(self._stepped(modifier))
             self.DoSendEvent()
 
         elif keycode == wx.WXK_DOWN:
@@ -924,7 +952,7 @@ class FloatSpin(wx.Control):
             if self._textctrl and self._textctrl.IsModified():
                 self.SyncSpinToText(False)
 
-            self.SetValue(self._value - self._increment*modifier)
+            self.SetValue(self._stepped(-modifier))
             self.DoSendEvent()
 
         elif keycode == wx.WXK_PAGEUP:
@@ -932,7 +960,7 @@ class FloatSpin(wx.Control):
             if self._textctrl and self._textctrl.IsModified():
                 self.SyncSpinToText(False)
 
-            self.SetValue(self._value + 10.0*self._increment*modifier)
+            self.SetValue(self._stepped(10*modifier))
             self.DoSendEvent()
 
         elif keycode == wx.WXK_PAGEDOWN:
@@ -940,7 +968,7 @@ class FloatSpin(wx.Control):
             if self._textctrl and self._textctrl.IsModified():
                 self.SyncSpinToText(False)
 
-            self.SetValue(self._value - 10.0*self._increment*modifier)
+            self.SetValue(self._stepped(-10*modifier))
             self.DoSendEvent()
 
         elif keycode == wx.WXK_SPACE:
@@ -975,24 +1003,18 @@ class FloatSpin(wx.Control):
         :param `event`: a :class:`MouseEvent` event to be processed.
         """
 
-        modifier = FixedPoint(str(1.0), 20)
-        if event.ShiftDown():
-            modifier = modifier*2.0
-        if event.ControlDown():
-            modifier = modifier*10.0
-        if event.AltDown():
-            modifier = modifier*100.0
+        modifier = self._get_modifier(event)
 
         if self._textctrl and self._textctrl.IsModified():
             self.SyncSpinToText(False)
 
         if event.GetWheelRotation() > 0:
-            self.SetValue(self._value + self._increment*modifier)
+            self.SetValue(self._stepped(modifier))
             self.DoSendEvent()
 
         else:
 
-            self.SetValue(self._value - self._increment*modifier)
+            self.SetValue(self._stepped(-modifier))
             self.DoSendEvent()
 
 
@@ -1054,19 +1076,23 @@ class FloatSpin(wx.Control):
 
         :param `value`: the new value.
         """
-        if not self._textctrl or not self.InRange(value):
+        if not self._textctrl:
+            return
+        try:
+            value = _to_decimal(value)
+        except ArithmeticError:
+            return
+        if not self.InRange(value):
             return
 
-        if self._snapticks and self._increment != 0.0:
+        if self._snapticks and self._increment != 0:
 
             finite, snap_value = self.IsFinite(value)
 
-            if not finite: # FIXME What To Do About A Failure?
-
-                if (snap_value - floor(snap_value) < ceil(snap_value) - snap_value):
-                    value = self._defaultvalue + floor(snap_value)*self._increment
-                else:
-                    value = self._defaultvalue + ceil(snap_value)*self._increment
+            if finite:
+                lower, upper = floor(snap_value), ceil(snap_value)
+                ticks = lower if (snap_value - lower < upper - snap_value) else upper
+                value = _DECIMAL_CONTEXT.fma(self._increment, ticks, self._defaultvalue)
 
         decimal = locale.localeconv()["decimal_point"]
         strs = ("%100." + str(self._digits) + self._textformat[1])%value
@@ -1100,11 +1126,11 @@ class FloatSpin(wx.Control):
         """
 
         if (min_val is not None):
-            self._min = FixedPoint(str(min_val), 20)
+            self._min = _to_decimal(min_val)
         else:
             self._min = None
         if (max_val is not None):
-            self._max = FixedPoint(str(max_val), 20)
+            self._max = _to_decimal(max_val)
         else:
             self._max = None
 
@@ -1172,7 +1198,7 @@ class FloatSpin(wx.Control):
         if increment < 1./10.0**self._digits:
             raise Exception("\nERROR: Increment Should Be Greater Or Equal To 1/(10**digits).")
 
-        self._increment = FixedPoint(str(increment), 20)
+        self._increment = _to_decimal(increment)
         self.SetValue(self._value)
 
 
@@ -1192,7 +1218,7 @@ class FloatSpin(wx.Control):
         """
 
         if digits < 0:
-            incr = str(self._increment)
+            incr = format(self._increment, 'f')
             if incr.find(".") < 0:
                 digits = 0
             else:
@@ -1259,7 +1285,7 @@ class FloatSpin(wx.Control):
         """
 
         if self.InRange(defaultvalue):
-            self._defaultvalue = FixedPoint(str(defaultvalue), 20)
+            self._defaultvalue = _to_decimal(defaultvalue)
 
 
     def GetDefaultValue(self):
@@ -1348,7 +1374,7 @@ class FloatSpin(wx.Control):
         if curr:
             try:
                 curro = float(curr)
-                curr = FixedPoint(curr, 20)
+                curr = _to_decimal(curr)
             except:
                 self.SetValue(self._value)
                 return
@@ -1416,7 +1442,7 @@ class FloatSpin(wx.Control):
         """
 
         if (min_val is not None):
-            self._min = FixedPoint(str(min_val), 20)
+            self._min = _to_decimal(min_val)
         else:
             self._min = None
 
@@ -1441,7 +1467,7 @@ class FloatSpin(wx.Control):
         """
 
         if (max_val is not None):
-            self._max = FixedPoint(str(max_val), 20)
+            self._max = _to_decimal(max_val)
         else:
             self._max = None
 
@@ -1484,9 +1510,11 @@ class FloatSpin(wx.Control):
         """
 
         try:
-            snap_value = (value - self._defaultvalue)/self._increment
-            finite = True
-        except:
+            snap_value = _DECIMAL_CONTEXT.divide(
+                _DECIMAL_CONTEXT.subtract(_to_decimal(value), self._defaultvalue),
+                self._increment)
+            finite = snap_value.is_finite()
+        except (ArithmeticError, TypeError, ValueError):
             finite = False
             snap_value = None
 
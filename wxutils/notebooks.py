@@ -1,13 +1,25 @@
 import wx
 
 import wx.lib.agw.flatnotebook as flat_nb
-from .colors import get_color, register_darkdetect
+from .colors import get_color, register_darkdetect, queue_refresh
+from .display import PageLoader
 
 FNB_STYLE = flat_nb.FNB_NO_X_BUTTON|flat_nb.FNB_NODRAG
 
 def flatnotebook(parent, paneldict=None, panelkws={},
                  on_change=None, selection=0, style=None, with_dropdown=False,
-                 with_nav_buttons=False, with_smart_tabs=False, **kws):
+                 with_nav_buttons=False, with_smart_tabs=False,
+                 lazy=False, prewarm=False, max_loaded=None, **kws):
+    """create a FlatNotebook with pages from paneldict {label: creator},
+    where each page is created with creator(parent=..., **panelkws).
+
+    With lazy=True, a page is created the first time its tab is selected,
+    and nb.pagelist holds None for pages not yet created; use nb.get_page(i)
+    to get a page, creating it if needed.  With prewarm=True, pages are
+    created during idle time.  With max_loaded set, the least recently
+    visited pages beyond that number are destroyed, to be created again
+    when selected.
+    """
     if style is None:
         style = FNB_STYLE
     if with_dropdown:
@@ -28,9 +40,9 @@ def flatnotebook(parent, paneldict=None, panelkws={},
         nb.SetActiveTabColour(get_color('nb_active', dark=is_dark))
         nb.SetNonActiveTabTextColour(get_color('nb_text', dark=is_dark))
         nb.SetActiveTabTextColour(get_color('nb_activetext', dark=is_dark))
-        wx.CallAfter(nb.Refresh)
+        queue_refresh(nb)
 
-    register_darkdetect(onDarkTheme)
+    register_darkdetect(onDarkTheme, window=nb)
 
     nb.SetPadding(wx.Size(5, 5))
 
@@ -41,15 +53,53 @@ def flatnotebook(parent, paneldict=None, panelkws={},
     grandparent = parent.GetParent()
     if grandparent is None:
         grandparent = parent
-    if paneldict is not None:
+    loader = None
+    if paneldict is not None and lazy:
+        def build(idx, creator):
+            holder = nb.GetPage(idx)
+            # created with the same parent as for eager pages, then
+            # moved into its placeholder, as AddPage() moves eager pages
+            page = creator(parent=grandparent, **panelkws)
+            page.Reparent(holder)
+            holder.GetSizer().Add(page, 1, wx.EXPAND)
+            holder.Layout()
+            nb.pagelist[idx] = page
+
+        def unload(idx):
+            nb.GetPage(idx).GetSizer().Clear(delete_windows=True)
+            nb.pagelist[idx] = None
+
+        loader = PageLoader(nb, build, unload, prewarm=prewarm,
+                            max_loaded=max_loaded)
+        for name, creator in paneldict.items():
+            holder = wx.Panel(nb)
+            holder.SetSizer(wx.BoxSizer(wx.VERTICAL))
+            nb.AddPage(holder, f" {name} ", True)
+            nb.pagelist.append(None)
+            loader.Add(len(nb.pagelist)-1, creator)
+    elif paneldict is not None:
         for name, creator in paneldict.items():
             _page = creator(parent=grandparent, **panelkws)
             nb.AddPage(_page,f" {name} ", True)
             nb.pagelist.append(_page)
 
+    def get_page(idx):
+        if loader is not None:
+            loader.Ensure(idx)
+        return nb.pagelist[idx]
+    nb.get_page = get_page
+
     if callable(on_change):
         nb.Bind(wx.EVT_NOTEBOOK_PAGE_CHANGED, on_change)
 
+    if loader is not None:
+        # bound after on_change, so that it runs first
+        def on_lazy_change(event):
+            loader.Visit(event.GetSelection())
+            event.Skip()
+        nb.Bind(wx.EVT_NOTEBOOK_PAGE_CHANGED, on_lazy_change)
 
     nb.SetSelection(selection)
+    if loader is not None and nb.GetPageCount() > 0:
+        loader.Visit(nb.GetSelection())
     return nb
@@ -1,16 +1,22 @@
 import wx
+import json
 import time
+import socket
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, lru_cache
 from os import urandom
 from random import randrange
 from base64 import b64encode
-from hashlib import pbkdf2_hmac
+from hashlib import pbkdf2_hmac, scrypt
 
 
 from .buttons import Button
+from .paths import get_configfile, save_configfile
 from .gridpanel import GridPanel
 from .utils import HLine
 from .text import SimpleText, TextCtrl
-from .icons import get_icon
+from .icons import get_icon_bundle
 
 def b64(inp):
     "base64 endcode a bytes array"
@@ -19,7 +25,70 @@ def b64(inp):
 def random_salt(size=37):
     return b64(urandom(2*size))[:size]
 
-def hash_password(password, salt=None, iterations=391939, hash_name='sha512'):
+CALIBRATION_FILE = '.wxutils_pbkdf2.json'
+SCRYPT_PARAMS = (2**14, 8, 1)
+_CALIBRATED = {}
+
+def calibrate_iterations(target_time=0.25, hash_name='sha512', use_cache=True,
+                         recalibrate=False):
+    """return the number of pbkdf2 iterations that takes about target_time
+    seconds on this host.
+
+    The host is benchmarked once: results are kept in memory and, with
+    use_cache=True, in the file CALIBRATION_FILE in the home directory,
+    keyed by host name, hash name and target time.  Use recalibrate=True
+    to benchmark again.
+    """
+    key = f'{socket.gethostname()}:{hash_name}:{target_time:.3f}'
+    if not recalibrate:
+        if key in _CALIBRATED:
+            return _CALIBRATED[key]
+        if use_cache:
+            saved = _read_calibration()
+            if key in saved:
+                _CALIBRATED[key] = int(saved[key])
+                return _CALIBRATED[key]
+
+    niter, elapsed = 4096, 0.0
+    while niter < 2**30:
+        t0 = time.perf_counter()
+        pbkdf2_hmac(hash_name, b'calibrate', b'calibration-salt', niter)
+        elapsed = time.perf_counter() - t0
+        if elapsed > 0.025:
+            break
+        niter *= 4
+    iterations = max(1023, int(round(niter*target_time/max(elapsed, 1.e-6), -3)))
+    _CALIBRATED[key] = iterations
+    if use_cache:
+        saved = _read_calibration()
+        saved[key] = iterations
+        try:
+            save_configfile(CALIBRATION_FILE, json.dumps(saved, indent=1))
+        except OSError:
+            pass
+    return iterations
+
+def _read_calibration():
+    cfile = get_configfile(CALIBRATION_FILE)
+    if cfile is not None:
+        try:
+            with open(cfile, 'r') as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            pass
+    return {}
+
+def _derive(password, salt, hash_name, params):
+    """derive the hash for a password with hash_name and params string"""
+    password, salt = password.encode('ascii'), salt.encode('ascii')
+    if hash_name == 'scrypt':
+        n, r, p = (int(x) for x in params.split(':'))
+        return b64(scrypt(password, salt=salt, n=n, r=r, p=p, dklen=64,
+                          maxmem=128*r*(n+p+2) + 2**20))
+    return b64(pbkdf2_hmac(hash_name, password, salt, int(params)))
+
+def hash_password(password, salt=None, iterations=391939, hash_name='sha512',
+                  target_time=None, scrypt_params=SCRYPT_PARAMS):
     """hash a password to a hashed string that can be saved
 
     and then used to test the password with `test_password()`
@@ -33,16 +102,29 @@ def hash_password(password, salt=None, iterations=391939, hash_name='sha512'):
     function will take at least 60 ms to run, sleeping for if necessary.
     Using default values in 2025, this function should take at least 100
     ms to run.
+
+    With target_time (in seconds), the number of iterations is instead
+    set with `calibrate_iterations()` to take about that long on this host.
+
+    With hash_name='scrypt', the memory-hard `scrypt()` is used with
+    scrypt_params=(n, r, p), default (16384, 8, 1), and iterations and
+    target_time are ignored.  The hash string is 'name&params&salt&hash'
+    for either method.
     """
     end_time = time.perf_counter() + (40 + randrange(35))/1000.0
     if salt is None:
         salt = random_salt()
-    iterations = max(1023, iterations)
-    pwhash = b64(pbkdf2_hmac(hash_name, password.encode('ascii'),
-                             salt.encode('ascii'), iterations))
-    out = '&'.join([hash_name, f'{iterations:d}', salt, pwhash])
-    while time.perf_counter() < end_time:
-        time.sleep(0.003)
+    if hash_name == 'scrypt':
+        params = ':'.join(f'{int(x):d}' for x in scrypt_params)
+    else:
+        if target_time is not None:
+            iterations = calibrate_iterations(target_time, hash_name)
+        params = f'{max(1023, iterations):d}'
+    pwhash = _derive(password, salt, hash_name, params)
+    out = '&'.join([hash_name, params, salt, pwhash])
+    remaining = end_time - time.perf_counter()
+    if remaining > 0:
+        time.sleep(remaining)
     return out
 
 def test_password(password, pwhash):
@@ -50,19 +132,156 @@ def test_password(password, pwhash):
     test_hash, result = '', None
     if pwhash is not None and '&' in pwhash:
         try:
-            hash_name, iterations, salt, result = pwhash.split('&')
-            test_hash = b64(pbkdf2_hmac(hash_name, password.encode('ascii'),
-                                      salt.encode('ascii'), int(iterations)))
+            hash_name, params, salt, result = pwhash.split('&')
+            test_hash = _derive(password, salt, hash_name, params)
         except Exception:
             pass
     return len(test_hash)> 55 and (result == test_hash)
 
 
+# hashlib releases the GIL while hashing, so threads run in parallel
+_EXECUTOR = None
+
+def _executor():
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(max_workers=2,
+                                       thread_name_prefix='wxutils-password')
+    return _EXECUTOR
+
+def _submit(callback, func, *args, **kws):
+    future = _executor().submit(func, *args, **kws)
+    if callback is not None:
+        def deliver(fut):
+            result = None if fut.exception() is not None else fut.result()
+            wx.CallAfter(callback, result)
+        future.add_done_callback(deliver)
+    return future
+
+def hash_password_async(password, callback=None, **kws):
+    """run `hash_password(password, **kws)` in a worker thread.
+
+    Returns a concurrent.futures.Future.  If given, callback(pwhash)
+    will be called in the GUI thread (with wx.CallAfter) when done,
+    with None for pwhash if hashing failed.
+    """
+    return _submit(callback, hash_password, password, **kws)
+
+def test_password_async(password, pwhash, callback=None):
+    """run `test_password(password, pwhash)` in a worker thread.
+
+    Returns a concurrent.futures.Future.  If given, callback(valid)
+    will be called in the GUI thread (with wx.CallAfter) when done.
+    """
+    return _submit(callback, test_password, password, pwhash)
+
+
 __LOWER = 'abcdefghijklmnopqrstuvwxyz'
 __UPPER = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
 __DIGITS = '0123456789'
 __SPECIAL = ';~,`!%$$&^?*#:"/|(){}[]<>\'\\'
 
+# markers for character classes in the PasswordRules translation table:
+# all character classes are ASCII, so UTF-8 encoded passwords can be
+# translated with a 256-byte table, in which other bytes map to 0.
+_LC, _UC, _DI, _SP = 1, 2, 3, 4
+_CLASS_TABLE = bytearray(256)
+for _marker, _chars in ((_LC, __LOWER), (_UC, __UPPER), (_DI, __DIGITS),
+                        (_SP, __SPECIAL)):
+    for _c in _chars:
+        _CLASS_TABLE[ord(_c)] = _marker
+
+PasswordAudit = namedtuple('PasswordAudit', ('valid', 'reason', 'length',
+                                             'lowercase', 'uppercase', 'digits',
+                                             'special', 'invalid', 'failed'))
+
+class PasswordRules:
+    """compiled password rules, for checking many passwords
+
+    Arguments are as for `password_rules()`, except that `invalid` may
+    be any iterable of characters.  Each password is checked with one
+    bytes.translate() pass mapping characters to their class, and one
+    more marking invalid ASCII characters, if there are any.
+    """
+    def __init__(self, minlen=8, lowercase=1, uppercase=1, digits=1, special=1,
+                 invalid=''):
+        invalid = '' if invalid is None else ''.join(invalid)
+        self.minlen = minlen
+        self.minimums = {'lowercase': lowercase, 'uppercase': uppercase,
+                         'digits': digits, 'special': special}
+        self.invalid = invalid
+        self._table = bytes(_CLASS_TABLE)
+        self._invalid_set = frozenset(c for c in invalid if ord(c) > 127)
+        self._invalid_table = None
+        if any(ord(c) < 128 for c in invalid):
+            table = bytearray(256)
+            for c in invalid:
+                if ord(c) < 128:
+                    table[ord(c)] = 1
+            self._invalid_table = bytes(table)
+
+    def _counts(self, pwtest):
+        encoded = pwtest.encode('utf-8', 'surrogatepass')
+        marked = encoded.translate(self._table)
+        inv = 0
+        if self._invalid_table is not None:
+            inv = encoded.translate(self._invalid_table).count(1)
+        if self._invalid_set and not pwtest.isascii():
+            inv += sum(1 for c in pwtest if c in self._invalid_set)
+        return (marked.count(_LC), marked.count(_UC), marked.count(_DI),
+                marked.count(_SP), inv)
+
+    def check(self, pwtest):
+        """return (valid, reason) for a password, as `password_rules()`"""
+        if len(pwtest) < self.minlen:
+            return False, f'must be at least {self.minlen} characters'
+        return self._reason(self._counts(pwtest))
+
+    def _reason(self, counts):
+        lc, uc, di, sp, inv = counts
+        mins = self.minimums
+        if inv > 0:
+            return False, f"cannont contain characters in '{self.invalid}'."
+        if lc < mins['lowercase']:
+            return False, f"must be at least {mins['lowercase']} lower case letters."
+        if uc < mins['uppercase']:
+            return False, f"must be at least {mins['uppercase']} upper case letters."
+        if sp < mins['special']:
+            return False, f"must be at least {mins['special']} special characters."
+        if di < mins['digits']:
+            return False, f"must be at least {mins['digits']} digits."
+        return True, 'password conforms to rules'
+
+    def audit(self, pwtest):
+        """return a PasswordAudit with the character counts of a password,
+        and `failed`, a tuple of the names of all rules that fail"""
+        counts = lc, uc, di, sp, inv = self._counts(pwtest)
+        failed = []
+        if len(pwtest) < self.minlen:
+            failed.append('minlen')
+        if inv > 0:
+            failed.append('invalid')
+        for name, count in (('lowercase', lc), ('uppercase', uc),
+                            ('special', sp), ('digits', di)):
+            if count < self.minimums[name]:
+                failed.append(name)
+        if len(pwtest) < self.minlen:
+            valid, reason = False, f'must be at least {self.minlen} characters'
+        else:
+            valid, reason = self._reason(counts)
+        return PasswordAudit(valid, reason, len(pwtest), lc, uc, di, sp, inv,
+                             tuple(failed))
+
+    def audit_batch(self, passwords):
+        """return a list of PasswordAudit for a sequence of passwords"""
+        return [self.audit(pw) for pw in passwords]
+
+
+@lru_cache(maxsize=32)
+def _compiled_rules(minlen, lowercase, uppercase, digits, special, invalid):
+    return PasswordRules(minlen=minlen, lowercase=lowercase, uppercase=uppercase,
+                         digits=digits, special=special, invalid=invalid)
+
 def password_rules(pwtest, minlen=8, lowercase=1, uppercase=1, digits=1, special=1,
                    invalid=''):
     """check password rules for minimum lenghth, number of lower, upper case letters,
@@ -77,34 +296,20 @@ def password_rules(pwtest, minlen=8, lowercase=1, uppercase=1, digits=1, special
      digiits    int, minimum number of digits [1]
      special    int, minimum number of special characters [1]
      invalid    str, string containing invalid characters  ''
+
+    Returns (valid, reason).  For many passwords, use `PasswordRules`.
     """
-    if len(pwtest) < minlen:
-        return False, f'must be at least {minlen} characters'
-    lc, uc, di, sp = 0, 0, 0, 0
-    if invalid is None:
-       invalid = ''
-
-    for x in pwtest:
-        if x in __LOWER:
-            lc += 1
-        elif x in __UPPER:
-            uc += 1
-        elif x in __DIGITS:
-            di += 1
-        elif x in __SPECIAL:
-            sp += 1
-        if x in invalid:
-            return False, f"cannont contain characters in '{invalid}'."
-
-    if lc < lowercase:
-        return False, f'must be at least {lowercase} lower case letters.'
-    if uc < uppercase:
-        return False, f'must be at least {uppercase} upper case letters.'
-    if sp < special:
-        return False, f'must be at least {special} special characters.'
-    if di < digits:
-        return False, f'must be at least {digits} digits.'
-    return True, 'password conforms to rules'
+    invalid = '' if invalid is None else ''.join(invalid)
+    return _compiled_rules(minlen, lowercase, uppercase, digits, special,
+                           invalid).check(pwtest)
+
+def audit_passwords(passwords, **rules):
+    """check a sequence of passwords against rules (as for `password_rules()`),
+    returning a list of PasswordAudit named tuples with fields
+       valid, reason, length, lowercase, uppercase, digits, special, invalid, failed
+    where `failed` is a tuple of the names of all failing rules.
+    """
+    return PasswordRules(**rules).audit_batch(passwords)
 
 
 class PasswordPanel(wx.Panel):
@@ -120,8 +325,8 @@ class PasswordPanel(wx.Panel):
 
         wx.Panel.__init__(self, parent, id=id, size=(size[0]+25, size[1]))
 
-        self.bmp_hide = get_icon('pw_hide')
-        self.bmp_show = get_icon('pw_show')
+        self.bmp_hide = get_icon_bundle('pw_hide')
+        self.bmp_show = get_icon_bundle('pw_show')
 
         self.font = wx.SystemSettings.GetFont(wx.SYS_DEFAULT_GUI_FONT).Larger()
 
@@ -173,11 +378,22 @@ class PasswordPanel(wx.Panel):
         self.pw_ctrl.SetValue(value)
 
 
+def _set_busy(dlg, busy, msg=''):
+    """show or clear the busy state of a password dialog"""
+    dlg.check_btn.Enable(not busy)
+    dlg.ok_btn.Enable(not busy)
+    dlg.SetCursor(wx.Cursor(wx.CURSOR_ARROWWAIT) if busy else wx.NullCursor)
+    if busy:
+        dlg.msg.SetLabel(msg)
+
+
 class PasswordCheckDialog(wx.Dialog):
     """Check Password"""
     def __init__(self, parent=None, pwhash='_'):
         self.pwhash = pwhash
         self.valid = False
+        self._check_id = 0
+        self._checked = None
         wx.Dialog.__init__(self, parent, wx.ID_ANY, size=(650, 350),
                            title='Check Password')
 
@@ -185,23 +401,42 @@ class PasswordCheckDialog(wx.Dialog):
 
         panel.Add(SimpleText(panel, ' Enter Password:'), dcol=1, newrow=True)
         self.pwtext = PasswordPanel(panel, action=self.onCheck)
-        test = Button(panel, label='Check ', size=(175, -1), action=self.onCheck)
+        self.check_btn = Button(panel, label='Check ', size=(175, -1),
+                                action=self.onCheck)
         panel.Add(self.pwtext, dcol=1, newrow=False)
-        panel.Add(test, dcol=1, newrow=True)
+        panel.Add(self.check_btn, dcol=1, newrow=True)
         self.msg = SimpleText(panel, '', size=(200, -1))
         panel.Add(self.msg, dcol=2, newrow=False)
         panel.Add(HLine(panel, size=(300, -1)), dcol=2, newrow=True)
 
         btnsizer = wx.StdDialogButtonSizer()
-        btnsizer.AddButton(wx.Button(panel, wx.ID_OK))
+        self.ok_btn = wx.Button(panel, wx.ID_OK)
+        btnsizer.AddButton(self.ok_btn)
         btnsizer.AddButton(wx.Button(panel, wx.ID_CANCEL))
         btnsizer.Realize()
 
         panel.Add(btnsizer, dcol=2, newrow=True)
         panel.pack()
 
+    def set_busy(self, busy, msg=''):
+        """show or clear the busy state while a password is checked"""
+        _set_busy(self, busy, msg)
+
     def onCheck(self, event=None):
-        self.valid = test_password(self.pwtext.GetValue(), self.pwhash)
+        """check the password in a worker thread"""
+        password = self.pwtext.GetValue()
+        self._check_id += 1
+        self.set_busy(True, 'checking password...')
+        test_password_async(password, self.pwhash,
+                            callback=partial(self._on_checked, self._check_id,
+                                             password))
+
+    def _on_checked(self, check_id, password, valid):
+        if not self or check_id != self._check_id:
+            return
+        self.set_busy(False)
+        self.valid = valid
+        self._checked = (password, valid)
         if not self.valid:
             self.msg.SetLabel('password incorrect')
         else:
@@ -211,7 +446,12 @@ class PasswordCheckDialog(wx.Dialog):
         self.Raise()
         self.valid = False
         if wx.ID_OK == self.ShowModal():
-            self.onCheck()
+            self._check_id += 1
+            password = self.pwtext.GetValue()
+            if self._checked is not None and self._checked[0] == password:
+                self.valid = self._checked[1]
+            else:
+                self.valid = test_password(password, self.pwhash)
         return self.valid
 
 class PasswordSetDialog(wx.Dialog):
@@ -251,6 +491,9 @@ class PasswordSetDialog(wx.Dialog):
         self.current_hash = current_hash
         self.pwhash = ''
         self.rules = rules
+        self._rules = PasswordRules(**rules)
+        self._check_id = 0
+        self._hashed_inputs = None
 
         wx.Dialog.__init__(self, parent, wx.ID_ANY, size=(650, 350),
                            title=msg)
@@ -267,7 +510,8 @@ class PasswordSetDialog(wx.Dialog):
 
         self.pw1 = PasswordPanel(panel)
         self.pw2 = PasswordPanel(panel)
-        test = Button(panel, label='Check ', size=(175, -1), action=self.onCheck)
+        self.check_btn = Button(panel, label='Check ', size=(175, -1),
+                                action=self.onCheck)
         self.msg = SimpleText(panel, ' ', size=(200, -1))
 
 
@@ -276,20 +520,78 @@ class PasswordSetDialog(wx.Dialog):
         panel.Add(SimpleText(panel, ' Repeat Password:'), dcol=1, newrow=True)
         panel.Add(self.pw2, dcol=1, newrow=False)
 
-        panel.Add(test, dcol=1, newrow=True)
+        panel.Add(self.check_btn, dcol=1, newrow=True)
         panel.Add(self.msg, dcol=2, newrow=False)
 
         panel.Add(HLine(panel, size=(300, -1)), dcol=2, newrow=True)
 
         btnsizer = wx.StdDialogButtonSizer()
-        btnsizer.AddButton(wx.Button(panel, wx.ID_OK))
+        self.ok_btn = wx.Button(panel, wx.ID_OK)
+        btnsizer.AddButton(self.ok_btn)
         btnsizer.AddButton(wx.Button(panel, wx.ID_CANCEL))
         btnsizer.Realize()
 
         panel.Add(btnsizer, dcol=2, newrow=True)
         panel.pack()
 
+    def _inputs(self):
+        curr = self.currpw.GetValue() if len(self.current_hash) > 30 else ''
+        return (curr, self.pw1.GetValue(), self.pw2.GetValue())
+
+    def _check_new(self, pw1, pw2):
+        """check rules and match of new passwords, return valid"""
+        valid, reason = self._rules.check(pw1)
+        if not valid:
+            self.msg.SetLabel(reason)
+            return False
+        if pw1 != pw2:
+            self.msg.SetLabel("Passwords do not match")
+            return False
+        return True
+
+    def set_busy(self, busy, msg=''):
+        """show or clear the busy state while passwords are hashed"""
+        _set_busy(self, busy, msg)
+
     def onCheck(self, event=None):
+        """check and hash passwords in a worker thread"""
+        self.pwhash = ''
+        self._check_id += 1
+        inputs = self._inputs()
+        if len(self.current_hash) > 30:
+            self.set_busy(True, 'checking current password...')
+            test_password_async(inputs[0], self.current_hash,
+                                callback=partial(self._on_current_checked,
+                                                 self._check_id, inputs))
+        else:
+            self._on_current_checked(self._check_id, inputs, True)
+
+    def _on_current_checked(self, check_id, inputs, curr_valid):
+        if not self or check_id != self._check_id:
+            return
+        self.set_busy(False)
+        if not curr_valid:
+            self.msg.SetLabel("Current Password is invalid")
+            return
+        if self._check_new(inputs[1], inputs[2]):
+            self.set_busy(True, 'Passwords match, hashing...')
+            hash_password_async(inputs[1],
+                                callback=partial(self._on_hashed, check_id, inputs))
+
+    def _on_hashed(self, check_id, inputs, pwhash):
+        if not self or check_id != self._check_id:
+            return
+        self.set_busy(False)
+        if pwhash is None:
+            self.pwhash = ''
+            self._hashed_inputs = None
+            self.msg.SetLabel("Password hashing failed")
+            return
+        self.pwhash = pwhash
+        self._hashed_inputs = inputs
+        self.msg.SetLabel("Passwords match")
+
+    def _check_sync(self):
         self.pwhash = ''
         if len(self.current_hash) > 30:
             curr_valid = test_password(self.currpw.GetValue(), self.current_hash)
@@ -299,21 +601,16 @@ class PasswordSetDialog(wx.Dialog):
             self.msg.SetLabel("Current Password is invalid")
             return False
         pw1 = self.pw1.GetValue()
-        valid, reason = password_rules(pw1, **self.rules)
-        if not valid:
-            self.msg.SetLabel(reason)
-            return False
-
-        if pw1 != self.pw2.GetValue():
-            self.msg.SetLabel("Passwords do not match")
-            return False
-        else:
+        if self._check_new(pw1, self.pw2.GetValue()):
             self.msg.SetLabel("Passwords match")
             self.pwhash = hash_password(pw1)
 
     def GetResponse(self, newname=None):
         self.Raise()
         self.pwhash = ''
+        self._hashed_inputs = None
         if wx.ID_OK == self.ShowModal():
-            self.onCheck()
+            self._check_id += 1
+            if self._hashed_inputs != self._inputs() or len(self.pwhash) < 30:
+                self._check_sync()
         return self.pwhash
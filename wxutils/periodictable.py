@@ -2,7 +2,7 @@ import sys
 import wx
 import wx.lib.mixins.inspection
 from wxutils import SetTip
-from .colors import get_color, register_darkdetect
+from .colors import get_color, register_darkdetect, queue_refresh
 
 
 class PeriodicTablePanel(wx.Panel):
@@ -120,7 +120,7 @@ class PeriodicTablePanel(wx.Panel):
         for a in (self.title, self.tsym, self.tznum):
             a.SetBackgroundColour(get_color('pt_frame_bg', dark=is_dark))
 
-        wx.CallAfter(self.Refresh)
+        queue_refresh(self)
 
 
     def onKey(self, event=None, name=None):
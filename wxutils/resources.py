@@ -0,0 +1,156 @@
+"""
+Process-wide cache of wx.Pen, wx.Brush and wx.GraphicsFont objects
+shared by the painters of all Flat* widgets.
+
+Paint handlers run many times per second, and creating GDI objects for
+every draw call dominates their cost.  Objects here are keyed by
+(colour, width, style) and (font, colour, DPI), and the whole cache is
+dropped whenever the theme generation changes.
+
+Vector icons (the draw_* functions) are rasterized once per
+(draw_fn, size, enabled, scale) into transparent bitmaps, which are
+dropped when the 'pt_fg' or 'bg' colors they are drawn with change.
+"""
+import math
+import wx
+
+from .colors import get_color
+from .themes import theme_generation
+
+class ResourceCache:
+    """Cache of pens, brushes and graphics fonts.
+
+    maxsize: maximum number of entries of each kind before that kind
+             is cleared (default 512)
+    """
+    def __init__(self, maxsize: int = 512) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._generation = theme_generation()
+        self._pens = {}
+        self._brushes = {}
+        self._fonts = {}
+        self._icons = {}
+        self._icon_colors = None
+
+    def clear(self) -> None:
+        """Drop all cached objects"""
+        self._pens.clear()
+        self._brushes.clear()
+        self._fonts.clear()
+        self._icons.clear()
+        self.evictions += 1
+
+    def _check_generation(self) -> None:
+        gen = theme_generation()
+        if gen != self._generation:
+            self._generation = gen
+            self.clear()
+
+    def _lookup(self, table: dict, key, create):
+        self._check_generation()
+        obj = table.get(key, None)
+        if obj is None:
+            self.misses += 1
+            if len(table) >= self.maxsize:
+                table.clear()
+                self.evictions += 1
+            obj = table[key] = create()
+        else:
+            self.hits += 1
+        return obj
+
+    def pen(self, colour, width: int = 1, style: int = wx.PENSTYLE_SOLID) -> wx.Pen:
+        """Return a shared wx.Pen"""
+        colour = _as_colour(colour)
+        return self._lookup(self._pens, (colour.GetRGBA(), width, style),
+                            lambda: wx.Pen(colour, width, style))
+
+    def brush(self, colour, style: int = wx.BRUSHSTYLE_SOLID) -> wx.Brush:
+        """Return a shared wx.Brush"""
+        colour = _as_colour(colour)
+        return self._lookup(self._brushes, (colour.GetRGBA(), style),
+                            lambda: wx.Brush(colour, style))
+
+    def font(self, font: wx.Font, colour, gc: wx.GraphicsContext | None = None) -> wx.GraphicsFont:
+        """Return a shared wx.GraphicsFont for drawing on gc, created at the
+        DPI of gc, or with the default renderer if gc is None"""
+        colour = _as_colour(colour)
+        dpi = None if gc is None else tuple(gc.GetDPI())
+        key = (font.GetNativeFontInfoDesc(), colour.GetRGBA(), dpi)
+        def create():
+            if gc is None:
+                renderer = wx.GraphicsRenderer.GetDefaultRenderer()
+                return renderer.CreateFont(font, colour)
+            return gc.GetRenderer().CreateFontAtDPI(font, wx.RealPoint(*dpi), colour)
+        return self._lookup(self._fonts, key, create)
+
+    def icon(self, draw_fn, size: int, enabled: bool = True,
+             scale: float = 1.0) -> wx.Bitmap:
+        """Return a shared, transparent wx.Bitmap of size*scale pixels
+        with the icon drawn by draw_fn(gc, size), faded if not enabled"""
+        colors = (get_color('pt_fg'), get_color('bg'))
+        if colors != self._icon_colors:
+            self._icons.clear()
+            self._icon_colors = colors
+        return self._lookup(self._icons, (draw_fn, size, enabled, scale),
+                            lambda: _rasterize(draw_fn, size, enabled, scale))
+
+    def stats(self) -> dict:
+        """Return cache statistics"""
+        return {'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions,
+                'pens': len(self._pens), 'brushes': len(self._brushes),
+                'fonts': len(self._fonts), 'icons': len(self._icons),
+                'generation': self._generation}
+
+
+def _as_colour(colour) -> wx.Colour:
+    if isinstance(colour, wx.Colour):
+        return colour
+    return wx.Colour(*colour)
+
+
+def _rasterize(draw_fn, size: int, enabled: bool, scale: float) -> wx.Bitmap:
+    npix = max(1, math.ceil(size*scale))
+    bmp = wx.Bitmap.FromRGBA(npix, npix, 0, 0, 0, 0)
+    dc = wx.MemoryDC(bmp)
+    gc = wx.GraphicsContext.Create(dc)
+    gc.SetAntialiasMode(wx.ANTIALIAS_DEFAULT)
+    gc.Scale(scale, scale)
+    if not enabled:
+        gc.BeginLayer(0.35)
+    draw_fn(gc, size)
+    if not enabled:
+        gc.EndLayer()
+    del gc
+    dc.SelectObject(wx.NullBitmap)
+    return bmp
+
+
+RESOURCES = ResourceCache()
+
+def get_pen(colour, width: int = 1, style: int = wx.PENSTYLE_SOLID) -> wx.Pen:
+    """get a cached wx.Pen for (colour, width, style)"""
+    return RESOURCES.pen(colour, width, style)
+
+def get_brush(colour, style: int = wx.BRUSHSTYLE_SOLID) -> wx.Brush:
+    """get a cached wx.Brush for (colour, style)"""
+    return RESOURCES.brush(colour, style)
+
+def get_gc_font(font: wx.Font, colour, gc: wx.GraphicsContext | None = None) -> wx.GraphicsFont:
+    """get a cached wx.GraphicsFont for (font, colour), for use with
+    gc.SetFont().  Pass gc so that the font is created at its DPI."""
+    return RESOURCES.font(font, colour, gc)
+
+def get_icon_bitmap(draw_fn, size: int, enabled: bool = True,
+                    scale: float = 1.0) -> wx.Bitmap:
+    """get a cached bitmap of a vector icon drawn by draw_fn(gc, size),
+    such as draw_cog, rendered at size*scale pixels"""
+    return RESOURCES.icon(draw_fn, size, enabled, scale)
+
+def resource_cache_stats() -> dict:
+    """return hit/miss/size statistics of the shared resource cache"""
+    return RESOURCES.stats()
@@ -2,8 +2,9 @@ import wx
 from typing import Callable, Optional
 
 from .base import EnablePanel
-from .colors import register_darkdetect
+from .colors import register_darkdetect, queue_refresh
 from .themes import get_theme
+from .resources import get_brush
 
 
 class _ScrollBarBase(EnablePanel):
@@ -71,20 +72,20 @@ class _ScrollBarBase(EnablePanel):
 
     def _on_dark_theme(self, is_dark: bool = True) -> None:
         self._resolve_colors()
-        wx.CallAfter(self.Refresh)
+        queue_refresh(self)
 
     def _on_paint(self, _: wx.PaintEvent) -> None:
         dc = wx.AutoBufferedPaintDC(self)
         gc = wx.GraphicsContext.Create(dc)
         w, h = self.GetClientSize()
-        gc.SetBrush(wx.Brush(self._track_colour))
+        gc.SetBrush(get_brush(self._track_colour))
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRectangle(0, 0, w, h)
         if not self.visible:
             return
         x, y, tw, th = self._thumb_rect()
         colour = self._thumb_hover_colour if (self._hovered or self._dragging) else self._thumb_colour
-        gc.SetBrush(wx.Brush(colour))
+        gc.SetBrush(get_brush(colour))
         gc.DrawRoundedRectangle(x, y, tw, th, self._corner_radius)
 
     def _on_mouse_down(self, event: wx.MouseEvent) -> None:
@@ -1,7 +1,7 @@
 import wx
 from typing import Optional
 
-from .colors import register_darkdetect
+from .colors import register_darkdetect, queue_refresh
 from .themes import get_theme
 
 
@@ -50,7 +50,7 @@ class FlatSplitter(wx.SplitterWindow):
     def _on_dark_theme(self, is_dark: bool = True) -> None:
         self._resolve_colors()
         self._overlay.SetBackgroundColour(self._sash)
-        wx.CallAfter(self._overlay.Refresh)
+        queue_refresh(self._overlay)
 
     def _reposition_overlay(self, event: wx.Event | None = None) -> None:
         if event is not None:
@@ -1,11 +1,108 @@
+import time
 import wx
-from typing import Optional
+from bisect import bisect_right
+from itertools import accumulate, compress
+from numbers import Number, Real
+from typing import Callable, Optional, Sequence
 
-from .colors import get_color
-from .themes import get_theme
+from .colors import get_color, register_darkdetect, queue_refresh
+from .themes import get_theme, theme_generation
+from .resources import get_brush, get_pen, get_gc_font
 from .scrollbars import FlatScrollBar
 
 
+def _default_table_scheme():
+    """Table colors from the active theme: (header_bg, border, label_fg)"""
+    theme = get_theme()
+    return (theme.bright_black, theme.bright_black, theme.foreground)
+
+
+def _proportional_widths(proportions: list[int], total: int) -> list[int]:
+    """Split `total` px into column widths with the given proportions"""
+    total_parts = sum(proportions)
+    if total_parts == 0:
+        return [0] * len(proportions)
+    widths = [total * p // total_parts for p in proportions]
+    widths[-1] += total - sum(widths)
+    return widths
+
+
+_FONT_HEIGHTS: dict[str, int] = {}
+
+def _font_height(font: wx.Font) -> int:
+    """Height of "Ag" in a font, measured once per font"""
+    key = font.GetNativeFontInfoDesc()
+    height = _FONT_HEIGHTS.get(key, None)
+    if height is None:
+        dc = wx.ScreenDC()
+        dc.SetFont(font)
+        _, height = dc.GetTextExtent("Ag")
+        _FONT_HEIGHTS[key] = height
+    return height
+
+
+class TableLayout:
+    """Column geometry and text extents shared by the header and rows of a table.
+
+    proportions: relative integer widths per column (e.g. [6, 3, 1])
+    maxsize: maximum number of cached entries of each kind (default 256)
+
+    Column widths are cached per client width and text extents per
+    (font, text), so that painting many rows does not recompute them.
+    """
+
+    def __init__(self, proportions: list[int], maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self.SetProportions(proportions)
+
+    def SetProportions(self, proportions: list[int]) -> None:
+        self.proportions = list(proportions)
+        self._widths: dict[int, list[int]] = {}
+        self._edges: dict[int, list[int]] = {}
+        self._extents: dict[tuple[str, str], tuple[float, float]] = {}
+
+    def col_widths(self, total: int) -> list[int]:
+        """Return the column widths for a client width."""
+        widths = self._widths.get(total, None)
+        if widths is None:
+            if len(self._widths) >= self.maxsize:
+                self._widths.clear()
+            widths = self._widths[total] = _proportional_widths(self.proportions, total)
+        return widths
+
+    def col_edges(self, total: int) -> list[int]:
+        """Return the right edge of each column for a client width."""
+        edges = self._edges.get(total, None)
+        if edges is None:
+            if len(self._edges) >= self.maxsize:
+                self._edges.clear()
+            edges = self._edges[total] = list(accumulate(self.col_widths(total)))
+        return edges
+
+    def column_at(self, x: int, total: int) -> int:
+        """Return the column at x for a client width, or -1."""
+        if x < 0:
+            return -1
+        edges = self.col_edges(total)
+        col = bisect_right(edges, x)
+        return col if col < len(edges) else -1
+
+    def row_height(self, font: wx.Font, extra: int = 10, minimum: int = 28) -> int:
+        """Return a row height for a font: the font height plus `extra` px."""
+        return max(minimum, _font_height(font) + extra)
+
+    def text_extent(self, gc: wx.GraphicsContext, font: wx.Font, text: str) -> tuple[float, float]:
+        """Return the extent of text in a font, measuring it with gc, in which
+        that font must be selected, only the first time."""
+        key = (font.GetNativeFontInfoDesc(), text)
+        extent = self._extents.get(key, None)
+        if extent is None:
+            if len(self._extents) >= self.maxsize:
+                self._extents.clear()
+            extent = self._extents[key] = gc.GetTextExtent(text)
+        return extent
+
+
 class FlatTableHeader(wx.Panel):
     """Painted column header bar. Labels are centered in each column. Column dividers run full height.
 
@@ -14,6 +111,9 @@ class FlatTableHeader(wx.Panel):
     proportions: relative integer widths per column (e.g. [6, 3, 1])
     height: row height in px; None derives from font
     scheme: TableScheme; None uses palette default at paint time
+    on_sort: called as on_sort(col, ascending) when a label is clicked;
+             None for a header without sorting
+    layout: TableLayout shared with the rows of the table; None creates one
     """
 
     def __init__(
@@ -23,36 +123,68 @@ class FlatTableHeader(wx.Panel):
         proportions: list[int],
         height: Optional[int] = None,
         scheme = None,
+        on_sort: Optional[Callable[[int, bool], None]] = None,
+        layout: Optional[TableLayout] = None,
     ) -> None:
         h = height if height is not None else self._default_height(parent)
         super().__init__(parent, size=(-1, h), style=wx.BORDER_NONE)
         self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
         self._labels = labels
         self._proportions = proportions
+        self._layout = layout if layout is not None else TableLayout(proportions)
         self._custom_scheme = scheme
+        self._theme_gen: int = -1
+        self._theme_scheme = None
+        self._on_sort = on_sort
+        self._sort_col: int = -1
+        self._sort_ascending = True
+        self._filtered: set[int] = set()
         self.Bind(wx.EVT_PAINT, self._on_paint)
         self.Bind(wx.EVT_SIZE, lambda _e: self.Refresh())
+        if on_sort is not None:
+            self.Bind(wx.EVT_LEFT_DOWN, self._on_left_down)
+
+    def SetSortIndicator(self, col: int, ascending: bool = True) -> None:
+        """Show a sort arrow on column `col` (-1 for none) and repaint."""
+        self._sort_col = col
+        self._sort_ascending = ascending
+        self.Refresh()
+
+    def SetFilterIndicator(self, col: int, filtered: bool = True) -> None:
+        """Mark column `col` as filtered (or not) and repaint."""
+        if filtered:
+            self._filtered.add(col)
+        else:
+            self._filtered.discard(col)
+        self.Refresh()
+
+    def ColumnAt(self, x: int) -> int:
+        """Return the column at x, or -1."""
+        return self._layout.column_at(x, self.GetClientSize().width)
+
+    def _on_left_down(self, event: wx.MouseEvent) -> None:
+        col = self.ColumnAt(event.GetX())
+        if col >= 0:
+            ascending = not self._sort_ascending if col == self._sort_col else True
+            self.SetSortIndicator(col, ascending)
+            self._on_sort(col, ascending)
+        event.Skip()
 
     @staticmethod
     def _default_height(parent: wx.Window) -> int:
-        dc = wx.ScreenDC()
-        dc.SetFont(parent.GetFont())
-        _, fh = dc.GetTextExtent("Ag")
-        return max(28, fh + 14)
+        return max(28, _font_height(parent.GetFont()) + 14)
 
     def _scheme(self):
         if self._custom_scheme is not None:
             return self._custom_scheme
-        theme = get_theme()
-        return (theme.bright_black, theme.bright_black, theme.foreground)
+        gen = theme_generation()
+        if gen != self._theme_gen:
+            self._theme_scheme = _default_table_scheme()
+            self._theme_gen = gen
+        return self._theme_scheme
 
     def _col_widths(self, total: int) -> list[int]:
-        total_parts = sum(self._proportions)
-        if total_parts == 0:
-            return [0] * len(self._proportions)
-        widths = [total * p // total_parts for p in self._proportions]
-        widths[-1] += total - sum(widths)
-        return widths
+        return self._layout.col_widths(total)
 
     def _on_paint(self, _: wx.PaintEvent) -> None:
         dc = wx.AutoBufferedPaintDC(self)
@@ -61,26 +193,54 @@ class FlatTableHeader(wx.Panel):
         s = self._scheme()
         header_bg, border_color, label_color = s[0], s[1], s[2]
 
-        gc.SetBrush(wx.Brush(header_bg))
+        gc.SetBrush(get_brush(header_bg))
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRectangle(0, 0, w, h)
 
         font = self.GetFont().Bold()
-        gc.SetFont(gc.CreateFont(font, label_color))
-        gc.SetPen(wx.Pen(border_color, 1))
+        gc.SetFont(get_gc_font(font, label_color, gc))
+        gc.SetPen(get_pen(border_color, 1))
 
         widths = self._col_widths(w)
         x = 0
         for i, (label, cw) in enumerate(zip(self._labels, widths)):
             if label:
-                tw, th = gc.GetTextExtent(label)
+                tw, th = self._layout.text_extent(gc, font, label)
                 gc.DrawText(label, x + (cw - tw) / 2, (h - th) / 2)
+            if i == self._sort_col or i in self._filtered:
+                self._draw_marks(gc, i, x, cw, h, label_color)
             if i < len(widths) - 1:
                 gc.StrokeLine(x + cw, 0, x + cw, h)
             x += cw
 
         gc.StrokeLine(0, h - 1, w, h - 1)
 
+    def _draw_marks(self, gc, col: int, x: int, cw: int, h: int, colour) -> None:
+        """Draw the sort arrow and filter dot at the right of a column."""
+        size = max(6, h // 5)
+        xr = x + cw - size - 6
+        yc = h / 2
+        gc.SetBrush(get_brush(colour))
+        if col == self._sort_col:
+            path = gc.CreatePath()
+            half = size / 2
+            if self._sort_ascending:
+                path.MoveToPoint(xr, yc + half / 2)
+                path.AddLineToPoint(xr + size, yc + half / 2)
+                path.AddLineToPoint(xr + half, yc - half / 2)
+            else:
+                path.MoveToPoint(xr, yc - half / 2)
+                path.AddLineToPoint(xr + size, yc - half / 2)
+                path.AddLineToPoint(xr + half, yc + half / 2)
+            path.CloseSubpath()
+            gc.FillPath(path)
+            xr -= size + 4
+        if col in self._filtered:
+            path = gc.CreatePath()
+            path.AddEllipse(xr + 1, yc - size / 2 + 1, size - 2, size - 2)
+            gc.SetBrush(get_brush(get_theme().blue))
+            gc.FillPath(path)
+
 
 class FlatTableRow(wx.Panel):
     """Base for a table row with absolute-positioned controls.
@@ -89,6 +249,7 @@ class FlatTableRow(wx.Panel):
     proportions: relative column widths matching the header
     height: row height in px; None derives from font
     scheme: TableScheme for border color; None uses palette default at paint time
+    layout: TableLayout shared with the header and other rows; None creates one
     """
 
     def __init__(
@@ -97,6 +258,7 @@ class FlatTableRow(wx.Panel):
         proportions: list[int],
         height: Optional[int] = None,
         scheme = None,
+        layout: Optional[TableLayout] = None,
     ) -> None:
         h = height if height is not None else self._default_height(parent)
         super().__init__(parent, size=(-1, h), style=wx.BORDER_NONE)
@@ -105,7 +267,10 @@ class FlatTableRow(wx.Panel):
         self.SetBackgroundColour(self._row_bg())
         self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
         self._proportions = proportions
+        self._layout = layout if layout is not None else TableLayout(proportions)
         self._custom_scheme = scheme
+        self._theme_gen: int = -1
+        self._theme_scheme = None
         self.Bind(wx.EVT_PAINT, self._on_paint)
         self.Bind(wx.EVT_SIZE, self._on_size)
 
@@ -121,24 +286,19 @@ class FlatTableRow(wx.Panel):
 
     @staticmethod
     def _default_height(parent: wx.Window) -> int:
-        dc = wx.ScreenDC()
-        dc.SetFont(parent.GetFont())
-        _, fh = dc.GetTextExtent("Ag")
-        return max(28, fh + 10)
+        return max(28, _font_height(parent.GetFont()) + 10)
 
     def _scheme(self):
         if self._custom_scheme is not None:
             return self._custom_scheme
-        theme = get_theme()
-        return (theme.bright_black, theme.bright_black, theme.foreground)
+        gen = theme_generation()
+        if gen != self._theme_gen:
+            self._theme_scheme = _default_table_scheme()
+            self._theme_gen = gen
+        return self._theme_scheme
 
     def _col_widths(self, total: int) -> list[int]:
-        total_parts = sum(self._proportions)
-        if total_parts == 0:
-            return [0] * len(self._proportions)
-        widths = [total * p // total_parts for p in self._proportions]
-        widths[-1] += total - sum(widths)
-        return widths
+        return self._layout.col_widths(total)
 
     def _reposition(self) -> None:
         """Override in subclasses to position child controls."""
@@ -150,7 +310,7 @@ class FlatTableRow(wx.Panel):
         border_color = self._scheme()[1]
         bg = self._row_bg()
 
-        gc.SetBrush(wx.Brush(bg))
+        gc.SetBrush(get_brush(bg))
         gc.SetPen(wx.TRANSPARENT_PEN)
         gc.DrawRectangle(0, 0, w, h)
 
@@ -160,7 +320,7 @@ class FlatTableRow(wx.Panel):
                 child.SetBackgroundColour(bg)
                 child.Refresh()
 
-        gc.SetPen(wx.Pen(border_color, 1))
+        gc.SetPen(get_pen(border_color, 1))
         gc.StrokeLine(0, h - 1, w, h - 1)
         widths = self._col_widths(w)
         x = 0
@@ -178,6 +338,24 @@ class FlatTableRow(wx.Panel):
         ctrl.SetSize(x + self._pad, self._pad, col_width - self._pad * 2, self._row_height - self._pad * 2)
 
 
+SCROLL_FRAME_MS = 16      # frame timer interval for smooth scrolling
+ANIMATION_EASING = 0.3    # fraction of the remaining distance moved per frame
+KINETIC_FRICTION = 0.88   # fraction of the velocity kept per frame
+
+
+class _UpdateBlock:
+    """Context manager returned by FlatScrolledPanel.BeginUpdate()."""
+
+    def __init__(self, panel: 'FlatScrolledPanel') -> None:
+        self._panel = panel
+
+    def __enter__(self) -> 'FlatScrolledPanel':
+        return self._panel
+
+    def __exit__(self, *exc) -> None:
+        self._panel.EndUpdate()
+
+
 class FlatScrolledPanel(wx.Panel):
     """Viewport + FlatScrollBar container for vertically stacked children.
 
@@ -186,6 +364,14 @@ class FlatScrolledPanel(wx.Panel):
     bg: background color; None uses the palette 'bg' color
     scrollbar_scheme: ScrollBarScheme; None uses the palette default
     header: optional header window to pin above the viewport
+    smooth: None to jump on each wheel click, 'animated' to ease to the new
+            position, or 'kinetic' to coast to a stop after wheel motion
+
+    Rows are either added as windows with AddRow(), or, for large tables,
+    created on demand in virtual mode with SetVirtualRows().  With rows
+    added as windows, scrolling moves the panel holding all of them; use
+    virtual mode for long lists, or FlatDataTable for read-only data,
+    which scrolls by blitting its painted rows.
     """
 
     def __init__(
@@ -195,11 +381,41 @@ class FlatScrolledPanel(wx.Panel):
         bg: Optional[wx.Colour] = None,
         scrollbar_scheme = None,
         header: Optional[wx.Window] = None,
+        smooth: Optional[str] = None,
     ) -> None:
         super().__init__(parent, style=wx.BORDER_NONE)
         self._scroll_step = scroll_step
         self._custom_bg = bg
         self._offset: int = 0
+        self._content_h: Optional[int] = None
+        self._content_geom: Optional[tuple[int, int]] = None
+
+        # smooth scrolling, driven by a single frame timer
+        if smooth not in (None, 'animated', 'kinetic'):
+            raise ValueError(f"unknown smooth scrolling mode {smooth!r}")
+        self._smooth = smooth
+        self._scroll_pos: float = 0.0
+        self._target: float = 0.0
+        self._velocity: float = 0.0
+        self._last_frame: Optional[float] = None
+        self._frame_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self._on_frame, self._frame_timer)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self._on_destroy)
+        self._scroll_stats = {'frames': 0, 'intervals': 0, 'seconds': 0.0,
+                              'max_frame_ms': 0.0, 'moves': 0}
+
+        self._applied_offset: int = -1
+        self._update_depth: int = 0
+        self._layout_pending = False
+
+        # virtual mode: _virtual_count is None when rows are real children
+        self._virtual_count: Optional[int] = None
+        self._virtual_factory = None
+        self._virtual_binder = None
+        self._virtual_row_height: int = 0
+        self._virtual_overscan: int = 2
+        self._virtual_rows: dict[int, wx.Window] = {}
+        self._virtual_spare: list[wx.Window] = []
 
         self._apply_bg()
 
@@ -241,28 +457,228 @@ class FlatScrolledPanel(wx.Panel):
         target.SetBackgroundColour(self._resolve_bg())
 
     def AddRow(self, row: wx.Window) -> None:
-        if isinstance(row, FlatTableRow):
-            row._apply_row_bg()
-        self.rows_sizer.Add(row, 0, wx.EXPAND)
-        self._content.Layout()
+        self.AddRows((row,))
+
+    def AddRows(self, rows) -> None:
+        """Add rows from an iterable, with a single layout pass."""
+        if self.IsVirtual():
+            raise ValueError("cannot add rows in virtual mode: call ClearVirtualRows() first")
+        with self.BeginUpdate():
+            for row in rows:
+                if isinstance(row, FlatTableRow):
+                    row._apply_row_bg()
+                row.Show()
+                self.rows_sizer.Add(row, 0, wx.EXPAND)
+            self._relayout()
+
+    def RemoveRow(self, row: wx.Window, destroy: bool = False) -> None:
+        self.RemoveRows((row,), destroy=destroy)
+
+    def RemoveRows(self, rows, destroy: bool = False) -> None:
+        """Remove rows, with a single layout pass.
+
+        destroy: destroy the removed rows, instead of only hiding them
+        """
+        with self.BeginUpdate():
+            for row in rows:
+                if self.rows_sizer.Detach(row):
+                    self._release_row(row, destroy)
+            self._relayout()
+
+    def ReplaceRows(self, rows, destroy: bool = False) -> None:
+        """Replace all rows with rows from an iterable, with a single layout pass.
+
+        destroy: destroy the old rows, instead of only hiding them
+        """
+        with self.BeginUpdate():
+            self.ClearRows(destroy=destroy)
+            self.AddRows(rows)
+
+    def ClearRows(self, destroy: bool = False) -> None:
+        """Remove all rows.
+
+        destroy: destroy the removed rows, instead of only hiding them
+        """
+        with self.BeginUpdate():
+            rows = [item.GetWindow() for item in self.rows_sizer.GetChildren()]
+            self.rows_sizer.Clear(delete_windows=False)
+            for row in rows:
+                if row is not None:
+                    self._release_row(row, destroy)
+            self._relayout()
+
+    def BeginUpdate(self) -> '_UpdateBlock':
+        """Freeze the panel and defer layout until the matching EndUpdate().
+
+        Calls may be nested.  The return value can be used as a context
+        manager that calls EndUpdate() on exit:
+
+            with panel.BeginUpdate():
+                panel.AddRows(rows)
+        """
+        if self._update_depth == 0:
+            self.Freeze()
+        self._update_depth += 1
+        return _UpdateBlock(self)
+
+    def EndUpdate(self) -> None:
+        """End an update started with BeginUpdate(), running any deferred layout."""
+        if self._update_depth <= 0:
+            return
+        self._update_depth -= 1
+        if self._update_depth == 0:
+            try:
+                if self._layout_pending:
+                    self._layout_pending = False
+                    self._content.Layout()
+                    self._sync()
+            finally:
+                self.Thaw()
+
+    def _relayout(self) -> None:
+        if self._update_depth > 0:
+            self._layout_pending = True
+        else:
+            self._content.Layout()
+            self._sync()
+
+    @staticmethod
+    def _release_row(row: wx.Window, destroy: bool) -> None:
+        if destroy:
+            row.Destroy()
+        else:
+            row.Hide()
+
+    def SetVirtualRows(
+        self,
+        count: int,
+        row_factory: Callable[[wx.Window], wx.Window],
+        row_binder: Callable[[wx.Window, int], None],
+        row_height: Optional[int] = None,
+        overscan: int = 2,
+    ) -> None:
+        """Switch to virtual mode, showing `count` rows of equal height.
+
+        row_factory: called as row_factory(parent) to create a row window
+        row_binder: called as row_binder(row, index) to show row `index` in a row window
+        row_height: row height in px; None derives from font
+        overscan: number of extra rows kept above and below the visible rows
+
+        Only the visible rows (plus overscan) exist as windows; they are
+        recycled by calling row_binder() as the table scrolls.
+        """
+        self._clear_virtual_rows()
+        self._content.Hide()
+        self._virtual_factory = row_factory
+        self._virtual_binder = row_binder
+        if row_height is None:
+            row_height = FlatTableRow._default_height(self)
+        self._virtual_row_height = max(1, row_height)
+        self._virtual_overscan = max(0, overscan)
+        self._virtual_count = max(0, count)
         self._sync()
 
-    def RemoveRow(self, row: wx.Window) -> None:
-        self.rows_sizer.Detach(row)
-        self._content.Layout()
+    def SetVirtualRowCount(self, count: int) -> None:
+        """Set the number of virtual rows, and rebind the visible rows."""
+        if not self.IsVirtual():
+            raise ValueError("not in virtual mode: call SetVirtualRows() first")
+        self._virtual_count = max(0, count)
+        self.RefreshVirtualRows()
+
+    def ClearVirtualRows(self) -> None:
+        """Leave virtual mode, destroying the virtual rows and showing
+        the rows added as windows again."""
+        if not self.IsVirtual():
+            return
+        self._clear_virtual_rows()
+        self._virtual_count = None
+        self._virtual_factory = None
+        self._virtual_binder = None
+        self._offset = 0
+        self._content_geom = None
+        self._content.Show()
         self._sync()
 
-    def ClearRows(self) -> None:
-        self.rows_sizer.Clear(delete_windows=False)
-        self._content.Layout()
+    def GetVirtualRowCount(self) -> int:
+        return self._virtual_count or 0
+
+    def IsVirtual(self) -> bool:
+        return self._virtual_count is not None
+
+    def RefreshVirtualRows(self) -> None:
+        """Rebind all visible virtual rows, after the row data has changed."""
+        self._virtual_spare.extend(self._virtual_rows.values())
+        self._virtual_rows = {}
         self._sync()
 
+    def _clear_virtual_rows(self) -> None:
+        for row in list(self._virtual_rows.values()) + self._virtual_spare:
+            row.Destroy()
+        self._virtual_rows = {}
+        self._virtual_spare = []
+
+    def _new_virtual_row(self) -> wx.Window:
+        row = self._virtual_factory(self._viewport)
+        if isinstance(row, FlatTableRow):
+            row._apply_row_bg()
+        row.Bind(wx.EVT_MOUSEWHEEL, self._on_wheel)
+        return row
+
+    def _layout_virtual(self) -> None:
+        """Bind and position the rows in view, recycling rows that scrolled out."""
+        rh = self._virtual_row_height
+        w, vh = self._viewport.GetClientSize()
+        first = max(0, self._offset // rh - self._virtual_overscan)
+        last = min(self._virtual_count,
+                   (self._offset + vh) // rh + 1 + self._virtual_overscan)
+
+        rows = {}
+        spare = self._virtual_spare
+        for index, row in self._virtual_rows.items():
+            if first <= index < last:
+                rows[index] = row
+            else:
+                spare.append(row)
+
+        self._viewport.Freeze()
+        try:
+            for index in range(first, last):
+                row = rows.get(index, None)
+                if row is None:
+                    row = spare.pop() if spare else self._new_virtual_row()
+                    self._virtual_binder(row, index)
+                    rows[index] = row
+                row.SetSize(0, index * rh - self._offset, w, rh)
+                row.Show()
+            for row in spare:
+                row.Hide()
+        finally:
+            self._viewport.Thaw()
+        self._virtual_rows = rows
+
     def BindMouseWheel(self, window: wx.Window) -> None:
         """Propagate mouse-wheel events from a child control into the panel."""
         window.Bind(wx.EVT_MOUSEWHEEL, self._on_wheel)
 
+    def GetScrollStats(self) -> dict:
+        """Return scrolling statistics: number of animation frames, frames
+        per second and slowest frame time while animating, and the number
+        of moves of the content panel holding the rows added as windows
+        (not counting virtual rows, which are positioned one by one)."""
+        stats = dict(self._scroll_stats)
+        stats['fps'] = stats['intervals'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+        return stats
+
+    def ResetScrollStats(self) -> None:
+        for key in self._scroll_stats:
+            self._scroll_stats[key] = 0
+
     def _content_height(self) -> int:
-        return self._content.GetBestSize().height
+        if self._virtual_count is not None:
+            return self._virtual_count * self._virtual_row_height
+        if self._content_h is None:
+            self._content_h = self._content.GetBestSize().height
+        return self._content_h
 
     def _viewport_height(self) -> int:
         return self._viewport.GetClientSize().height
@@ -271,10 +687,19 @@ class FlatScrolledPanel(wx.Panel):
         return max(0, self._content_height() - self._viewport_height())
 
     def _apply_offset(self) -> None:
+        old = self._applied_offset
         self._offset = max(0, min(self._offset, self._max_offset()))
-        w = self._viewport.GetClientSize().width
-        h = max(self._content_height(), self._viewport_height())
-        self._content.SetSize(0, -self._offset, w, h)
+        w, vh = self._viewport.GetClientSize()
+        dy = old - self._offset
+        if self._virtual_count is not None:
+            self._layout_virtual()
+        else:
+            geom = (w, max(self._content_height(), vh))
+            if dy != 0 or geom != self._content_geom:
+                self._content.SetSize(0, -self._offset, *geom)
+                self._content_geom = geom
+                self._scroll_stats['moves'] += 1
+        self._applied_offset = self._offset
         self._sync_scrollbar()
 
     def _sync_scrollbar(self) -> None:
@@ -286,18 +711,636 @@ class FlatScrolledPanel(wx.Panel):
             self._scrollbar.Update(self._offset / (total - visible), visible / total)
 
     def _sync(self) -> None:
+        self._content_h = None
         self._apply_offset()
 
+    def _stop_animation(self) -> None:
+        if self._frame_timer.IsRunning():
+            self._frame_timer.Stop()
+        self._velocity = 0.0
+        self._last_frame = None
+
+    def _on_destroy(self, event: wx.WindowDestroyEvent) -> None:
+        if event.GetEventObject() is self:
+            self._frame_timer.Stop()
+        event.Skip()
+
     def _on_sb_scroll(self, fraction: float) -> None:
+        self._stop_animation()
         self._offset = int(fraction * self._max_offset())
         self._apply_offset()
 
     def _on_viewport_size(self, event: wx.SizeEvent) -> None:
         event.Skip()
+        self._content_h = None
         self._apply_offset()
 
     def _on_wheel(self, event: wx.MouseEvent) -> None:
         delta = event.GetWheelRotation() // event.GetWheelDelta()
-        self._offset = max(0, min(self._offset - delta * self._scroll_step, self._max_offset()))
+        if self._smooth is None:
+            self._offset = max(0, min(self._offset - delta * self._scroll_step, self._max_offset()))
+            self._apply_offset()
+        else:
+            if not self._frame_timer.IsRunning():
+                self._scroll_pos = self._target = float(self._offset)
+                self._frame_timer.Start(SCROLL_FRAME_MS)
+            if self._smooth == 'kinetic':
+                self._velocity -= delta * self._scroll_step * (1 - KINETIC_FRICTION)
+            else:
+                self._target = max(0, min(self._target - delta * self._scroll_step,
+                                          self._max_offset()))
+        event.Skip()
+
+    def _on_frame(self, event: wx.TimerEvent) -> None:
+        """Advance a smooth scroll by one frame."""
+        t0 = time.perf_counter()
+        maxoff = self._max_offset()
+        if self._smooth == 'kinetic':
+            self._velocity *= KINETIC_FRICTION
+            pos = self._scroll_pos + self._velocity
+            done = abs(self._velocity) < 0.5
+        else:
+            diff = self._target - self._scroll_pos
+            pos = self._scroll_pos + diff * ANIMATION_EASING
+            done = abs(diff) < 1.0
+            if done:
+                pos = self._target
+        pos = max(0.0, min(pos, maxoff))
+        done = done or pos in (0.0, maxoff)
+        self._scroll_pos = pos
+        self._offset = round(pos)
         self._apply_offset()
+        self._viewport.Update()
+
+        stats = self._scroll_stats
+        now = time.perf_counter()
+        stats['frames'] += 1
+        stats['max_frame_ms'] = max(stats['max_frame_ms'], 1000 * (now - t0))
+        if self._last_frame is not None:
+            stats['intervals'] += 1
+            stats['seconds'] += now - self._last_frame
+        self._last_frame = now
+        if done:
+            self._stop_animation()
+
+
+def _mixed_sort_key(value):
+    """Sort key for columns holding None or values of different types:
+    numbers, then other values grouped by type, then None"""
+    if value is None:
+        return (True, '', 0)
+    return (False, '' if isinstance(value, Real) else type(value).__name__, value)
+
+
+class TableIndex:
+    """Sorted and filtered permutation of row indices over column data.
+
+    columns: column data, one sequence (list, array.array, NumPy array, ...) per column
+
+    The table data is never reordered: sorting and filtering only build
+    the list of data row indices to show, so view[i] is the data row
+    shown at position i.  Sort keys and sorted orders are cached per
+    column, sorting is stable, and each filter keeps its own row mask so
+    that changing one filter re-tests only that column.  Columns that
+    cannot be compared directly, such as those holding None, sort numbers
+    first, then other values grouped by type, then None.  This can drive
+    FlatDataTable, or the row binder of a virtual FlatScrolledPanel.
+    """
+
+    def __init__(self, columns: Optional[list[Sequence]] = None) -> None:
+        self._sort: Optional[tuple[int, bool]] = None
+        self._sort_funcs: dict[int, Callable] = {}
+        self.SetColumns(columns if columns is not None else [])
+
+    def SetColumns(self, columns: list[Sequence]) -> None:
+        """Replace the column data, keeping the sort column and removing filters."""
+        self._columns = list(columns)
+        self._nrows = min((len(c) for c in self._columns), default=0)
+        self._values: dict[int, list] = {}
+        self._keys: dict[int, list] = {}
+        self._orders: dict[tuple[int, bool], list[int]] = {}
+        self._filters: dict[int, Callable] = {}
+        self._masks: dict[int, bytearray] = {}
+        self._mask: Optional[bytearray] = None
+        if self._sort is not None and self._sort[0] >= len(self._columns):
+            self._sort = None
+        self._update()
+
+    def Invalidate(self, col: Optional[int] = None) -> None:
+        """Drop cached values and sort keys after the data of column `col`
+        (None for all columns) changed.  Filters on the changed columns are
+        re-tested at once; otherwise the current order is kept until the
+        next change of sorting or filtering."""
+        cols = range(len(self._columns)) if col is None else (col,)
+        retest = False
+        for c in cols:
+            self._values.pop(c, None)
+            self._drop_order(c)
+            predicate = self._filters.get(c, None)
+            if predicate is not None:
+                self._masks[c] = bytearray(1 if predicate(v) else 0
+                                           for v in self._column_values(c))
+                retest = True
+        if retest:
+            self._combine_masks()
+            self._update()
+
+    def InvalidateCell(self, row: int, col: int) -> bool:
+        """Update cached data after the value of one cell changed.
+
+        The filter on the column, if any, is re-tested for that row only.
+        The current order is kept until the next change of sorting or
+        filtering, unless the filter now shows or hides the row.
+        Returns whether the rows shown changed.
+        """
+        values = self._values.get(col, None)
+        if values is not None:
+            column = self._columns[col]
+            values[row] = (column[row:row+1].tolist()[0] if hasattr(column, 'tolist')
+                           else column[row])
+        self._drop_order(col)
+        predicate = self._filters.get(col, None)
+        if predicate is None:
+            return False
+        self._masks[col][row] = 1 if predicate(self._column_values(col)[row]) else 0
+        shown = self._mask[row]
+        self._mask[row] = all(mask[row] for mask in self._masks.values())
+        if self._mask[row] == shown:
+            return False
+        self._update()
+        return True
+
+    def SetSort(self, col: int, ascending: bool = True) -> None:
+        """Sort by column `col` (-1 for data order)."""
+        self._sort = (col, ascending) if col >= 0 else None
+        self._update()
+
+    def GetSort(self) -> tuple[int, bool]:
+        """Return (sort column, ascending), with column -1 for data order."""
+        return self._sort if self._sort is not None else (-1, True)
+
+    def SetSortKey(self, col: int, key: Optional[Callable] = None) -> None:
+        """Set the sort key function for a column; None sorts by value."""
+        if key is None:
+            self._sort_funcs.pop(col, None)
+        else:
+            self._sort_funcs[col] = key
+        self._drop_order(col)
+        if self._sort is not None and self._sort[0] == col:
+            self._update()
+
+    def SetFilter(self, col: int, predicate: Optional[Callable] = None,
+                  narrowing: bool = False) -> None:
+        """Show only rows whose value in column `col` passes predicate(value).
+
+        predicate: None removes the filter for the column
+        narrowing: True if every value rejected by the column's current
+                   filter is also rejected by `predicate`, so that only
+                   the rows passing the current filter are re-tested
+        """
+        if predicate is None:
+            self._filters.pop(col, None)
+            self._masks.pop(col, None)
+        else:
+            values = self._column_values(col)
+            old = self._masks.get(col, None) if narrowing else None
+            if old is None:
+                mask = bytearray(1 if predicate(v) else 0 for v in values)
+            else:
+                mask = bytearray(old)
+                for i in compress(range(self._nrows), old):
+                    if not predicate(values[i]):
+                        mask[i] = 0
+            self._filters[col] = predicate
+            self._masks[col] = mask
+        self._combine_masks()
+        self._update()
+
+    def IsFiltered(self, col: int) -> bool:
+        return col in self._filters
+
+    def Rows(self) -> list[int]:
+        """Return the data row indices in display order."""
+        return self._rows
+
+    def Position(self, row: int) -> int:
+        """Return the display position of data row `row`, or -1 if filtered out."""
+        if self._positions is None:
+            self._positions = {r: i for i, r in enumerate(self._rows)}
+        return self._positions.get(row, -1)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, pos: int) -> int:
+        return self._rows[pos]
+
+    def _column_values(self, col: int) -> list:
+        values = self._values.get(col, None)
+        if values is None:
+            column = self._columns[col]
+            values = column.tolist() if hasattr(column, 'tolist') else list(column)
+            values = self._values[col] = values[:self._nrows]
+        return values
+
+    def _sort_order(self, col: int, ascending: bool) -> list[int]:
+        order = self._orders.get((col, ascending), None)
+        if order is None:
+            keys = self._keys.get(col, None)
+            if keys is None:
+                values = self._column_values(col)
+                func = self._sort_funcs.get(col, None)
+                keys = self._keys[col] = values if func is None else [func(v) for v in values]
+            try:
+                order = sorted(range(self._nrows), key=keys.__getitem__,
+                               reverse=not ascending)
+            except TypeError:
+                keys = self._keys[col] = [_mixed_sort_key(k) for k in keys]
+                order = sorted(range(self._nrows), key=keys.__getitem__,
+                               reverse=not ascending)
+            self._orders[(col, ascending)] = order
+        return order
+
+    def _drop_order(self, col: int) -> None:
+        self._keys.pop(col, None)
+        self._orders.pop((col, True), None)
+        self._orders.pop((col, False), None)
+
+    def _combine_masks(self) -> None:
+        """AND the filter masks into one row mask, bytewise as big integers"""
+        masks = list(self._masks.values())
+        if len(masks) == 0:
+            self._mask = None
+        elif len(masks) == 1:
+            self._mask = bytearray(masks[0])
+        else:
+            combined = int.from_bytes(masks[0], 'little')
+            for mask in masks[1:]:
+                combined &= int.from_bytes(mask, 'little')
+            self._mask = bytearray(combined.to_bytes(self._nrows, 'little'))
+
+    def _update(self) -> None:
+        mask = self._mask
+        if self._sort is None:
+            order = range(self._nrows)
+            self._rows = list(order if mask is None else compress(order, mask))
+        else:
+            order = self._sort_order(*self._sort)
+            self._rows = list(order if mask is None else
+                              compress(order, map(mask.__getitem__, order)))
+        self._positions = None
+
+
+class FlatDataTable(wx.Panel):
+    """Owner-drawn, read-only table for column-oriented data.
+
+    parent: parent window
+    labels: column label strings
+    proportions: relative integer widths per column, as for FlatTableHeader
+    columns: column data, one sequence (list, array.array, NumPy array, ...) per column
+    formats: per-column format spec or callable(value) -> str; None uses str()
+    row_height: row height in px; None derives from font
+    on_select: called as on_select(row, col) when a cell is clicked
+    scheme: TableScheme; None uses palette default at paint time
+    scrollbar_scheme: ScrollBarScheme; None uses the palette default
+    sortable: sort by a column when its header label is clicked (default: True)
+
+    There are no child windows per row or cell: only the visible cells
+    are drawn, and mouse positions are mapped to cells arithmetically.
+    Scrolling blits the rows still in view and draws only the exposed rows.
+    Sorting and filtering reorder a TableIndex, never the data.  Row
+    numbers in all methods and callbacks are data row indices.
+    """
+
+    def __init__(
+        self,
+        parent: wx.Window,
+        labels: list[str],
+        proportions: list[int],
+        columns: Optional[list[Sequence]] = None,
+        formats: Optional[list] = None,
+        row_height: Optional[int] = None,
+        on_select: Optional[Callable[[int, int], None]] = None,
+        scheme = None,
+        scrollbar_scheme = None,
+        sortable: bool = True,
+    ) -> None:
+        super().__init__(parent, style=wx.BORDER_NONE)
+        self._proportions = proportions
+        self._formats = list(formats) if formats is not None else []
+        self._on_select = on_select
+        self._custom_scheme = scheme
+        self._theme_gen: int = -1
+        self._theme_scheme = None
+        self._columns: list[Sequence] = []
+        self._view = TableIndex()
+        self._filter_text: dict[int, str] = {}
+        self._offset: int = 0
+        self._scroll_stats = {'blits': 0, 'refreshes': 0}
+        self._hover: int = -1       # display position
+        self._selected: int = -1    # data row
+        self._row_height = row_height if row_height is not None else FlatTableRow._default_height(parent)
+        self._pad = max(4, self._row_height // 7)
+
+        self._layout = TableLayout(proportions)
+        self._header = FlatTableHeader(self, labels, proportions, scheme=scheme,
+                                       on_sort=self.SortBy if sortable else None,
+                                       layout=self._layout)
+        self._canvas = wx.Window(self, style=wx.BORDER_NONE)
+        self._canvas.SetBackgroundStyle(wx.BG_STYLE_PAINT)
+        self._scrollbar = FlatScrollBar(
+            self,
+            on_scroll=self._on_sb_scroll,
+            scrollbar_scheme=scrollbar_scheme,
+        )
+
+        left = wx.BoxSizer(wx.VERTICAL)
+        left.Add(self._header, 0, wx.EXPAND)
+        left.Add(self._canvas, 1, wx.EXPAND)
+        outer = wx.BoxSizer(wx.HORIZONTAL)
+        outer.Add(left, 1, wx.EXPAND)
+        outer.Add(self._scrollbar, 0, wx.EXPAND)
+        self.SetSizer(outer)
+
+        self._canvas.Bind(wx.EVT_PAINT, self._on_paint)
+        self._canvas.Bind(wx.EVT_SIZE, self._on_canvas_size)
+        self._canvas.Bind(wx.EVT_MOTION, self._on_motion)
+        self._canvas.Bind(wx.EVT_LEAVE_WINDOW, self._on_leave)
+        self._canvas.Bind(wx.EVT_LEFT_DOWN, self._on_left_down)
+        self._canvas.Bind(wx.EVT_MOUSEWHEEL, self._on_wheel)
+
+        if scheme is None:
+            register_darkdetect(self._on_dark_theme)
+        self.SetColumns(columns if columns is not None else [])
+
+    def SetColumns(self, columns: list[Sequence]) -> None:
+        """Replace the column data and repaint.  Filters are removed."""
+        self._columns = list(columns)
+        self._view.SetColumns(self._columns)
+        for col in self._filter_text:
+            self._header.SetFilterIndicator(col, False)
+        self._filter_text = {}
+        if self._selected >= min((len(c) for c in self._columns), default=0):
+            self._selected = -1
+        self._hover = -1
+        self._sync()
+
+    def GetRowCount(self) -> int:
+        """Return the number of rows shown, after filtering."""
+        return len(self._view)
+
+    def GetView(self) -> TableIndex:
+        return self._view
+
+    def GetCellValue(self, row: int, col: int):
+        return self._columns[col][row]
+
+    def SetCellValue(self, row: int, col: int, value) -> None:
+        """Set one value in the column data and repaint its row.
+        The row keeps its place until sorting or filtering changes, but is
+        shown or hidden at once if it now passes or fails a filter."""
+        self._columns[col][row] = value
+        if self._view.InvalidateCell(row, col):
+            self._sync()
+        else:
+            self.RefreshRow(row)
+
+    def SortBy(self, col: int, ascending: bool = True) -> None:
+        """Sort rows by column `col` (-1 for data order) and repaint."""
+        self._view.SetSort(col, ascending)
+        if self._header._sort_col != col or self._header._sort_ascending != ascending:
+            self._header.SetSortIndicator(col, ascending)
+        self._sync()
+
+    def SetFilter(self, col: int, predicate: Optional[Callable] = None,
+                  narrowing: bool = False) -> None:
+        """Show only rows whose value in column `col` passes predicate(value),
+        or remove the filter with predicate=None.  See TableIndex.SetFilter."""
+        self._filter_text.pop(col, None)
+        self._view.SetFilter(col, predicate, narrowing=narrowing)
+        self._header.SetFilterIndicator(col, predicate is not None)
+        self._sync()
+
+    def SetFilterText(self, col: int, text: str = '') -> None:
+        """Show only rows whose formatted value in column `col` contains
+        `text`, ignoring case.  Extending the text re-tests only the rows
+        already shown."""
+        text = text.lower()
+        old = self._filter_text.get(col, None)
+        if not text:
+            self.SetFilter(col, None)
+            return
+        def predicate(value):
+            return text in self._format_cell(col, value).lower()
+        self.SetFilter(col, predicate, narrowing=(old is not None and old in text))
+        self._filter_text[col] = text
+
+    def RefreshRow(self, row: int) -> None:
+        """Repaint one data row, if it is in view."""
+        rect = self._row_rect(self._view.Position(row)) if row >= 0 else None
+        if rect is not None:
+            self._canvas.RefreshRect(rect)
+
+    def GetSelection(self) -> int:
+        return self._selected
+
+    def SetSelection(self, row: int) -> None:
+        old, self._selected = self._selected, row
+        self.RefreshRow(old)
+        self.RefreshRow(row)
+
+    def ScrollToRow(self, row: int) -> None:
+        """Scroll so that data row `row` is in view."""
+        pos = self._view.Position(row)
+        if pos < 0:
+            return
+        rh = self._row_height
+        top = pos * rh
+        visible = self._canvas.GetClientSize().height
+        if top < self._offset:
+            self._scroll_to(top)
+        elif top + rh > self._offset + visible:
+            self._scroll_to(top + rh - visible)
+
+    def HitTest(self, x: int, y: int) -> tuple[int, int]:
+        """Return (row, col) at a point in the table area, or -1 for either outside it."""
+        pos, col = self._hit_position(x, y)
+        return (self._view[pos] if pos >= 0 else -1), col
+
+    def _hit_position(self, x: int, y: int) -> tuple[int, int]:
+        pos = (y + self._offset) // self._row_height if y >= 0 else -1
+        if pos >= len(self._view):
+            pos = -1
+        col = self._layout.column_at(x, self._canvas.GetClientSize().width)
+        return pos, col
+
+    def _scheme(self):
+        if self._custom_scheme is not None:
+            return self._custom_scheme
+        gen = theme_generation()
+        if gen != self._theme_gen:
+            self._theme_scheme = _default_table_scheme()
+            self._theme_gen = gen
+        return self._theme_scheme
+
+    def _on_dark_theme(self, is_dark: bool = True) -> None:
+        queue_refresh(self._canvas)
+
+    def _format_cell(self, col: int, value) -> str:
+        fmt = self._formats[col] if col < len(self._formats) else None
+        if fmt is None:
+            return str(value)
+        if callable(fmt):
+            return fmt(value)
+        return format(value, fmt)
+
+    def _row_rect(self, pos: int) -> Optional[wx.Rect]:
+        if pos < 0 or pos >= len(self._view):
+            return None
+        w, h = self._canvas.GetClientSize()
+        y = pos * self._row_height - self._offset
+        if y + self._row_height <= 0 or y >= h:
+            return None
+        return wx.Rect(0, y, w, self._row_height)
+
+    def _on_paint(self, _: wx.PaintEvent) -> None:
+        dc = wx.AutoBufferedPaintDC(self._canvas)
+        gc = wx.GraphicsContext.Create(dc)
+        w, h = self._canvas.GetClientSize()
+        theme = get_theme()
+        border_color = self._scheme()[1]
+        rh = self._row_height
+
+        gc.SetPen(wx.TRANSPARENT_PEN)
+        gc.SetBrush(get_brush(get_color('pt_bg')))
+        gc.DrawRectangle(0, 0, w, h)
+
+        # only the rows in the update region, often the band exposed by a scroll
+        box = self._canvas.GetUpdateRegion().GetBox()
+        if box.IsEmpty():
+            box = wx.Rect(0, 0, w, h)
+        rows = self._view.Rows()
+        first = (self._offset + box.y) // rh
+        last = min(len(rows), (self._offset + box.y + box.height) // rh + 1)
+        if first >= last:
+            return
+
+        selected = self._view.Position(self._selected) if self._selected >= 0 else -1
+        for pos, colour in ((self._hover, theme.black),
+                            (selected, theme.bright_black)):
+            if first <= pos < last:
+                gc.SetBrush(get_brush(colour))
+                gc.DrawRectangle(0, pos * rh - self._offset, w, rh)
+
+        widths = self._layout.col_widths(w)
+        gc.SetPen(get_pen(border_color, 1))
+        for pos in range(first, last):
+            y = (pos + 1) * rh - self._offset - 1
+            gc.StrokeLine(0, y, w, y)
+        x = 0
+        for cw in widths[:-1]:
+            x += cw
+            gc.StrokeLine(x, 0, x, h)
+
+        font = self._canvas.GetFont()
+        gc.SetFont(get_gc_font(font, theme.foreground, gc))
+        _, th = self._layout.text_extent(gc, font, "Ag")
+        pad = self._pad
+        ty = (rh - th) / 2 - self._offset
+        x = 0
+        for col, cw in enumerate(widths):
+            if col >= len(self._columns) or cw <= 2 * pad:
+                x += cw
+                continue
+            column = self._columns[col]
+            gc.Clip(x + pad, 0, cw - 2 * pad, h)
+            for pos in range(first, last):
+                value = column[rows[pos]]
+                text = self._format_cell(col, value)
+                if isinstance(value, Number) and not isinstance(value, bool):
+                    tw, _ = gc.GetTextExtent(text)
+                    gc.DrawText(text, x + cw - pad - tw, pos * rh + ty)
+                else:
+                    gc.DrawText(text, x + pad, pos * rh + ty)
+            gc.ResetClip()
+            x += cw
+
+    def _max_offset(self) -> int:
+        return max(0, len(self._view) * self._row_height - self._canvas.GetClientSize().height)
+
+    def _sync(self) -> None:
+        self._offset = max(0, min(self._offset, self._max_offset()))
+        self._sync_scrollbar()
+        self._canvas.Refresh()
+
+    def _sync_scrollbar(self) -> None:
+        total = len(self._view) * self._row_height
+        visible = self._canvas.GetClientSize().height
+        if total <= visible:
+            self._scrollbar.Update(0.0, 1.0)
+        else:
+            self._scrollbar.Update(self._offset / (total - visible), visible / total)
+
+    def _scroll_to(self, offset: int) -> None:
+        """Scroll to `offset` by blitting the rows that stay in view and
+        repainting only the exposed band."""
+        offset = max(0, min(offset, self._max_offset()))
+        dy = self._offset - offset
+        if dy == 0:
+            return
+        self._offset = offset
+        self._sync_scrollbar()
+        w, h = self._canvas.GetClientSize()
+        if abs(dy) < h:
+            self._canvas.ScrollWindow(0, dy)
+            if dy > 0:
+                self._canvas.RefreshRect(wx.Rect(0, 0, w, dy))
+            else:
+                self._canvas.RefreshRect(wx.Rect(0, h + dy, w, -dy))
+            self._scroll_stats['blits'] += 1
+        else:
+            self._canvas.Refresh()
+            self._scroll_stats['refreshes'] += 1
+
+    def GetScrollStats(self) -> dict:
+        """Return the number of scrolls done by blitting the canvas and
+        repainting the exposed band, and by repainting the whole canvas."""
+        return dict(self._scroll_stats)
+
+    def _on_sb_scroll(self, fraction: float) -> None:
+        self._scroll_to(int(fraction * self._max_offset()))
+
+    def _on_canvas_size(self, event: wx.SizeEvent) -> None:
+        event.Skip()
+        self._sync()
+
+    def _on_wheel(self, event: wx.MouseEvent) -> None:
+        delta = event.GetWheelRotation() // event.GetWheelDelta()
+        self._scroll_to(self._offset - delta * self._row_height)
+
+    def _refresh_position(self, pos: int) -> None:
+        rect = self._row_rect(pos)
+        if rect is not None:
+            self._canvas.RefreshRect(rect)
+
+    def _on_motion(self, event: wx.MouseEvent) -> None:
+        pos, _ = self._hit_position(event.GetX(), event.GetY())
+        if pos != self._hover:
+            old, self._hover = self._hover, pos
+            self._refresh_position(old)
+            self._refresh_position(pos)
+        event.Skip()
+
+    def _on_leave(self, event: wx.MouseEvent) -> None:
+        if self._hover >= 0:
+            old, self._hover = self._hover, -1
+            self._refresh_position(old)
+        event.Skip()
+
+    def _on_left_down(self, event: wx.MouseEvent) -> None:
+        row, col = self.HitTest(event.GetX(), event.GetY())
+        if row >= 0:
+            self.SetSelection(row)
+            if self._on_select is not None:
+                self._on_select(row, col)
         event.Skip()
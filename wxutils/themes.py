@@ -114,11 +114,40 @@ def dark_theme() -> ColorTheme:
 
 _ACTIVE_THEME: Optional[ColorTheme] = None
 
+# built-in themes, built once per dark/light state and reused
+_BUILTIN_THEMES: dict[bool, ColorTheme] = {}
 
-def set_theme(theme: ColorTheme) -> None:
-    """Set the global ColorTheme used by all flat widgets."""
+# bumped whenever the theme a widget would see may have changed, so
+# widgets can cache anything derived from the theme and compare a
+# single int instead of re-resolving the theme on every paint
+_THEME_GENERATION: int = 0
+
+
+def theme_generation() -> int:
+    """Return the theme generation counter.
+
+    The counter increases on every `set_theme()` call and on every
+    dark/light mode change, so derived colors cached along with this
+    value are stale once it differs from the current one.
+    """
+    return _THEME_GENERATION
+
+
+def bump_theme_generation() -> int:
+    """Invalidate cached theme-derived data, returning the new generation."""
+    global _THEME_GENERATION
+    _THEME_GENERATION += 1
+    return _THEME_GENERATION
+
+
+def set_theme(theme: Optional[ColorTheme]) -> None:
+    """Set the global ColorTheme used by all flat widgets.
+
+    Use None to go back to the built-in light/dark themes.
+    """
     global _ACTIVE_THEME
     _ACTIVE_THEME = theme
+    bump_theme_generation()
 
 
 def get_theme() -> ColorTheme:
@@ -126,4 +155,8 @@ def get_theme() -> ColorTheme:
     if _ACTIVE_THEME is not None:
         return _ACTIVE_THEME
     from .colors import is_dark_theme
-    return dark_theme() if is_dark_theme() else light_theme()
+    dark = is_dark_theme()
+    theme = _BUILTIN_THEMES.get(dark, None)
+    if theme is None:
+        theme = _BUILTIN_THEMES[dark] = dark_theme() if dark else light_theme()
+    return theme